@@ -195,7 +195,8 @@ setup(
     entry_points={
         'console_scripts': [
             'rafcon_start = rafcon.core.start:main',
-            'rafcon_core = rafcon.core.start:main'
+            'rafcon_core = rafcon.core.start:main',
+            'rafcon_batch = rafcon.core.batch_runner:main'
         ],
         'gui_scripts': [
             'rafcon_start_gui = rafcon.gui.start:main',
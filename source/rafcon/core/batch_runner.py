@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: batch_runner
+   :synopsis: A module to execute many state machines one after another in a single process
+
+In contrast to `rafcon_core`, the batch runner pays the start of the interpreter, the loading of the configuration and
+plugins and the scan of the libraries only once for a whole list of jobs. Each job is executed in its own copy of the
+state machine, which is loaded only once per path. With `--parallel N`, the jobs are distributed to N processes forked
+from the initialized runner.
+
+The job list is a YAML or JSON file with a list of jobs, e.g.::
+
+    - path: /path/to/state_machine
+      start_state_path: QPOXGD/YVWJKZ
+      inputs: {counter: 3}
+      timeout: 60
+    - path: /path/to/other_state_machine
+"""
+
+import argparse
+import multiprocessing
+import signal
+import sys
+import time
+import traceback
+from copy import copy
+
+import yaml
+from yaml_configuration.config import config_path
+
+import rafcon.utils.filesystem as filesystem
+import rafcon.core.singleton as core_singletons
+from rafcon.core.start import pre_setup_plugins, post_setup_plugins, setup_environment, setup_configuration
+from rafcon.core.storage import storage
+from rafcon.core.execution import execution_backend, process_execution
+from rafcon.utils import storage_utils
+from rafcon.utils import plugins
+from rafcon.utils import log
+
+logger = log.get_logger("rafcon.start.batch")
+
+# the outcome ids of aborted and preempted executions
+ABORTED_OUTCOME_ID = -1
+PREEMPTED_OUTCOME_ID = -2
+
+
+class BatchJob(object):
+    """A state machine execution of a batch
+
+    :ivar str path: the path of the state machine
+    :ivar str start_state_path: the path of the state, from which the execution starts, None for the root state
+    :ivar dict inputs: values overriding the default values of the input data ports of the root state, by port name
+    :ivar float timeout: the maximum execution time in seconds, after which the execution is stopped, None for no limit
+    :ivar str name: the name of the job in the report, defaults to the path
+    """
+
+    def __init__(self, path, start_state_path=None, inputs=None, timeout=None, name=None):
+        self.path = path
+        self.start_state_path = start_state_path
+        self.inputs = inputs if inputs is not None else {}
+        self.timeout = timeout
+        self.name = name if name is not None else path
+
+    def __str__(self):
+        return "BatchJob '{0}'".format(self.name)
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        if isinstance(dictionary, basestring):
+            return cls(dictionary)
+        if 'path' not in dictionary:
+            raise ValueError("Each job needs a path: {0}".format(dictionary))
+        return cls(dictionary['path'], dictionary.get('start_state_path'), dictionary.get('inputs'),
+                   dictionary.get('timeout'), dictionary.get('name'))
+
+
+class BatchJobResult(object):
+    """The result of a job of a batch
+
+    :ivar str name: the name of the job
+    :ivar str path: the path of the state machine
+    :ivar bool succeeded: True, if the execution finished with an outcome not being aborted or preempted
+    :ivar str final_outcome: the name of the final outcome of the root state
+    :ivar int final_outcome_id: the id of the final outcome of the root state
+    :ivar dict outputs: the output data of the root state, values not being numbers, strings, lists or dicts are
+        converted to their representation
+    :ivar float load_time: the time in seconds needed to load or copy the state machine
+    :ivar float execution_time: the time in seconds needed for the execution
+    :ivar str error: the error, which prevented the execution, None if the state machine was executed
+    """
+
+    def __init__(self, job):
+        self.name = job.name
+        self.path = job.path
+        self.succeeded = False
+        self.final_outcome = None
+        self.final_outcome_id = None
+        self.outputs = {}
+        self.load_time = 0.
+        self.execution_time = 0.
+        self.error = None
+
+    def to_dict(self):
+        return {'name': self.name,
+                'path': self.path,
+                'succeeded': self.succeeded,
+                'final_outcome': self.final_outcome,
+                'final_outcome_id': self.final_outcome_id,
+                'outputs': self.outputs,
+                'load_time': self.load_time,
+                'execution_time': self.execution_time,
+                'error': self.error}
+
+
+def _to_report_value(value):
+    if value is None or isinstance(value, (bool, int, long, float, basestring)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_to_report_value(element) for element in value]
+    if isinstance(value, dict):
+        return {str(key): _to_report_value(element) for key, element in value.iteritems()}
+    return repr(value)
+
+
+class BatchRunner(object):
+    """Executes the jobs of a batch with the execution engine
+
+    The configuration and the libraries have to be loaded, before jobs can be executed. Each state machine is loaded
+    only once, every job is executed with a fresh copy of it.
+
+    :ivar int max_parallel_jobs: the number of processes executing jobs concurrently, 1 to execute all jobs in the
+        current process
+    """
+
+    def __init__(self, max_parallel_jobs=1):
+        self.max_parallel_jobs = max(1, max_parallel_jobs)
+        # state machine path --> loaded state machine, which is never executed itself
+        self._state_machine_templates = {}
+
+    def _get_state_machine(self, path):
+        """Returns a copy of the state machine stored at the given path, which is loaded, if not done, yet
+
+        :param str path: the path of the state machine
+        :rtype: rafcon.core.state_machine.StateMachine
+        """
+        if path not in self._state_machine_templates:
+            self._state_machine_templates[path] = storage.load_state_machine_from_path(path)
+        state_machine = copy(self._state_machine_templates[path])
+        state_machine.file_system_path = path
+        return state_machine
+
+    @staticmethod
+    def _set_inputs(state_machine, inputs):
+        input_data_ports = {port.name: port for port in state_machine.root_state.input_data_ports.itervalues()}
+        for port_name, value in inputs.iteritems():
+            if port_name not in input_data_ports:
+                raise ValueError("The root state has no input data port '{0}'".format(port_name))
+            input_data_ports[port_name].default_value = value
+
+    def run_job(self, job):
+        """Executes a single job in the current process
+
+        :param BatchJob job: the job to execute
+        :rtype: BatchJobResult
+        """
+        result = BatchJobResult(job)
+        state_machine_manager = core_singletons.state_machine_manager
+        execution_engine = core_singletons.state_machine_execution_engine
+
+        start_time = time.time()
+        try:
+            state_machine = self._get_state_machine(job.path)
+            self._set_inputs(state_machine, job.inputs)
+        except Exception as e:
+            result.error = "Could not load the state machine: {0}".format(e)
+            logger.error("{0} failed: {1}\n{2}".format(job, result.error, traceback.format_exc()))
+            return result
+        result.load_time = time.time() - start_time
+
+        state_machine_manager.add_state_machine(state_machine)
+        try:
+            start_time = time.time()
+            execution_engine.start(state_machine.state_machine_id, start_state_path=job.start_state_path)
+            execution_future = execution_engine.execution_future
+            if execution_future is None or execution_future.state_machine is not state_machine:
+                result.error = "The state machine could not be started"
+            elif not execution_future.wait(job.timeout):
+                result.error = "The execution did not finish within {0}s".format(job.timeout)
+                execution_engine.stop()
+                execution_future.wait()
+            else:
+                execution_engine.stop()
+            result.execution_time = time.time() - start_time
+
+            root_state = state_machine.root_state
+            if root_state.final_outcome is not None:
+                result.final_outcome = root_state.final_outcome.name
+                result.final_outcome_id = root_state.final_outcome.outcome_id
+            result.outputs = _to_report_value(dict(root_state.output_data))
+            result.succeeded = result.error is None and result.final_outcome_id not in \
+                (None, ABORTED_OUTCOME_ID, PREEMPTED_OUTCOME_ID)
+        except Exception as e:
+            result.error = "The execution failed: {0}".format(e)
+            logger.error("{0} failed: {1}\n{2}".format(job, result.error, traceback.format_exc()))
+        finally:
+            state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        logger.info("{0} {1} with outcome '{2}' after {3:.3f}s".format(
+            job, "succeeded" if result.succeeded else "failed", result.final_outcome, result.execution_time))
+        return result
+
+    def run(self, jobs):
+        """Executes all jobs, either one after another or in `max_parallel_jobs` processes
+
+        :param list jobs: the jobs to execute
+        :return: the results in the order of the jobs
+        :rtype: list[BatchJobResult]
+        """
+        if self.max_parallel_jobs == 1 or len(jobs) < 2:
+            return [self.run_job(job) for job in jobs]
+
+        # the forked processes inherit the configuration, the libraries and the loaded state machines
+        global _worker_batch_runner
+        _worker_batch_runner = self
+        pool = multiprocessing.Pool(min(self.max_parallel_jobs, len(jobs)), initializer=_initialize_worker)
+        try:
+            results = pool.map(_run_job_in_worker, jobs, chunksize=1)
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            _worker_batch_runner = None
+        return results
+
+
+_worker_batch_runner = None
+
+
+def _initialize_worker():
+    # the signal handlers of the batch runner are meant for the parent process only
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # the pools of the parent process cannot be used, as their worker threads and processes do not belong to the fork
+    execution_backend.reset_worker_pool()
+    process_execution.reset_worker_process_pool()
+
+
+def _run_job_in_worker(job):
+    return _worker_batch_runner.run_job(job)
+
+
+def load_jobs(path):
+    """Loads a job list from a YAML or JSON file
+
+    :param str path: the path of the job list
+    :rtype: list[BatchJob]
+    """
+    with open(path) as job_file:
+        job_dicts = yaml.safe_load(job_file)
+    if not isinstance(job_dicts, list):
+        raise ValueError("The job list {0} does not contain a list of jobs".format(path))
+    return [BatchJob.from_dict(job_dict) for job_dict in job_dicts]
+
+
+def write_report(results, path, total_time=None):
+    """Writes the results of a batch into a JSON file
+
+    :param list[BatchJobResult] results: the results of the jobs
+    :param str path: the path of the report file
+    :param float total_time: the time in seconds needed for the whole batch
+    """
+    report = {'jobs': [result.to_dict() for result in results],
+              'succeeded': len([result for result in results if result.succeeded]),
+              'failed': len([result for result in results if not result.succeeded]),
+              'total_time': total_time}
+    storage_utils.write_dict_to_json(report, path)
+
+
+def setup_argument_parser():
+    """Sets up the parser for the arguments of the batch runner
+
+    :return: The parser object
+    """
+    default_config_path = filesystem.get_default_config_path()
+    parser = argparse.ArgumentParser(description="Execute a list of state machines in a single process")
+    parser.add_argument('jobs_path', metavar='jobs', help="path to a YAML or JSON file with the list of jobs")
+    parser.add_argument('-c', '--config', type=config_path, metavar='path', dest='config_path',
+                        default=default_config_path, nargs='?', const=default_config_path,
+                        help="path to the configuration file config.yaml. Use 'None' to use the default "
+                             "configuration. Default: {0}".format(default_config_path))
+    parser.add_argument('-n', '--parallel', type=int, metavar='N', dest='max_parallel_jobs', default=1,
+                        help="number of jobs executed at the same time in separate processes. Default: 1")
+    parser.add_argument('-r', '--report', metavar='path', dest='report_path', default=None,
+                        help="path of a JSON file, the results and timings of the jobs are written to")
+    return parser
+
+
+def main():
+    logger.info("initialize RAFCON batch runner ... ")
+    pre_setup_plugins()
+    setup_environment()
+
+    user_input = setup_argument_parser().parse_args()
+    try:
+        jobs = load_jobs(user_input.jobs_path)
+    except (IOError, ValueError, yaml.YAMLError) as e:
+        logger.error("Could not load the job list: {0}".format(e))
+        sys.exit(-1)
+
+    setup_configuration(user_input.config_path)
+    post_setup_plugins(user_input)
+
+    batch_start_time = time.time()
+    results = BatchRunner(user_input.max_parallel_jobs).run(jobs)
+    total_time = time.time() - batch_start_time
+
+    number_of_failed_jobs = len([result for result in results if not result.succeeded])
+    logger.info("Executed {0} jobs in {1:.3f}s, {2} failed".format(len(results), total_time, number_of_failed_jobs))
+    if user_input.report_path:
+        write_report(results, user_input.report_path, total_time)
+    plugins.run_hook("post_destruction")
+    sys.exit(1 if number_of_failed_jobs else 0)
+
+
+if __name__ == '__main__':
+    main()
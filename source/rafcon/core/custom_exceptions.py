@@ -58,3 +58,16 @@ class RecoveryModeException(ValueError):
     def do_delete_item(self, do_delete_item):
         self._do_delete_item = do_delete_item
 
+
+
+class ProcessExecutionError(RuntimeError):
+
+    def __init__(self, message):
+        """ A custom exception for the case when the script of an execution state running in a worker process fails
+
+        :param message: the error message for the exception, including the traceback of the worker process
+        :return:
+        """
+
+        # Call the base class constructor with the parameters it needs
+        super(ProcessExecutionError, self).__init__(message)
@@ -0,0 +1,124 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: data_passing
+   :synopsis: A module that decides how values are copied when being passed between states
+
+"""
+
+import copy
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = log.get_logger(__name__)
+
+# every passed value is deep copied (legacy behaviour)
+DEEPCOPY_POLICY = "deepcopy"
+# numpy arrays are passed as read-only views, all other mutable values are deep copied
+READ_ONLY_POLICY = "read_only"
+# values are passed per reference, states must not modify their inputs in place
+SHARE_POLICY = "share"
+
+DATA_PASSING_POLICIES = (DEEPCOPY_POLICY, READ_ONLY_POLICY, SHARE_POLICY)
+DEFAULT_DATA_PASSING_POLICY = DEEPCOPY_POLICY
+
+IMMUTABLE_TYPES = (type(None), bool, int, long, float, complex, str, unicode)
+
+_reported_invalid_policies = set()
+
+
+def get_data_passing_policy():
+    """Returns the data passing policy set in the core config
+
+    :return: one of the names in DATA_PASSING_POLICIES
+    :rtype: str
+    """
+    policy = global_config.get_config_value("DATA_PASSING_POLICY", DEFAULT_DATA_PASSING_POLICY)
+    if policy not in DATA_PASSING_POLICIES:
+        if policy not in _reported_invalid_policies:
+            _reported_invalid_policies.add(policy)
+            logger.error("Invalid DATA_PASSING_POLICY '{0}', falling back to '{1}'. Valid policies are: {2}"
+                         "".format(policy, DEFAULT_DATA_PASSING_POLICY, ", ".join(DATA_PASSING_POLICIES)))
+        return DEFAULT_DATA_PASSING_POLICY
+    return policy
+
+
+def _is_plain_array(value):
+    """Checks whether the value is a numpy array, whose elements are no (possibly mutable) Python objects"""
+    return numpy is not None and type(value) is numpy.ndarray and not value.dtype.hasobject
+
+
+def copy_value(value, policy=None):
+    """Copies a value passed between states according to the data passing policy
+
+    Immutable values are never copied. Numpy arrays are copied with `ndarray.copy`, which avoids the overhead of
+    `copy.deepcopy`, or passed as read-only views with the "read_only" policy.
+
+    :param value: the value to be passed
+    :param str policy: the data passing policy to apply, if None, the one of the core config is used
+    :return: the value to hand over to the receiving state
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    if policy is None:
+        policy = get_data_passing_policy()
+    if policy == SHARE_POLICY:
+        return value
+    if _is_plain_array(value):
+        if policy == READ_ONLY_POLICY:
+            view = value.view()
+            view.flags.writeable = False
+            return view
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def copy_values_of_dict(dictionary, policy=None):
+    """Copies all values of a dictionary according to the data passing policy
+
+    :param dict dictionary: the dictionary whose values are to be copied or None
+    :param str policy: the data passing policy to apply, if None, the one of the core config is used
+    :return: a new dictionary with the same keys and the copied values, None if no dictionary was passed
+    :rtype: dict
+    """
+    if dictionary is None:
+        return None
+    if policy is None:
+        policy = get_data_passing_policy()
+    return {key: copy_value(value, policy) for key, value in dictionary.iteritems()}
+
+
+def copy_scoped_data(scoped_data, policy=None):
+    """Copies the scoped data of a container state, e.g. for the execution history
+
+    The :class:`rafcon.core.state_elements.scope.ScopedData` elements are always deep copied, only their values are
+    copied according to the data passing policy.
+
+    :param dict scoped_data: the scoped data dictionary of a container state
+    :param str policy: the data passing policy to apply, if None, the one of the core config is used
+    :return: the copied scoped data dictionary
+    :rtype: dict
+    """
+    if policy is None:
+        policy = get_data_passing_policy()
+    if policy == DEEPCOPY_POLICY:
+        return copy.deepcopy(scoped_data)
+    # deepcopy uses the memo for already copied objects, thus the values are replaced by their passed version
+    memo = {}
+    values = [scoped_data_element.value for scoped_data_element in scoped_data.itervalues()]
+    for value in values:
+        memo[id(value)] = copy_value(value, policy)
+    # the values must stay referenced until the copy is finished, as their ids are used as keys
+    memo[id(memo)] = values
+    return copy.deepcopy(scoped_data, memo)
@@ -0,0 +1,221 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_backend
+   :synopsis: A module that decides on which thread the run method of a state is executed
+
+"""
+
+import Queue
+import threading
+import traceback
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+# every state is executed in a new thread (legacy behaviour)
+THREAD_BACKEND = "thread"
+# child states of hierarchy states are executed in the thread of their parent, concurrent states on pool workers
+INLINE_BACKEND = "inline"
+# all child states are executed by workers of a pool of reusable threads
+POOL_BACKEND = "pool"
+
+EXECUTION_BACKENDS = (THREAD_BACKEND, INLINE_BACKEND, POOL_BACKEND)
+DEFAULT_EXECUTION_BACKEND = THREAD_BACKEND
+DEFAULT_WORKER_POOL_SIZE = 16
+
+
+class FinishedExecution(object):
+    """Handle of an execution, which already finished as it was run in the calling thread
+
+    The handle offers the part of the :class:`threading.Thread` interface which is used by the states.
+    """
+
+    def join(self, timeout=None):
+        pass
+
+    def is_alive(self):
+        return False
+
+
+class PooledExecution(object):
+    """Handle of an execution, which was passed to a worker of a :class:`WorkerPool`
+
+    :ivar function: the function to be executed by the worker
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self._finished = threading.Event()
+
+    def run(self):
+        try:
+            self.function()
+        except Exception as e:
+            # an exception must not kill the worker, thus behave like an ordinary thread and print the error
+            logger.error("Error in execution of {0}: {1}\n{2}".format(self.function, e, traceback.format_exc()))
+        finally:
+            self.function = None
+
+    def set_finished(self):
+        self._finished.set()
+
+    def join(self, timeout=None):
+        """Waits until the execution finished
+
+        :param float timeout: Maximum time to wait, None if infinitely
+        """
+        self._finished.wait(timeout)
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+
+class _Worker(threading.Thread):
+    """A thread of a :class:`WorkerPool` executing the passed executions one after another"""
+
+    def __init__(self, pool, name):
+        super(_Worker, self).__init__(name=name)
+        # workers never run root states, thus their (non-daemon) root state thread keeps the interpreter alive
+        self.daemon = True
+        self.pool = pool
+        self.executions = Queue.Queue()
+
+    def run(self):
+        while True:
+            execution = self.executions.get()
+            execution.run()
+            # become idle before releasing the joining thread, which typically directly submits the next execution
+            keep_alive = self.pool.add_idle_worker(self)
+            execution.set_finished()
+            if not keep_alive:
+                break
+
+
+class WorkerPool(object):
+    """A pool of reusable threads for the execution of states
+
+    The pool never blocks a submission: if no idle worker is available, a new one is created. Waiting for free
+    workers would dead-lock nested concurrency states, which block their worker while waiting for their children.
+    After finishing an execution, a worker is only kept for reuse, if less than `max_idle_workers` workers are idle.
+
+    :ivar int max_idle_workers: the maximum number of idle workers kept for later executions
+    """
+
+    def __init__(self, max_idle_workers=DEFAULT_WORKER_POOL_SIZE):
+        self.max_idle_workers = max_idle_workers
+        self._idle_workers = []
+        self._lock = threading.Lock()
+        self._worker_counter = 0
+
+    def submit(self, function):
+        """Executes the function in a worker thread
+
+        :param function: the callable to execute
+        :return: a handle to join the execution
+        :rtype: PooledExecution
+        """
+        execution = PooledExecution(function)
+        with self._lock:
+            worker = self._idle_workers.pop() if self._idle_workers else None
+            if worker is None:
+                self._worker_counter += 1
+                worker = _Worker(self, "ExecutionWorker-{0}".format(self._worker_counter))
+                worker.start()
+        worker.executions.put(execution)
+        return execution
+
+    def add_idle_worker(self, worker):
+        """Called by a worker after finishing an execution
+
+        :param _Worker worker: the worker that became idle
+        :return: True, if the worker was added to the idle workers, False if it should terminate
+        :rtype: bool
+        """
+        with self._lock:
+            if len(self._idle_workers) < self.max_idle_workers:
+                self._idle_workers.append(worker)
+                return True
+            return False
+
+    @property
+    def number_of_idle_workers(self):
+        return len(self._idle_workers)
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+_reported_invalid_backends = set()
+
+
+def get_worker_pool():
+    """Returns the worker pool shared by all state machines and creates it, if not existing, yet
+
+    :rtype: WorkerPool
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = WorkerPool(global_config.get_config_value("EXECUTION_WORKER_POOL_SIZE",
+                                                                     DEFAULT_WORKER_POOL_SIZE))
+        return _worker_pool
+
+
+def reset_worker_pool():
+    """Drops the worker pool without stopping its workers
+
+    A forked process inherits the worker pool, but not the threads of its workers. The process has to call this
+    function before executing any state, so that a new pool is created.
+    """
+    global _worker_pool, _worker_pool_lock
+    _worker_pool = None
+    _worker_pool_lock = threading.Lock()
+
+
+def get_execution_backend():
+    """Returns the execution backend set in the core config
+
+    :return: one of the names in EXECUTION_BACKENDS
+    :rtype: str
+    """
+    backend = global_config.get_config_value("EXECUTION_BACKEND", DEFAULT_EXECUTION_BACKEND)
+    if backend not in EXECUTION_BACKENDS:
+        if backend not in _reported_invalid_backends:
+            _reported_invalid_backends.add(backend)
+            logger.error("Invalid EXECUTION_BACKEND '{0}', falling back to '{1}'. Valid backends are: {2}"
+                         "".format(backend, THREAD_BACKEND, ", ".join(EXECUTION_BACKENDS)))
+        return THREAD_BACKEND
+    return backend
+
+
+def start_execution(function, concurrent=True, dedicated_thread=False):
+    """Executes the passed (run) function according to the configured execution backend
+
+    :param function: the function to execute, typically the run method of a state
+    :param bool concurrent: False, if the caller joins the execution right away, which allows the execution in the
+        thread of the caller. True, if the execution has to run in parallel to the caller.
+    :param bool dedicated_thread: If True, a new thread is created independent of the backend
+    :return: a handle of the execution, offering a join method
+    """
+    backend = THREAD_BACKEND if dedicated_thread else get_execution_backend()
+
+    if backend == THREAD_BACKEND:
+        thread = threading.Thread(target=function)
+        thread.start()
+        return thread
+
+    if backend == INLINE_BACKEND and not concurrent:
+        try:
+            function()
+        except Exception as e:
+            logger.error("Error in execution of {0}: {1}\n{2}".format(function, e, traceback.format_exc()))
+        return FinishedExecution()
+
+    return get_worker_pool().submit(function)
@@ -18,15 +18,15 @@
    :synopsis: A module that cares for the execution of the state machine
 
 """
-import copy
-import threading
 import time
 import Queue
+from functools import partial
 from threading import Lock
 
 from gtkmvc import Observable
 from rafcon.core.execution.execution_status import ExecutionStatus
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.execution.execution_future import ExecutionFuture
 from rafcon.utils import log
 from rafcon.utils import plugins
 
@@ -42,7 +42,6 @@ class ExecutionEngine(Observable):
 
     """
 
-    __wait_for_finishing_thread = None
     __running_state_machine = None
 
     def __init__(self, state_machine_manager):
@@ -58,6 +57,7 @@ class ExecutionEngine(Observable):
         self.state_machine_running = False
         self.synchronization_counter = 0
         self.synchronization_lock = Lock()
+        self._execution_future = None
 
     @Observable.observed
     def pause(self):
@@ -159,9 +159,8 @@ class ExecutionEngine(Observable):
         :return: True if the execution finished, False if no state machine was started or a timeout occurred
         :rtype: bool
         """
-        if self.__wait_for_finishing_thread:
-            self.__wait_for_finishing_thread.join(timeout)
-            return not self.__wait_for_finishing_thread.is_alive()
+        if self._execution_future:
+            return self._execution_future.wait(timeout)
         else:
             logger.warn("Cannot join as state machine was not started yet.")
             return False
@@ -201,22 +200,22 @@ class ExecutionEngine(Observable):
         self.__running_state_machine.root_state.concurrency_queue = Queue.Queue(maxsize=0)
 
         if self.__running_state_machine:
-            self.__running_state_machine.start()
-
-            self.__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
-            self.__wait_for_finishing_thread.start()
+            self._execution_future = ExecutionFuture(self.__running_state_machine)
+            self.state_machine_running = True
+            self.__running_state_machine.start(finished_callback=partial(self._on_execution_finished,
+                                                                         self._execution_future))
         else:
             logger.warn("Currently no active state machine! Please create a new state machine.")
             self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
 
-    def _wait_for_finishing(self):
-        """Observe running state machine and stop engine if execution has finished"""
-        self.state_machine_running = True
-        self.__running_state_machine.join()
+    def _on_execution_finished(self, execution_future):
+        """Stop engine when the execution has finished, called in the thread of the root state"""
+        execution_future.state_machine.finalize_execution()
         self.__set_execution_mode_to_finished()
         plugins.run_on_state_machine_execution_finished()
         # self.__set_execution_mode_to_stopped()
         self.state_machine_running = False
+        execution_future.set_done()
 
     def backward_step(self):
         """Take a backward step for all active states in the state machine
@@ -291,6 +290,12 @@ class ExecutionEngine(Observable):
         :param state: the state that as for the execution mode is only passed for debugging reasons
         :return: the current state machine execution status
         """
+        # fast path for a running state machine: the mode is read without lock, as it is a single attribute, and the
+        # synchronization counter is only required for the step modes
+        execution_mode = self._status.execution_mode
+        if execution_mode is StateMachineExecutionStatus.STARTED:
+            return execution_mode
+
         self.synchronization_lock.acquire()
         self.synchronization_counter += 1
         self.synchronization_lock.release()
@@ -319,7 +324,8 @@ class ExecutionEngine(Observable):
             logger.debug("Stepping mode: waiting for next step!")
 
             wait = True
-            for state_path in copy.deepcopy(self.run_to_states):
+            # the paths are strings, thus a shallow copy suffices to iterate while removing
+            for state_path in list(self.run_to_states):
                 next_child_state_path = None
                 # can be None in case of no transition given
                 if next_child_state_to_execute:
@@ -394,7 +400,7 @@ class ExecutionEngine(Observable):
         """
         if self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OVER:
             step_over_to_step_out_transform_found = False
-            for state_path in copy.deepcopy(self.run_to_states):
+            for state_path in list(self.run_to_states):
                 if state_path == state.get_path():
                     self.run_to_states.remove(state_path)
                     step_over_to_step_out_transform_found = True
@@ -455,21 +461,25 @@ class ExecutionEngine(Observable):
         """
         return self._status
 
+    @property
+    def execution_future(self):
+        """The future of the current or last execution, None if no state machine was started, yet
+
+        :rtype: rafcon.core.execution.execution_future.ExecutionFuture
+        """
+        return self._execution_future
+
     @property
     def run_to_states(self):
         """Property for the _run_to_states field
 
+        Reading and replacing the list reference is atomic, thus no lock is required.
         """
-        self.execution_engine_lock.acquire()
-        return_value = self._run_to_states
-        self.execution_engine_lock.release()
-        return return_value
+        return self._run_to_states
 
     @run_to_states.setter
     def run_to_states(self, run_to_states):
         if not isinstance(run_to_states, list):
             raise TypeError("run_to_states must be of type list")
-        self.execution_engine_lock.acquire()
         self._run_to_states = run_to_states
-        self.execution_engine_lock.release()
 
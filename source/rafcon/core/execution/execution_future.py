@@ -0,0 +1,92 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_future
+   :synopsis: A module representing the completion of a state machine execution
+
+"""
+
+import threading
+import traceback
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+class ExecutionFuture(object):
+    """Represents the completion of a state machine execution started by the execution engine
+
+    The future is completed, when the execution finished or was stopped. Waiting threads are woken up right away and
+    the registered callbacks are called in the thread completing the execution.
+
+    :ivar rafcon.core.state_machine.StateMachine state_machine: the executed state machine
+    """
+
+    def __init__(self, state_machine):
+        self.state_machine = state_machine
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        """Checks whether the execution finished
+
+        :rtype: bool
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Blocking wait for the execution to finish
+
+        :param float timeout: Maximum time to wait or None for infinitely
+        :return: True if the execution finished, False if a timeout occurred
+        :rtype: bool
+        """
+        self._done.wait(timeout)
+        return self._done.is_set()
+
+    @property
+    def final_outcome(self):
+        """The final outcome of the root state, None if the execution did not finish, yet
+
+        :rtype: rafcon.core.state_elements.outcome.Outcome
+        """
+        if not self.done():
+            return None
+        return self.state_machine.root_state.final_outcome
+
+    def add_done_callback(self, callback):
+        """Registers a function to be called with the future as argument, when the execution finished
+
+        If the execution already finished, the callback is called right away in the calling thread. Otherwise, it is
+        called in the thread completing the execution. To pass the completion to an event loop, the callback should
+        hand the future over in a thread-safe way, e.g. with `reactor.callFromThread`.
+
+        :param callback: the function to call
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self._call(callback)
+
+    def set_done(self):
+        """Completes the future, called by the execution engine"""
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._call(callback)
+
+    def _call(self, callback):
+        try:
+            callback(self)
+        except Exception as e:
+            logger.error("Error in callback {0} of the execution of {1}: {2}\n{3}"
+                         "".format(callback, self.state_machine, e, traceback.format_exc()))
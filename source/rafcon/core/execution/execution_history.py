@@ -19,66 +19,173 @@
 """
 import time
 import copy
-from collections import Iterable, Sized
+from collections import Iterable, Sized, deque
 import json
 from jsonconversion.decoder import JSONObjectDecoder
 from jsonconversion.encoder import JSONObjectEncoder
 
 import shelve
-from threading import Lock
+import Queue
+from threading import Lock, Thread
 from enum import Enum
 from gtkmvc import Observable
 import traceback
 
 from rafcon.core.id_generator import history_item_id_generator
+from rafcon.core.config import global_config
+from rafcon.core import data_passing
 from rafcon.utils import log
+from rafcon.utils import record_file
+from rafcon.utils.record_file import BINARY_LOG_INDEX_FILE, BINARY_LOG_SEGMENT_FILE
 logger = log.get_logger(__name__)
 import os
 import subprocess
 import pickle
-from weakref import ref
+from weakref import ref, WeakKeyDictionary
+
+
+# queued to signal the writer thread of an ExecutionHistoryStorage to stop after writing all previous items
+_STOP_WRITING = object()
 
 
 class ExecutionHistoryStorage(object):
-    def __init__(self, filename):
+    """Stores history items in a shelve file
+
+    The items are written by a background thread, so that the executing threads do not block on disk I/O. The writer
+    commits all items queued in the meantime in one batch and synchronizes the shelve with the disk every
+    `flush_interval` seconds. If the queue of pending items is full, store_item blocks until the writer caught up.
+
+    :ivar str filename: the path of the shelve file
+    :ivar float flush_interval: the maximum time in seconds between writing an item and syncing it to the disk
+    """
+
+    def __init__(self, filename, flush_interval=None, queue_size=None):
         self.filename = filename
         self.store_lock = Lock()
+        self.store = None
+        if flush_interval is None:
+            flush_interval = global_config.get_config_value("EXECUTION_LOG_FLUSH_INTERVAL", 1.)
+        if queue_size is None:
+            queue_size = global_config.get_config_value("EXECUTION_LOG_QUEUE_SIZE", 10000)
+        self.flush_interval = flush_interval
+        self._closed = False
+        self._close_lock = Lock()
+        self._queue = Queue.Queue(maxsize=queue_size)
+        self._writer = None
         try:
-            # 'c' for read/write/create
-            # protocol 2 cause of in some cases smaller file size
-            # writeback disabled, cause we don't need caching of entries in memory but continuous writes to the disk
-            self.store = shelve.open(filename, flag='c', protocol=2, writeback=False)
+            self._open_store()
             logger.debug('Openend log file for writing %s' % self.filename)
         except Exception as e:
             logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
+            # without a store, there is nothing to write to
+            self._closed = True
+            return
+
+        # The writer thread references the storage, so the storage must be closed explicitly to stop the thread
+        self._writer = Thread(target=self._write_queued_items, name="ExecutionLogWriter")
+        self._writer.daemon = True
+        self._writer.start()
+
+    def _open_store(self):
+        # 'c' for read/write/create
+        # protocol 2 cause of in some cases smaller file size
+        # writeback disabled, cause we don't need caching of entries in memory but continuous writes to the disk
+        self.store = shelve.open(self.filename, flag='c', protocol=2, writeback=False)
+
+    def _write_item(self, key, value):
+        self.store[key] = value
+
+    def _sync(self):
+        self.store.sync()
+
+    def _close_store(self):
+        self.store.close()
 
     def store_item(self, key, value):
-        self.store_lock.acquire()
-        try:
-            self.store[key] = value
-        except Exception as e:
-            logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
-        finally:
-            self.store_lock.release()
+        """Queues an item for being written to the log file
+
+        :param key: the key of the item, i.e. the history item id
+        :param value: the dictionary representation of the history item
+        """
+        if self._closed:
+            if self._writer is not None:
+                logger.error('Cannot store item {0} in the already closed log file {1}'.format(key, self.filename))
+            return
+        self._queue.put((key, value))
+
+    def _write_queued_items(self):
+        """Writes the queued items in batches until the storage is closed"""
+        last_sync_time = time.time()
+        unsynced_items = False
+        while True:
+            timeout = max(0., last_sync_time + self.flush_interval - time.time()) if unsynced_items else None
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except Queue.Empty:
+                self._sync_store()
+                last_sync_time = time.time()
+                unsynced_items = False
+                continue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Queue.Empty:
+                    break
+
+            stop = False
+            with self.store_lock:
+                for item in batch:
+                    if item is _STOP_WRITING:
+                        stop = True
+                        continue
+                    key, value = item
+                    try:
+                        self._write_item(key, value)
+                    except Exception as e:
+                        logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
+            unsynced_items = True
+            if stop or time.time() - last_sync_time >= self.flush_interval:
+                self._sync_store()
+                last_sync_time = time.time()
+                unsynced_items = False
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                break
+
+    def _sync_store(self):
+        with self.store_lock:
+            try:
+                self._sync()
+            except Exception as e:
+                logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
 
     def flush(self):
-        self.store_lock.acquire()
-        try:
-            self.store.close()
-            self.store = shelve.open(self.filename, flag='c', protocol=2, writeback=False)
-            logger.debug('Flushed log file %s' % self.filename)
-        except Exception as e:
-            logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
-        finally:
-            self.store_lock.release()
+        """Waits until all queued items are written and synchronized with the disk"""
+        if self._writer is None:
+            return
+        if not self._closed:
+            self._queue.join()
+        self._sync_store()
+        logger.debug('Flushed log file %s' % self.filename)
 
     def close(self, make_read_and_writable_for_all=False):
+        """Writes all queued items and closes the log file
+
+        :param bool make_read_and_writable_for_all: whether to make the log file readable and writable for all users
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP_WRITING)
+            self._writer.join()
         self.store_lock.acquire()
         try:
-            self.store.close()
+            self._close_store()
             logger.debug('Closed log file %s' % self.filename)
             if make_read_and_writable_for_all:
-                ret = subprocess.call(['chmod', 'a+rw', self.filename])
+                ret = subprocess.call(['chmod', '-R', 'a+rw', self.filename])
                 if ret:
                     logger.debug('Could not make log file readable for all. chmod a+rw failed on %s.' % self.filename)
                 else:
@@ -87,16 +194,60 @@ class ExecutionHistoryStorage(object):
             logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
         finally:
             self.store_lock.release()
-    
-    def __del__(self):
-        self.store_lock.acquire()
-        try:
-            self.store.close()
-            logger.debug('Closed log file %s' % self.filename)
-        except Exception as e:
-            logger.error('Exception: ' + str(e) + str(traceback.format_exc()))
-        finally:
-            self.store_lock.release()
+
+
+class ExecutionHistoryBinaryStorage(ExecutionHistoryStorage):
+    """Stores history items in an append-only binary log
+
+    The log is a directory with segment files, which contain the dictionaries of the history items as records of a
+    :mod:`rafcon.utils.record_file` in the order of their execution. A new segment is started, when the current one
+    exceeds `segment_size` bytes. The sidecar index file holds one record per item, consisting of the
+    history_item_id, the segment number and offset of the item as well as its run_id, path, timestamp and item_type.
+    This allows readers to seek to single items and to filter items without reading the segments. As the files are
+    only appended, the log can be read while being written. The logs are read with the functions of
+    :mod:`rafcon.utils.execution_log`.
+
+    :ivar int segment_size: the size in bytes after which a new segment file is started
+    """
+
+    def __init__(self, filename, flush_interval=None, queue_size=None, segment_size=None):
+        if segment_size is None:
+            segment_size = global_config.get_config_value("EXECUTION_LOG_SEGMENT_SIZE", 256 * 1024 * 1024)
+        self.segment_size = segment_size
+        self._segment_number = 0
+        self._segment = None
+        self._index = None
+        super(ExecutionHistoryBinaryStorage, self).__init__(filename, flush_interval, queue_size)
+
+    def _open_store(self):
+        if not os.path.exists(self.filename):
+            os.makedirs(self.filename)
+        self._index = record_file.open_record_file(os.path.join(self.filename, BINARY_LOG_INDEX_FILE))
+        self._segment = record_file.open_record_file(self._get_segment_path(self._segment_number))
+
+    def _get_segment_path(self, segment_number):
+        return os.path.join(self.filename, BINARY_LOG_SEGMENT_FILE.format(segment_number))
+
+    def _write_item(self, key, value):
+        if self._segment.tell() >= self.segment_size:
+            self._segment.close()
+            self._segment_number += 1
+            self._segment = record_file.open_record_file(self._get_segment_path(self._segment_number))
+        offset = self._segment.tell()
+        record_file.append_record(self._segment, value)
+        record_file.append_record(self._index, (key, self._segment_number, offset, value.get('run_id'),
+                                                value.get('path'), value.get('timestamp'), value.get('item_type')))
+
+    def _sync(self):
+        # the segment is synced first, so that index entries never refer to data missing on the disk
+        for log_file in (self._segment, self._index):
+            log_file.flush()
+            os.fsync(log_file.fileno())
+
+    def _close_store(self):
+        self._sync()
+        self._segment.close()
+        self._index.close()
 
 
 class ExecutionHistory(Observable, Iterable, Sized):
@@ -104,15 +255,32 @@ class ExecutionHistory(Observable, Iterable, Sized):
 
         It stores all history elements in a stack wise fashion.
 
+        The number and the age of the retained history items can be limited. Older items are then evicted when new
+        items are pushed, so that long running state machines do not run out of memory. If the execution log is
+        enabled, the evicted items remain available in the log, as every item is stored when being pushed.
+
         :ivar initial_prev: optional link to a previous element for the first element pushed into this history of
                             type :class:`rafcon.core.execution.execution_history.HistoryItem`
+        :ivar int max_items: the maximum number of retained history items, None or 0 for no limit
+        :ivar float max_age: the maximum age in seconds of retained history items, None or 0 for no limit
+        :ivar int number_of_evicted_items: the number of history items evicted so far
     """
 
-    def __init__(self, initial_prev=None):
+    def __init__(self, initial_prev=None, max_items=None, max_age=None):
         super(ExecutionHistory, self).__init__()
-        self._history_items = []            
+        self._history_items = deque()
         self.initial_prev = initial_prev
-        self.execution_history_storage = None        
+        self.execution_history_storage = None
+        if max_items is None:
+            max_items = global_config.get_config_value("EXECUTION_HISTORY_MAX_ITEMS", 0)
+        if max_age is None:
+            max_age = global_config.get_config_value("EXECUTION_HISTORY_MAX_AGE", 0)
+        self.max_items = max_items
+        self.max_age = max_age
+        self.number_of_evicted_items = 0
+        # state --> {scoped data key: (scoped data element, copy of the element stored in the history)}
+        # weak keys, so that the entries of states not returning to this history, e.g. stopped ones, are not kept
+        self._scoped_data_copies = WeakKeyDictionary()
 
     def destroy(self):
         # logger.verbose("Destroy execution history!")
@@ -125,10 +293,12 @@ class ExecutionHistory(Observable, Iterable, Sized):
                 for history_item in execution_history_iterator:
                     history_item.destroy()
         self._history_items = None
+        self._scoped_data_copies = None
         self.initial_prev = None
 
     def __iter__(self):
-        return iter(self._history_items)                        
+        # iterate over a snapshot, as a deque must not be modified by the executing states during the iteration
+        return iter(list(self._history_items))
 
     def set_execution_history_storage(self, execution_history_storage):
         self.execution_history_storage = execution_history_storage
@@ -137,6 +307,8 @@ class ExecutionHistory(Observable, Iterable, Sized):
         return len(self._history_items)
 
     def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._history_items)[index]
         return self._history_items[index]
 
     def get_last_history_item(self):
@@ -158,8 +330,82 @@ class ExecutionHistory(Observable, Iterable, Sized):
         if self.execution_history_storage is not None:
             self.execution_history_storage.store_item(current_item.history_item_id, current_item.to_dict())
         self._history_items.append(current_item)
+        self._evict_items()
         return current_item
 
+    def _copy_scoped_data(self, state_for_scoped_data):
+        """Copies the scoped data of a state for a new history item
+
+        The container states do not modify scoped data elements, but replace them on every write. Thus, the copy of an
+        element, which is still part of the scoped data since the last copy, is shared with the previous history
+        item. Only new elements are copied, which keeps consecutive history items of long running container states
+        small.
+
+        :param state_for_scoped_data: the state of which the scoped data needs to be saved or None
+        :return: the scoped data dictionary for the history item
+        :rtype: dict
+        """
+        if state_for_scoped_data is None:
+            return {}
+        previous_copies = self._scoped_data_copies.get(state_for_scoped_data, {})
+        current_copies = {}
+        new_elements = {}
+        for key, scoped_data_element in state_for_scoped_data._scoped_data.items():
+            previous_copy = previous_copies.get(key)
+            if previous_copy is not None and previous_copy[0] is scoped_data_element:
+                current_copies[key] = previous_copy
+            else:
+                new_elements[key] = scoped_data_element
+        for key, element_copy in data_passing.copy_scoped_data(new_elements).iteritems():
+            current_copies[key] = (new_elements[key], element_copy)
+        self._scoped_data_copies[state_for_scoped_data] = current_copies
+        return {key: element_copy for key, (_, element_copy) in current_copies.iteritems()}
+
+    def _evict_items(self):
+        """Removes the oldest history items exceeding the maximum number or age of retained items
+
+        The evicted items are not destroyed, as they might still be used by running states, e.g. a
+        :class:`ConcurrencyItem` by its concurrency state. The first retained item is unlinked from its evicted
+        predecessor, so that the evicted items can be garbage collected.
+        """
+        number_of_items = len(self._history_items)
+        if self.max_items:
+            while len(self._history_items) > self.max_items:
+                self._history_items.popleft()
+        if self.max_age:
+            min_timestamp = time.time() - self.max_age
+            # the last item is always retained
+            while len(self._history_items) > 1 and self._history_items[0].timestamp < min_timestamp:
+                self._history_items.popleft()
+        if len(self._history_items) < number_of_items:
+            self.number_of_evicted_items += number_of_items - len(self._history_items)
+            self._history_items[0].prev = None
+
+    def is_backward_step_possible(self):
+        """Checks whether the history items needed to step back over the last executed state are still retained
+
+        A backward step requires the ReturnItem as well as the CallItem of the last execution. If history items were
+        evicted, these might be missing.
+
+        :return: True, if the last executed state can be executed backwards
+        :rtype: bool
+        """
+        last_history_item = self.get_last_history_item()
+        if last_history_item is None:
+            return False
+        if self.number_of_evicted_items == 0:
+            return True
+        if isinstance(last_history_item, ReturnItem):
+            history_item = last_history_item.prev
+            while history_item is not None:
+                if isinstance(history_item, CallItem) and history_item.run_id == last_history_item.run_id and \
+                        history_item.call_type is last_history_item.call_type:
+                    return True
+                history_item = history_item.prev
+            return False
+        # the CallItem of a container state is preceded by the CallItem of its parent, except for the root state
+        return last_history_item.prev is not None or last_history_item.state_reference.is_root_state
+
     @Observable.observed
     def push_call_history_item(self, state, call_type, state_for_scoped_data, input_data=None):
         """Adds a new call-history-item to the history item list
@@ -177,8 +423,8 @@ class ExecutionHistory(Observable, Iterable, Sized):
         from rafcon.core.states.library_state import LibraryState  # delayed imported on purpose
         if isinstance(state_for_scoped_data, LibraryState):
             state_for_scoped_data = state_for_scoped_data.state_copy
-        return_item = CallItem(state, last_history_item, call_type, state_for_scoped_data, input_data,
-                               state.run_id)
+        return_item = CallItem(state, last_history_item, call_type, None, input_data, state.run_id,
+                               scoped_data=self._copy_scoped_data(state_for_scoped_data))
         return self._push_item(last_history_item, return_item)
 
     @Observable.observed
@@ -198,8 +444,11 @@ class ExecutionHistory(Observable, Iterable, Sized):
         from rafcon.core.states.library_state import LibraryState  # delayed imported on purpose
         if isinstance(state_for_scoped_data, LibraryState):
             state_for_scoped_data = state_for_scoped_data.state_copy
-        return_item = ReturnItem(state, last_history_item, call_type, state_for_scoped_data, output_data,
-                                 state.run_id)
+        return_item = ReturnItem(state, last_history_item, call_type, None, output_data, state.run_id,
+                                 scoped_data=self._copy_scoped_data(state_for_scoped_data))
+        # the scoped data of a returned container state is not copied again, until it is executed again
+        if state_for_scoped_data is state:
+            self._scoped_data_copies.pop(state, None)
         return self._push_item(last_history_item, return_item)
 
     @Observable.observed
@@ -241,12 +490,23 @@ class ExecutionHistory(Observable, Iterable, Sized):
             return None
 
 
+def _intern_path(path):
+    """Interns a state path, so that all history items of a state share the same string object"""
+    try:
+        return intern(path)
+    except TypeError:  # unicode paths cannot be interned
+        return path
+
+
 class HistoryItem(object):
     """Class representing an entry within the history
 
     An abstract class that serves as a data structure to hold all important information of a certain point in time
     during the execution of a state machine. A history item is an element in a doubly linked history item list.
 
+    History items use slots instead of a dictionary for their attributes, as a long running execution creates millions
+    of them.
+
     :ivar state_reference: a reference to the state performing a certain action that is going to be saved
     :ivar path: the state path
     :ivar timestamp: the time of the call/return
@@ -254,9 +514,12 @@ class HistoryItem(object):
     :ivar next: the next history item
     """
 
+    __slots__ = ('_state_reference', 'path', 'timestamp', 'run_id', 'prev', 'next', 'history_item_id', 'state_type',
+                 '__weakref__')
+
     def __init__(self, state, prev, run_id):
         self._state_reference = state
-        self.path = copy.deepcopy(state.get_path())
+        self.path = _intern_path(state.get_path())
         self.timestamp = time.time()
         self.run_id = run_id
         self.prev = prev
@@ -322,6 +585,9 @@ class HistoryItem(object):
 
 
 class StateMachineStartItem(HistoryItem):
+
+    __slots__ = ('sm_dict', 'os_environment')
+
     def __init__(self, state_machine, run_id):
         HistoryItem.__init__(self, state_machine.root_state, None, run_id)
         from rafcon.core.state_machine import StateMachine
@@ -354,17 +620,24 @@ class ScopedDataItem(HistoryItem):
     :ivar call_type: the call type of the execution step, i.e. if it refers to a container state or an execution state
     :ivar state_for_scoped_data: the state of which the scoped data will be stored as the context data that is necessary
         to re-execute the state
+    :ivar scoped_data: an already copied scoped data dictionary, which is used instead of copying the scoped data of
+        state_for_scoped_data
     """
 
-    def __init__(self, state, prev, call_type, state_for_scoped_data, child_state_input_output_data, run_id):
+    __slots__ = ('call_type', 'scoped_data', 'child_state_input_output_data')
+
+    def __init__(self, state, prev, call_type, state_for_scoped_data, child_state_input_output_data, run_id,
+                 scoped_data=None):
         HistoryItem.__init__(self, state, prev, run_id)
-        if call_type in CallType:
-            self.call_type_str = call_type.name
-        else:
+        if call_type not in CallType:
             raise Exception('unkown calltype, neither CONTAINER nor EXECUTE')
         self.call_type = call_type
-        self.scoped_data = {} if state_for_scoped_data is None else copy.deepcopy(state_for_scoped_data._scoped_data)
-        self.child_state_input_output_data = copy.deepcopy(child_state_input_output_data)
+        if scoped_data is not None:
+            self.scoped_data = scoped_data
+        else:
+            self.scoped_data = {} if state_for_scoped_data is None else \
+                data_passing.copy_scoped_data(state_for_scoped_data._scoped_data)
+        self.child_state_input_output_data = data_passing.copy_values_of_dict(child_state_input_output_data)
 
     def to_dict(self):
         record = HistoryItem.to_dict(self)
@@ -405,6 +678,10 @@ class ScopedDataItem(HistoryItem):
         record['call_type'] = self.call_type_str
         return record
 
+    @property
+    def call_type_str(self):
+        return self.call_type.name
+
     def __str__(self):
         return "SingleItem %s" % (HistoryItem.__str__(self))
 
@@ -412,8 +689,12 @@ class ScopedDataItem(HistoryItem):
 class CallItem(ScopedDataItem):
     """A history item to represent a state call
     """
-    def __init__(self, state, prev, call_type, state_for_scoped_data, input_data, run_id):
-        ScopedDataItem.__init__(self, state, prev, call_type, state_for_scoped_data, input_data, run_id)
+
+    __slots__ = ('outcome',)
+
+    def __init__(self, state, prev, call_type, state_for_scoped_data, input_data, run_id, scoped_data=None):
+        ScopedDataItem.__init__(self, state, prev, call_type, state_for_scoped_data, input_data, run_id,
+                                scoped_data)
         self.outcome = None
 
     def __str__(self):
@@ -427,8 +708,12 @@ class CallItem(ScopedDataItem):
 class ReturnItem(ScopedDataItem):
     """A history item to represent the return of a root state call
     """
-    def __init__(self, state, prev, call_type, state_for_scoped_data, output_data, run_id):
-        ScopedDataItem.__init__(self, state, prev, call_type, state_for_scoped_data, output_data, run_id)
+
+    __slots__ = ('outcome',)
+
+    def __init__(self, state, prev, call_type, state_for_scoped_data, output_data, run_id, scoped_data=None):
+        ScopedDataItem.__init__(self, state, prev, call_type, state_for_scoped_data, output_data, run_id,
+                                scoped_data)
         self.outcome = copy.deepcopy(state.final_outcome)
 
     def __str__(self):
@@ -448,6 +733,9 @@ class ReturnItem(ScopedDataItem):
 class ConcurrencyItem(HistoryItem):
     """A class to hold all the data for an invocation of several concurrent threads.
     """
+
+    __slots__ = ('execution_histories',)
+
     def __init__(self, container_state, prev, number_concurrent_threads, run_id, execution_history_storage):
         HistoryItem.__init__(self, container_state, prev, run_id)
         self.execution_histories = []
@@ -0,0 +1,326 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: process_execution
+   :synopsis: A module to execute the scripts of execution states in worker processes
+
+The script of an execution state with the flag `run_in_process` is executed in a worker process, so that CPU-bound
+scripts of concurrent states are not serialized by the GIL. The inputs, outputs and persistent variables of the state
+are pickled and sent to the worker. Calls of the global variable manager and the logger of the state are forwarded to
+the thread executing the state. A preemption is signaled to the script by an event, which is checked by
+`self.preempted` and `self.preemptive_wait`. If the script does not return within the termination timeout after the
+preemption, the worker process is terminated.
+"""
+
+import multiprocessing
+import threading
+import time
+import traceback
+
+from rafcon.core.config import global_config
+from rafcon.core.custom_exceptions import ProcessExecutionError
+from rafcon.core.script import get_code_object
+import rafcon.core.singleton
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+DEFAULT_PROCESS_POOL_SIZE = 4
+DEFAULT_TERMINATION_TIMEOUT = 1.
+# the interval in seconds, in which the executing thread checks for a preemption of the state
+POLL_INTERVAL = 0.05
+
+# the methods of the global variable manager, which can be called by scripts running in a worker process
+GLOBAL_VARIABLE_MANAGER_METHODS = ('set_variable', 'get_variable', 'variable_can_be_referenced', 'delete_variable',
+                                   'lock_variable', 'unlock_variable', 'set_locked_variable', 'get_locked_variable',
+                                   'variable_exist', 'data_type_exist', 'is_locked', 'get_all_keys_starting_with',
+                                   'get_all_keys', 'get_representation', 'get_data_type')
+
+
+class _RemoteLogger(object):
+    """Forwards the log messages of a script in a worker process to the logger of the state"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, level):
+        if level.startswith('_'):
+            raise AttributeError(level)
+
+        def log_message(message, *args):
+            if args:
+                message = message % args
+            self._connection.send(('log', level, str(message)))
+        return log_message
+
+
+class _RemoteGlobalVariableManager(object):
+    """Forwards the calls of a script in a worker process to the global variable manager"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, name):
+        if name not in GLOBAL_VARIABLE_MANAGER_METHODS:
+            raise AttributeError("The global variable manager of a script running in a process has no attribute "
+                                 "'{0}'".format(name))
+
+        def call_method(*args, **kwargs):
+            self._connection.send(('gvm', name, args, kwargs))
+            succeeded, result = self._connection.recv()
+            if not succeeded:
+                raise result
+            return result
+        return call_method
+
+
+class _RemoteState(object):
+    """Represents the execution state (`self`) in a script running in a worker process"""
+
+    def __init__(self, connection, preempted_event, state_info, input_data, output_data, persistent_variables):
+        self.name = state_info['name']
+        self.state_id = state_info['state_id']
+        self.run_id = state_info['run_id']
+        self._path = state_info['path']
+        self._preempted_event = preempted_event
+        self.logger = _RemoteLogger(connection)
+        self.input_data = input_data
+        self.output_data = output_data
+        self.persistent_variables = persistent_variables
+
+    def get_path(self):
+        return self._path
+
+    @property
+    def preempted(self):
+        return self._preempted_event.is_set()
+
+    def preemptive_wait(self, time=None):
+        """Waiting method which can be preempted, see :meth:`rafcon.core.states.state.State.preemptive_wait`
+
+        :param time: The time in seconds to wait or None (default) for infinity
+        :return: True, if the wait was preempted, False else
+        """
+        return self._preempted_event.wait(time)
+
+
+def _run_worker(connection, preempted_event):
+    """The main function of a worker process, executing the scripts sent through the connection
+
+    Only the compiled code of the scripts is cached. Each task is executed in a fresh module, so that the module
+    globals are neither shared between states nor between executions, like for the execution within the process.
+    """
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        script_text, filename, state_info, inputs, outputs, persistent_variables, backward_execution = task
+        try:
+            module = {}
+            exec get_code_object(script_text, '%s (%s)' % (filename, state_info['path'])) in module
+            state = _RemoteState(connection, preempted_event, state_info, inputs, outputs, persistent_variables)
+            gvm = _RemoteGlobalVariableManager(connection)
+            if backward_execution:
+                outcome_item = None
+                if 'backward_execute' in module:
+                    module['backward_execute'](state, inputs, outputs, gvm)
+            else:
+                outcome_item = module['execute'](state, inputs, outputs, gvm)
+            connection.send(('result', outcome_item, outputs, state.persistent_variables))
+        except Exception as e:
+            connection.send(('error', "{0}: {1}".format(type(e).__name__, e), traceback.format_exc()))
+
+
+class WorkerProcess(object):
+    """A process executing the scripts of execution states one after another
+
+    :ivar connection: the connection to the process
+    :ivar preempted_event: the event signaling the preemption of the currently executed state
+    """
+
+    def __init__(self):
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.preempted_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(target=_run_worker, args=(child_connection, self.preempted_event))
+        self.process.daemon = True
+        self.process.start()
+        child_connection.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        """Lets the process exit after the current task"""
+        try:
+            self.connection.send(None)
+        except (IOError, ValueError):
+            pass
+        self.connection.close()
+
+    def terminate(self):
+        """Kills the process, e.g. if a preempted script does not return"""
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerProcessPool(object):
+    """A pool of reusable worker processes
+
+    Like the :class:`rafcon.core.execution.execution_backend.WorkerPool`, the pool never blocks: if no idle process is
+    available, a new one is started. After an execution, a process is kept for reuse, if less than `max_idle_workers`
+    processes are idle.
+
+    :ivar int max_idle_workers: the maximum number of idle processes kept for later executions
+    """
+
+    def __init__(self, max_idle_workers=DEFAULT_PROCESS_POOL_SIZE):
+        self.max_idle_workers = max_idle_workers
+        self._idle_workers = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Returns an idle worker process or starts a new one
+
+        :rtype: WorkerProcess
+        """
+        with self._lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.is_alive():
+                    return worker
+        return WorkerProcess()
+
+    def release(self, worker):
+        """Returns a worker process after a finished execution
+
+        :param WorkerProcess worker: the worker, which finished its execution
+        """
+        with self._lock:
+            if worker.is_alive() and len(self._idle_workers) < self.max_idle_workers:
+                self._idle_workers.append(worker)
+                return
+        worker.stop()
+
+    def shutdown(self):
+        """Stops all idle worker processes"""
+        with self._lock:
+            idle_workers, self._idle_workers = self._idle_workers, []
+        for worker in idle_workers:
+            worker.stop()
+
+    @property
+    def number_of_idle_workers(self):
+        return len(self._idle_workers)
+
+
+_worker_process_pool = None
+_worker_process_pool_lock = threading.Lock()
+
+
+def get_worker_process_pool():
+    """Returns the worker process pool shared by all state machines and creates it, if not existing, yet
+
+    :rtype: WorkerProcessPool
+    """
+    global _worker_process_pool
+    with _worker_process_pool_lock:
+        if _worker_process_pool is None:
+            _worker_process_pool = WorkerProcessPool(global_config.get_config_value("PROCESS_EXECUTION_POOL_SIZE",
+                                                                                    DEFAULT_PROCESS_POOL_SIZE))
+        return _worker_process_pool
+
+
+def reset_worker_process_pool():
+    """Drops the worker process pool without stopping its processes
+
+    A forked process inherits the pool, but the worker processes belong to the parent process. The forked process has
+    to call this function before executing any state, so that it starts its own worker processes.
+    """
+    global _worker_process_pool, _worker_process_pool_lock
+    _worker_process_pool = None
+    _worker_process_pool_lock = threading.Lock()
+
+
+def _handle_global_variable_manager_call(worker, method_name, args, kwargs):
+    try:
+        result = (True, getattr(rafcon.core.singleton.global_variable_manager, method_name)(*args, **kwargs))
+    except Exception as e:
+        result = (False, e)
+    try:
+        worker.connection.send(result)
+    except Exception as e:  # the result or the exception cannot be pickled
+        worker.connection.send((False, ProcessExecutionError("The result of {0} cannot be sent to the process: "
+                                                             "{1}".format(method_name, e))))
+
+
+def execute_in_process(state, inputs, outputs, backward_execution=False):
+    """Executes the script of an execution state in a worker process
+
+    The outputs and the persistent variables of the state are updated with the values of the script.
+
+    :param rafcon.core.states.execution_state.ExecutionState state: the state whose script is executed
+    :param dict inputs: the input data of the script
+    :param dict outputs: the output data of the script
+    :param bool backward_execution: Flag whether to run the script in backwards mode
+    :return: the return value of the execute function of the script, None if the script was terminated
+    :raises rafcon.core.custom_exceptions.ProcessExecutionError: if the script raised an exception or the worker died
+    """
+    pool = get_worker_process_pool()
+    worker = pool.acquire()
+    worker.preempted_event.clear()
+    state_info = {'name': state.name, 'state_id': state.state_id, 'run_id': state.run_id, 'path': state.get_path()}
+    try:
+        worker.connection.send((state.script_text, state.script.filename, state_info, inputs, outputs,
+                                state.persistent_variables, backward_execution))
+    except Exception:
+        # nothing was sent, if the data cannot be pickled
+        pool.release(worker)
+        raise
+
+    termination_timeout = global_config.get_config_value("PROCESS_EXECUTION_TERMINATION_TIMEOUT",
+                                                         DEFAULT_TERMINATION_TIMEOUT)
+    preemption_time = None
+    while True:
+        if worker.connection.poll(POLL_INTERVAL):
+            try:
+                message = worker.connection.recv()
+            except EOFError:
+                worker.terminate()
+                raise ProcessExecutionError("The worker process of {0} died unexpectedly".format(state))
+            if message[0] == 'result':
+                outcome_item, new_outputs, persistent_variables = message[1:]
+                outputs.clear()
+                outputs.update(new_outputs)
+                state.persistent_variables = persistent_variables
+                pool.release(worker)
+                return outcome_item
+            elif message[0] == 'error':
+                pool.release(worker)
+                raise ProcessExecutionError("{0}\nTraceback of the worker process:\n{1}".format(*message[1:]))
+            elif message[0] == 'log':
+                getattr(state.logger, message[1])(message[2])
+            elif message[0] == 'gvm':
+                _handle_global_variable_manager_call(worker, *message[1:])
+        elif not worker.is_alive():
+            worker.terminate()
+            raise ProcessExecutionError("The worker process of {0} died unexpectedly with exit code {1}"
+                                        "".format(state, worker.process.exitcode))
+
+        if state.preempted:
+            if preemption_time is None:
+                worker.preempted_event.set()
+                preemption_time = time.time()
+            elif time.time() - preemption_time > termination_timeout:
+                logger.warning("Terminating the worker process of {0}, as the script did not return within {1}s "
+                               "after its preemption".format(state, termination_timeout))
+                worker.terminate()
+                return None
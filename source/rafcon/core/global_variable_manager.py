@@ -25,6 +25,7 @@ import copy
 from gtkmvc import Observable
 from threading import Lock, currentThread
 from rafcon.core.id_generator import *
+from rafcon.core import data_passing
 
 from rafcon.utils.type_helpers import type_inherits_of_type
 from rafcon.utils import log
@@ -90,7 +91,7 @@ class GlobalVariableManager(Observable):
             self.__global_variable_type_dictionary[key] = data_type
             self.__variable_references[key] = True
         else:
-            self.__global_variable_dictionary[key] = copy.deepcopy(value)
+            self.__global_variable_dictionary[key] = data_passing.copy_value(value, data_passing.DEEPCOPY_POLICY)
             self.__global_variable_type_dictionary[key] = data_type
             self.__variable_references[key] = False
         # --- release variable
@@ -128,13 +129,18 @@ class GlobalVariableManager(Observable):
                 if per_reference or per_reference is None:
                     return_value = self.__global_variable_dictionary[key]
                 else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
+                    return_value = data_passing.copy_value(self.__global_variable_dictionary[key],
+                                                           data_passing.DEEPCOPY_POLICY)
             else:
                 if per_reference:
                     self.unlock_variable(key, access_key)
                     raise RuntimeError("Variable cannot be accessed by reference")
+                elif per_reference is None:
+                    # values stored per value are copied according to the data passing policy
+                    return_value = data_passing.copy_value(self.__global_variable_dictionary[key])
                 else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
+                    return_value = data_passing.copy_value(self.__global_variable_dictionary[key],
+                                                           data_passing.DEEPCOPY_POLICY)
             # --- release variable
 
             if unlock:
@@ -0,0 +1,120 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: library_index
+   :synopsis: A module caching the directory structure of the library root paths
+
+The index stores for every scanned directory its modification time, whether it contains a state machine, its sub
+directories and the state machines packed into single archive files it contains. Adding, removing or renaming an
+entry of a directory changes the modification time of the directory, thus the content of a directory is only listed
+again, if its modification time changed. The index can be persisted, so that also the first scan after the start of
+RAFCON only needs to stat the directories.
+"""
+
+import json
+import os
+import threading
+
+from rafcon.core.storage import storage
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+
+
+class LibraryIndex(object):
+    """Caches the listings of the directories within the library root paths
+
+    :ivar str path: the path of the file the index is persisted to, None if the index is kept in memory only
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        # directory path --> (modification time, whether the directory is a library, names of the sub directories,
+        # file names of the packed libraries)
+        self._directories = {}
+        self._visited_directories = set()
+        self._modified = False
+        self._lock = threading.Lock()
+        if path is not None:
+            self.load()
+
+    def load(self):
+        """Loads the index from its file, an invalid or missing file results in an empty index"""
+        self._directories = {}
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path) as index_file:
+                index = json.load(index_file)
+            if index.get('version') != INDEX_FORMAT_VERSION:
+                logger.debug("Ignoring the library index {0} of another version".format(self.path))
+                return
+            self._directories = {directory: (entry[0], entry[1], entry[2], entry[3])
+                                 for directory, entry in index['directories'].iteritems()}
+        except (IOError, ValueError, KeyError, IndexError, TypeError) as e:
+            logger.warning("Could not load the library index {0}: {1}".format(self.path, e))
+
+    def save(self):
+        """Writes the entries of all directories visited since the last save to the index file
+
+        Entries of directories no longer being part of any library root path are dropped. The file is replaced
+        atomically, so that concurrently starting instances of RAFCON never read a partially written index.
+        """
+        with self._lock:
+            visited_directories, self._visited_directories = self._visited_directories, set()
+            if self.path is None or not self._modified and visited_directories == set(self._directories):
+                return
+            self._directories = {directory: self._directories[directory] for directory in visited_directories
+                                 if directory in self._directories}
+            self._modified = False
+            directories = dict(self._directories)
+        index = {'version': INDEX_FORMAT_VERSION, 'directories': directories}
+        tmp_path = "{0}.{1}.tmp".format(self.path, os.getpid())
+        try:
+            index_folder = os.path.dirname(self.path)
+            if index_folder and not os.path.isdir(index_folder):
+                os.makedirs(index_folder)
+            with open(tmp_path, 'w') as index_file:
+                json.dump(index, index_file)
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            logger.warning("Could not save the library index {0}: {1}".format(self.path, e))
+
+    def get_directory(self, directory):
+        """Returns the content of a directory, which is only listed, if it changed since the last call
+
+        :param str directory: the path of the directory
+        :return: whether the directory contains a state machine, the sorted names of the visible sub directories, the
+            sorted file names of the visible packed state machines
+        :rtype: bool, list[str], list[str]
+        """
+        mtime = os.stat(directory).st_mtime
+        with self._lock:
+            self._visited_directories.add(directory)
+            entry = self._directories.get(directory)
+        if entry is not None and entry[0] == mtime:
+            return entry[1], entry[2], entry[3]
+
+        names = os.listdir(directory)
+        is_library = storage.STATEMACHINE_FILE in names or storage.STATEMACHINE_FILE_OLD in names
+        sub_directories = []
+        packed_libraries = []
+        for name in sorted(names):
+            if name[0] == '.':
+                continue
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                sub_directories.append(name)
+            elif name.endswith(storage.PACKED_STATE_MACHINE_EXTENSION) and storage.is_packed_state_machine_path(path):
+                packed_libraries.append(name)
+        with self._lock:
+            self._directories[directory] = (mtime, is_library, sub_directories, packed_libraries)
+            self._modified = True
+        return is_library, sub_directories, packed_libraries
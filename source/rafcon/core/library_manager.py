@@ -20,9 +20,11 @@
 import os
 import shutil
 import copy
+from multiprocessing.pool import ThreadPool
 from gtkmvc import Observable
 
 from rafcon.core import interface
+from rafcon.core.library_index import LibraryIndex
 from rafcon.core.storage import storage
 from rafcon.core.custom_exceptions import LibraryNotFoundException
 import rafcon.core.config as config
@@ -35,6 +37,9 @@ try:
 except ImportError:
     OrderedDict = dict
 
+# the maximum number of library root paths scanned concurrently
+MAX_SCAN_THREADS = 8
+
 
 class LibraryManager(Observable):
     """This class manages all libraries
@@ -66,6 +71,8 @@ class LibraryManager(Observable):
         self._loaded_libraries = {}
         self._libraries_instances = {}
 
+        self._library_index = None
+
     def prepare_destruction(self):
         self.clean_loaded_libraries()
 
@@ -87,13 +94,15 @@ class LibraryManager(Observable):
         self._skipped_states = []
         self._skipped_library_roots = []
 
+        library_roots = []
+
         # 1. Load libraries from config.yaml
         for library_root_key, library_root_path in config.global_config.get_config_value("LIBRARY_PATHS").iteritems():
             library_root_path = self._clean_path(library_root_path)
             if os.path.exists(library_root_path):
                 logger.debug("Adding library root key '{0}' from path '{1}'".format(
                     library_root_key, library_root_path))
-                self._load_libraries_from_root_path(library_root_key, library_root_path)
+                library_roots.append((library_root_key, library_root_path))
             else:
                 logger.warn("Configured path for library root key '{}' does not exist: {}".format(
                     library_root_key, library_root_path))
@@ -109,12 +118,14 @@ class LibraryManager(Observable):
                 logger.warn("The library specified in RAFCON_LIBRARY_PATH does not exist: {}".format(library_root_path))
                 continue
             _, library_root_key = os.path.split(library_root_path)
-            if library_root_key in self._libraries:
+            if library_root_key in [key for key, _ in library_roots]:
                 logger.warn("The library '{}' is already existing and will be overridden with '{}'".format(
                     library_root_key, library_root_path))
-            self._load_libraries_from_root_path(library_root_key, library_root_path)
+            library_roots.append((library_root_key, library_root_path))
             logger.debug("Adding library '{1}' from {0}".format(library_root_path, library_root_key))
 
+        self._load_libraries_from_root_paths(library_roots)
+
         self._libraries = OrderedDict(sorted(self._libraries.items()))
         logger.debug("Initialization of LibraryManager done")
 
@@ -136,14 +147,60 @@ class LibraryManager(Observable):
         path = os.path.realpath(path)
         return path
 
-    def _load_libraries_from_root_path(self, library_root_key, library_root_path):
-        self._library_root_paths[library_root_key] = library_root_path
-        self._libraries[library_root_key] = {}
-        self._load_nested_libraries(library_root_path, self._libraries[library_root_key])
-        self._libraries[library_root_key] = OrderedDict(sorted(self._libraries[library_root_key].items()))
+    def _get_library_index(self):
+        """Returns the library index, which is newly loaded, if the configured LIBRARY_INDEX_PATH changed"""
+        library_index_path = config.global_config.get_config_value("LIBRARY_INDEX_PATH", None)
+        if library_index_path and library_index_path != "None":
+            library_index_path = self._clean_path(library_index_path)
+        else:
+            library_index_path = None
+        if self._library_index is None or self._library_index.path != library_index_path:
+            self._library_index = LibraryIndex(library_index_path)
+        return self._library_index
+
+    def _load_libraries_from_root_paths(self, library_roots):
+        """Loads the libraries of several library root paths
+
+        The independent library root paths are scanned concurrently, as the scan is mostly waiting for the file system.
+        A later library root key overrides an earlier one.
+
+        :param list library_roots: tuples of library root key and cleaned library root path
+        """
+        library_index = self._get_library_index()
+
+        def load_libraries_from_root_path(library_root_path):
+            libraries = {}
+            if os.path.isfile(library_root_path):
+                # a library root path can also be a single packed state machine
+                if storage.is_packed_state_machine_path(library_root_path):
+                    libraries[self._get_library_name_for_file_name(os.path.basename(library_root_path))] = \
+                        library_root_path
+                else:
+                    logger.warn("The library root path {0} is neither a folder nor a packed state machine".format(
+                        library_root_path))
+            else:
+                self._load_nested_libraries(library_root_path, libraries, library_root_path)
+            return OrderedDict(sorted(libraries.items()))
+
+        root_paths = sorted(set(library_root_path for _, library_root_path in library_roots))
+        if len(root_paths) > 1:
+            pool = ThreadPool(min(len(root_paths), MAX_SCAN_THREADS))
+            try:
+                root_path_libraries = dict(zip(root_paths, pool.map(load_libraries_from_root_path, root_paths)))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            root_path_libraries = {root_path: load_libraries_from_root_path(root_path) for root_path in root_paths}
+
+        for library_root_key, library_root_path in library_roots:
+            self._library_root_paths[library_root_key] = library_root_path
+            self._libraries[library_root_key] = root_path_libraries[library_root_path]
+        library_index.save()
 
-    def check_clean_path_of_library(self, folder_path, folder_name):
-        library_root_path = self._library_root_paths[self._get_library_root_key_for_os_path(folder_path)]
+    def check_clean_path_of_library(self, folder_path, folder_name, library_root_path=None):
+        if library_root_path is None:
+            library_root_path = self._library_root_paths[self._get_library_root_key_for_os_path(folder_path)]
         full_path = os.path.join(folder_path, folder_name)[len(library_root_path) + 1:]
         library_path = folder_path[len(library_root_path):]
         if not storage.clean_path(library_path) == library_path or not storage.clean_path(folder_name) == folder_name:
@@ -153,26 +210,48 @@ class LibraryManager(Observable):
                            "".format(not_allowed_characters, full_path))
         return folder_path, folder_name
 
-    def _load_nested_libraries(self, library_path, target_dict):
+    def _load_nested_libraries(self, library_path, target_dict, library_root_path):
         """Recursively load libraries within path
 
         Adds all libraries specified in a given path and stores them into the provided library dictionary. The library
-        entries in the dictionary consist only of the path to the library in the file system.
+        entries in the dictionary consist only of the path to the library in the file system. The content of the
+        directories is taken from the library index, if the directories did not change.
 
         :param library_path: the path to add all libraries from
         :param target_dict: the target dictionary to store all loaded libraries to
+        :param library_root_path: the library root path, the path is located in
         """
-        for library_name in os.listdir(library_path):
-            library_folder_path, library_name = self.check_clean_path_of_library(library_path, library_name)
+        _, sub_directories, packed_libraries = self._library_index.get_directory(library_path)
+        for file_name in packed_libraries:
+            library_name = self._get_library_name_for_file_name(file_name)
+            if library_name in sub_directories:
+                logger.warn("The packed library {0} is hidden by the library folder of the same name".format(
+                    os.path.join(library_path, file_name)))
+                continue
+            self.check_clean_path_of_library(library_path, library_name, library_root_path)
+            target_dict[library_name] = os.path.join(library_path, file_name)
+        for library_name in sub_directories:
+            self.check_clean_path_of_library(library_path, library_name, library_root_path)
             full_library_path = os.path.join(library_path, library_name)
-            if os.path.isdir(full_library_path) and library_name[0] != '.':
-                if os.path.exists(os.path.join(full_library_path, storage.STATEMACHINE_FILE)) \
-                        or os.path.exists(os.path.join(full_library_path, storage.STATEMACHINE_FILE_OLD)):
-                    target_dict[library_name] = full_library_path
-                else:
-                    target_dict[library_name] = {}
-                    self._load_nested_libraries(full_library_path, target_dict[library_name])
-                    target_dict[library_name] = OrderedDict(sorted(target_dict[library_name].items()))
+            try:
+                is_library, _, _ = self._library_index.get_directory(full_library_path)
+            except OSError as e:  # the directory was removed in the meantime
+                logger.debug("Skipping library folder {0}: {1}".format(full_library_path, e))
+                continue
+            if is_library:
+                target_dict[library_name] = full_library_path
+            else:
+                target_dict[library_name] = {}
+                self._load_nested_libraries(full_library_path, target_dict[library_name], library_root_path)
+                target_dict[library_name] = OrderedDict(sorted(target_dict[library_name].items()))
+
+    @staticmethod
+    def _get_library_name_for_file_name(file_name):
+        """Returns the library name of a library folder or of a packed library, which is the file name without the
+        extension of packed state machines"""
+        if file_name.endswith(storage.PACKED_STATE_MACHINE_EXTENSION):
+            return file_name[:-len(storage.PACKED_STATE_MACHINE_EXTENSION)]
+        return file_name
 
     @Observable.observed
     def refresh_libraries(self):
@@ -352,8 +431,11 @@ class LibraryManager(Observable):
         library_root_key = self._get_library_root_key_for_os_path(path)
         if library_root_key is not None:
             library_root_path = self._library_root_paths[library_root_key]
+            if os.path.realpath(path) == library_root_path and os.path.isfile(library_root_path):
+                # the library root path is a packed library
+                return library_root_key, self._get_library_name_for_file_name(os.path.basename(library_root_path))
             path_elements_without_library_root = path[len(library_root_path)+1:].split(os.sep)
-            library_name = path_elements_without_library_root[-1]
+            library_name = self._get_library_name_for_file_name(path_elements_without_library_root[-1])
             sub_library_path = ''
             if len(path_elements_without_library_root[:-1]):
                 sub_library_path = os.sep + os.sep.join(path_elements_without_library_root[:-1])
@@ -368,6 +450,20 @@ class LibraryManager(Observable):
         else:
             logger.warning("Library manager will not create a library instance which is not in the mounted libraries.")
 
+    def get_library_state_template(self, lib_os_path):
+        """ A method to get the version and the root state of the library specified via the lib_os_path.
+
+        The library is loaded only once. The returned root state is shared by all library states of the library and
+        must not be modified.
+
+        :param lib_os_path: the location of the library
+        :return: the version and the root state of the library
+        """
+        if lib_os_path not in self._loaded_libraries:
+            self._loaded_libraries[lib_os_path] = storage.load_state_machine_from_path(lib_os_path)
+        state_machine = self._loaded_libraries[lib_os_path]
+        return state_machine.version, state_machine.root_state
+
     def get_library_state_copy_instance(self, lib_os_path):
         """ A method to get a state copy of the library specified via the lib_os_path.
 
@@ -380,24 +476,16 @@ class LibraryManager(Observable):
         # return state_machine.version, state_machine.root_state
 
         # TODO observe changes on file system and update data
-        if lib_os_path in self._loaded_libraries:
-            # this list can also be taken to open library state machines TODO -> implement it -> because faster
-            state_machine = self._loaded_libraries[lib_os_path]
-            # logger.info("Take copy of {0}".format(lib_os_path))
-            # as long as the a library state root state is never edited so the state first has to be copied here
-            state_copy = copy.deepcopy(state_machine.root_state)
-            return state_machine.version, state_copy
-        else:
-            state_machine = storage.load_state_machine_from_path(lib_os_path)
-            self._loaded_libraries[lib_os_path] = state_machine
-            if config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False):
-                return state_machine.version, state_machine.root_state
-            else:
-                state_copy = copy.deepcopy(state_machine.root_state)
-                return state_machine.version, state_copy
+        version, library_root_state = self.get_library_state_template(lib_os_path)
+        # the library root state is shared by all library states and is never handed out, as the state copy is
+        # modified and destroyed by its library state, so the state always has to be copied here
+        return version, copy.deepcopy(library_root_state)
 
     def remove_library_from_file_system(self, library_path, library_name):
         """Remove library from hard disk."""
         library_file_system_path = self.get_os_path_to_library(library_path, library_name)[0]
-        shutil.rmtree(library_file_system_path)
+        if os.path.isfile(library_file_system_path):
+            os.remove(library_file_system_path)
+        else:
+            shutil.rmtree(library_file_system_path)
         self.refresh_libraries()
@@ -18,10 +18,15 @@
 
 import os
 import imp
+import hashlib
+import marshal
+import threading
 import yaml
+from collections import OrderedDict
 from gtkmvc import Observable
 
 from rafcon.core.id_generator import generate_script_id
+from rafcon.core.config import global_config
 import rafcon.core.singleton
 
 from rafcon.utils import filesystem
@@ -34,6 +39,84 @@ DEFAULT_SCRIPT_FILE = "default_script.py"
 
 DEFAULT_SCRIPT = filesystem.read_file(os.path.dirname(__file__), DEFAULT_SCRIPT_FILE)
 
+# the maximum number of code objects kept in the code cache
+MAX_CACHED_CODE_OBJECTS = 1000
+
+# hash of the script text and its file name --> compiled code object, shared by all scripts of the process
+_code_cache = OrderedDict()
+_code_cache_lock = threading.Lock()
+
+
+def _get_bytecode_cache_path(key):
+    bytecode_cache_path = global_config.get_config_value("SCRIPT_BYTECODE_CACHE_PATH", None)
+    if not bytecode_cache_path or bytecode_cache_path == "None":
+        return None
+    bytecode_cache_path = os.path.expandvars(os.path.expanduser(bytecode_cache_path))
+    return os.path.join(bytecode_cache_path, key + ".pyc")
+
+
+def _load_bytecode(path):
+    try:
+        with open(path, 'rb') as bytecode_file:
+            if bytecode_file.read(len(imp.get_magic())) != imp.get_magic():
+                return None
+            return marshal.load(bytecode_file)
+    except (IOError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _save_bytecode(path, code):
+    tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(tmp_path, 'wb') as bytecode_file:
+            bytecode_file.write(imp.get_magic())
+            marshal.dump(code, bytecode_file)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as e:
+        logger.debug("Could not write the bytecode cache file {0}: {1}".format(path, e))
+
+
+def get_code_object(script_text, filename):
+    """Returns the compiled code of a script text
+
+    Every script text is only compiled once per process, e.g. the scripts of all copies of a library share their code
+    object. If the config option SCRIPT_BYTECODE_CACHE_PATH is set, the code is also stored in that folder and reused
+    by later processes.
+
+    :param str script_text: the source code of the script
+    :param str filename: the file name shown in tracebacks
+    :return: the code object
+    """
+    script_hash = hashlib.sha1(script_text)
+    script_hash.update('\0' + (filename.encode('utf-8') if isinstance(filename, unicode) else filename))
+    key = script_hash.hexdigest()
+    with _code_cache_lock:
+        code = _code_cache.pop(key, None)
+        if code is not None:
+            _code_cache[key] = code
+            return code
+
+    bytecode_path = _get_bytecode_cache_path(key)
+    code = _load_bytecode(bytecode_path) if bytecode_path and os.path.isfile(bytecode_path) else None
+    if code is None:
+        code = compile(script_text, filename, 'exec')
+        if bytecode_path:
+            _save_bytecode(bytecode_path, code)
+
+    with _code_cache_lock:
+        _code_cache[key] = code
+        while len(_code_cache) > MAX_CACHED_CODE_OBJECTS:
+            _code_cache.popitem(last=False)
+    return code
+
+
+def clear_code_cache():
+    """Removes all code objects from the code cache of the process"""
+    with _code_cache_lock:
+        _code_cache.clear()
+
 
 class Script(Observable, yaml.YAMLObject):
     """A class for representing the script file for each state in a state machine
@@ -117,26 +200,25 @@ class Script(Observable, yaml.YAMLObject):
     def build_module(self):
         """Builds a temporary module from the script file
 
+        The compiled code is taken from the code cache, thus identical scripts are only compiled once.
+
         :raises exceptions.IOError: if the compilation of the script module failed
         """
-        try:
-            imp.acquire_lock()
-            module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
+        module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
 
-            # load module
-            tmp_module = imp.new_module(module_name)
+        # load module
+        tmp_module = imp.new_module(module_name)
 
-            code = compile(self.script, '%s (%s)' % (self.filename, self._script_id), 'exec')
+        path = self.path
+        code = get_code_object(self.script, os.path.join(path, self.filename) if path else self.filename)
 
-            try:
-                exec code in tmp_module.__dict__
-            except RuntimeError, e:
-                raise IOError("The compilation of the script module failed - error message: %s" % str(e))
-
-            # return the module
-            self.compiled_module = tmp_module
-        finally:
-            imp.release_lock()
+        try:
+            exec code in tmp_module.__dict__
+        except RuntimeError, e:
+            raise IOError("The compilation of the script module failed - error message: %s" % str(e))
+
+        # return the module
+        self.compiled_module = tmp_module
 
     @classmethod
     def to_yaml(cls, dumper, data):
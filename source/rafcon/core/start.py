@@ -26,7 +26,6 @@ import argparse
 from os.path import realpath, dirname, join, exists
 import signal
 import time
-from Queue import Empty
 import threading
 import sys
 
@@ -37,7 +36,6 @@ import rafcon.utils.filesystem as filesystem
 from rafcon.core.config import global_config
 import rafcon.core.singleton as core_singletons
 from rafcon.core.storage import storage
-from rafcon.core.states.state import StateExecutionStatus
 
 from rafcon.utils import plugins
 from rafcon.utils import log
@@ -171,21 +169,16 @@ def wait_for_state_machine_finished(state_machine):
     """
     global _user_abort
 
-    from rafcon.core.states.execution_state import ExecutionState
-    if not isinstance(state_machine.root_state, ExecutionState):
-        while len(state_machine.execution_histories[0]) < 1:
-            time.sleep(0.1)
-    else:
-        time.sleep(0.5)
-
-    while state_machine.root_state.state_execution_status is not StateExecutionStatus.INACTIVE:
-        try:
-            state_machine.root_state.concurrency_queue.get(timeout=1)
-            # this check triggers if the state machine could not be stopped in the signal handler
-            if _user_abort:
-                return
-        except Empty:
-            pass
+    execution_future = core_singletons.state_machine_execution_engine.execution_future
+    if execution_future is None or execution_future.state_machine is not state_machine:
+        logger.error("The state machine {0} was not started".format(state_machine))
+        return
+
+    # the timeout only serves the live signal, the wait returns as soon as the execution finished
+    while not execution_future.wait(1.):
+        # this check triggers if the state machine could not be stopped in the signal handler
+        if _user_abort:
+            return
         # no logger output here to make it easier for the parser
         logger.verbose("RAFCON live signal")
 
@@ -146,6 +146,12 @@ class DataFlow(StateElement):
             self._from_state = old_from_state
             self._from_key = old_from_key
             raise ValueError("The data flow origin could not be changed: {0}".format(message))
+        self._update_index_of_parent()
+
+    def _update_index_of_parent(self):
+        """Informs the parent about a changed origin or target of the data flow, which are used as lookup keys"""
+        if self.parent is not None:
+            self.parent.update_data_flow_index()
 
     @property
     def from_state(self):
@@ -161,6 +167,7 @@ class DataFlow(StateElement):
             raise ValueError("from_state must be of type str")
 
         self._change_property_with_validity_check('_from_state', from_state)
+        self._update_index_of_parent()
 
     @property
     def from_key(self):
@@ -176,6 +183,7 @@ class DataFlow(StateElement):
             raise ValueError("from_key must be of type int")
 
         self._change_property_with_validity_check('_from_key', from_key)
+        self._update_index_of_parent()
 
     @lock_state_machine
     @Observable.observed
@@ -201,6 +209,7 @@ class DataFlow(StateElement):
             self._to_state = old_to_state
             self._to_key = old_to_key
             raise ValueError("The data flow target could not be changed: {0}".format(message))
+        self._update_index_of_parent()
 
     @property
     def to_state(self):
@@ -216,6 +225,7 @@ class DataFlow(StateElement):
             raise ValueError("to_state must be of type str")
 
         self._change_property_with_validity_check('_to_state', to_state)
+        self._update_index_of_parent()
 
     @property
     def to_key(self):
@@ -231,6 +241,7 @@ class DataFlow(StateElement):
             raise ValueError("to_key must be of type int")
 
         self._change_property_with_validity_check('_to_key', to_key)
+        self._update_index_of_parent()
 
     @property
     def data_flow_id(self):
@@ -131,6 +131,12 @@ class Transition(StateElement):
             self._from_state = old_from_state
             self._from_outcome = old_from_outcome
             raise ValueError("The transition origin could not be changed: {0}".format(message))
+        self._update_origin_index_of_parent()
+
+    def _update_origin_index_of_parent(self):
+        """Informs the parent about a changed origin of the transition, which is used as key of a lookup index"""
+        if self.parent is not None:
+            self.parent.update_transition_origin_index()
 
     @lock_state_machine
     @Observable.observed
@@ -174,6 +180,7 @@ class Transition(StateElement):
             raise ValueError("from_state must be of type str")
 
         self._change_property_with_validity_check('_from_state', from_state)
+        self._update_origin_index_of_parent()
 
     @property
     def from_outcome(self):
@@ -190,6 +197,7 @@ class Transition(StateElement):
             raise ValueError("from_outcome must be of type int")
 
         self._change_property_with_validity_check('_from_outcome', from_outcome)
+        self._update_origin_index_of_parent()
 
     @property
     def to_state(self):
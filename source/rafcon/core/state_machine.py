@@ -31,7 +31,8 @@ from gtkmvc import Observable
 from jsonconversion.jsonobject import JSONObject
 
 import rafcon
-from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage
+from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage, \
+    ExecutionHistoryBinaryStorage
 from rafcon.core.id_generator import generate_state_machine_id, run_id_generator
 from rafcon.utils import log
 from rafcon.utils.hashable import Hashable
@@ -133,19 +134,26 @@ class StateMachine(Observable, JSONObject, Hashable):
         }
         return dict_representation
 
-    def start(self):
+    def start(self, finished_callback=None):
         """Starts the execution of the root state.
+
+        :param finished_callback: function called without arguments in the thread of the root state, after its
+            execution finished
         """
         # load default input data for the state
         self._root_state.input_data = self._root_state.get_default_input_values_for_state(self._root_state)
         self._root_state.output_data = self._root_state.create_output_dictionary_for_state(self._root_state)
         new_execution_history = self._add_new_execution_history()
         new_execution_history.push_state_machine_start_history_item(self, run_id_generator())
-        self._root_state.start(new_execution_history)
+        self._root_state.start(new_execution_history, finished_callback=finished_callback)
 
     def join(self):
         """Wait for root state to finish execution"""
         self._root_state.join()
+        self.finalize_execution()
+
+    def finalize_execution(self):
+        """Closes the execution history log and deactivates the root state after the execution finished"""
         # execution finished, close execution history log file (if present)
         if len(self._execution_histories) > 0:
             if self._execution_histories[-1].execution_history_storage is not None:
@@ -228,10 +236,18 @@ class StateMachine(Observable, JSONObject, Hashable):
                 base_dir = base_dir.replace('%RAFCON_TEMP_PATH_BASE', RAFCON_TEMP_PATH_BASE)
             if not os.path.exists(base_dir):
                 os.makedirs(base_dir)
-            shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.shelve' %
-                                       (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
-                                        self.root_state.name.replace(' ', '-')))
-            execution_history_store = ExecutionHistoryStorage(shelve_name)
+            log_format = global_config.get_config_value("EXECUTION_LOG_FORMAT", "shelve")
+            if log_format not in ("shelve", "binary"):
+                logger.error("Invalid EXECUTION_LOG_FORMAT '{0}', using 'shelve' instead".format(log_format))
+                log_format = "shelve"
+            log_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.%s' %
+                                    (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
+                                     self.root_state.name.replace(' ', '-'),
+                                     'shelve' if log_format == "shelve" else 'rlog'))
+            if log_format == "shelve":
+                execution_history_store = ExecutionHistoryStorage(log_name)
+            else:
+                execution_history_store = ExecutionHistoryBinaryStorage(log_name)
             new_execution_history.set_execution_history_storage(execution_history_store)
         self._execution_histories.append(new_execution_history)
         return new_execution_history
@@ -39,6 +39,7 @@ from rafcon.core.state_elements.transition import Transition
 from rafcon.core.states.library_state import LibraryState
 from rafcon.core.states.state import State
 from rafcon.core.states.state import StateExecutionStatus
+from rafcon.core import data_passing
 from rafcon.utils.type_helpers import type_inherits_of_type
 
 try:
@@ -73,7 +74,11 @@ class ContainerState(State):
 
         self._states = OrderedDict()
         self._transitions = {}
+        # all transitions indexed by their origin (from_state, from_outcome) for a fast lookup during execution
+        self._transitions_by_origin = {}
         self._data_flows = {}
+        self._data_flows_by_origin = {}
+        self._data_flows_by_target = {}
         self._scoped_variables = {}
         self._scoped_data = {}
         self._current_state = None
@@ -1185,6 +1190,7 @@ class ContainerState(State):
         else:
             self.transitions[transition_id] = \
                 Transition(None, None, to_state_id, to_outcome, transition_id, self)
+        self._add_transition_to_origin_index(self.transitions[transition_id])
 
         # notify all states waiting for transition to be connected
         self._transitions_cv.acquire()
@@ -1216,6 +1222,7 @@ class ContainerState(State):
 
         new_transition = Transition(from_state_id, from_outcome, to_state_id, to_outcome, transition_id, self)
         self.transitions[transition_id] = new_transition
+        self._add_transition_to_origin_index(new_transition)
 
         # notify all states waiting for transition to be connected
         self._transitions_cv.acquire()
@@ -1236,11 +1243,32 @@ class ContainerState(State):
             raise TypeError("state must be of type State")
         if not isinstance(outcome, Outcome):
             raise TypeError("outcome must be of type Outcome")
-        result_transition = None
-        for key, transition in self.transitions.iteritems():
-            if transition.from_state == state.state_id and transition.from_outcome == outcome.outcome_id:
-                result_transition = transition
-        return result_transition
+        return self._transitions_by_origin.get((state.state_id, outcome.outcome_id))
+
+    def _add_transition_to_origin_index(self, transition):
+        """Adds a transition to the index of transitions by their origin
+
+        :param rafcon.core.state_elements.transition.Transition transition: the added transition
+        """
+        self._transitions_by_origin[(transition.from_state, transition.from_outcome)] = transition
+
+    def _remove_transition_from_origin_index(self, transition):
+        """Removes a transition from the index of transitions by their origin
+
+        :param rafcon.core.state_elements.transition.Transition transition: the removed transition
+        """
+        origin = (transition.from_state, transition.from_outcome)
+        if self._transitions_by_origin.get(origin) is transition:
+            del self._transitions_by_origin[origin]
+
+    def update_transition_origin_index(self):
+        """Rebuilds the index of transitions by their origin
+
+        The method has to be called, whenever the origin of a transition is changed without using add_transition,
+        remove_transition or the transitions setter.
+        """
+        self._transitions_by_origin = {(transition.from_state, transition.from_outcome): transition
+                                       for transition in self._transitions.itervalues()}
 
     @lock_state_machine
     @Observable.observed
@@ -1254,7 +1282,9 @@ class ContainerState(State):
             raise AttributeError("The transition_id must not be -1 (Aborted) or -2 (Preempted)")
         if transition_id not in self._transitions:
             raise AttributeError("The transition_id %s does not exist" % str(transition_id))
-        return self._transitions.pop(transition_id)
+        transition = self._transitions.pop(transition_id)
+        self._remove_transition_from_origin_index(transition)
+        return transition
 
     @lock_state_machine
     def remove_outcome_hook(self, outcome_id):
@@ -1305,6 +1335,7 @@ class ContainerState(State):
 
         self.data_flows[data_flow_id] = DataFlow(from_state_id, from_data_port_id, to_state_id, to_data_port_id,
                                                  data_flow_id, self)
+        self._add_data_flow_to_index(self.data_flows[data_flow_id])
         return data_flow_id
 
     @lock_state_machine
@@ -1317,7 +1348,53 @@ class ContainerState(State):
         """
         if data_flow_id not in self.data_flows:
             raise AttributeError("The data_flow_id %s does not exist" % str(data_flow_id))
-        return self.data_flows.pop(data_flow_id)
+        data_flow = self.data_flows.pop(data_flow_id)
+        self._remove_data_flow_from_index(data_flow)
+        return data_flow
+
+    def _add_data_flow_to_index(self, data_flow):
+        """Adds a data flow to the indices of data flows by their origin and by their target
+
+        The target index also holds the key of the origin port within the scoped data, to save its recomputation
+        during the execution.
+
+        :param rafcon.core.state_elements.data_flow.DataFlow data_flow: the added data flow
+        """
+        origin = (data_flow.from_state, data_flow.from_key)
+        target = (data_flow.to_state, data_flow.to_key)
+        self._data_flows_by_origin.setdefault(origin, []).append(data_flow)
+        self._data_flows_by_target.setdefault(target, []).append((str(data_flow.from_key) + data_flow.from_state,
+                                                                   data_flow))
+
+    def _remove_data_flow_from_index(self, data_flow):
+        """Removes a data flow from the indices of data flows by their origin and by their target
+
+        :param rafcon.core.state_elements.data_flow.DataFlow data_flow: the removed data flow
+        """
+        origin = (data_flow.from_state, data_flow.from_key)
+        target = (data_flow.to_state, data_flow.to_key)
+        origin_data_flows = [df for df in self._data_flows_by_origin.get(origin, []) if df is not data_flow]
+        if origin_data_flows:
+            self._data_flows_by_origin[origin] = origin_data_flows
+        else:
+            self._data_flows_by_origin.pop(origin, None)
+        target_data_flows = [(key, df) for key, df in self._data_flows_by_target.get(target, [])
+                             if df is not data_flow]
+        if target_data_flows:
+            self._data_flows_by_target[target] = target_data_flows
+        else:
+            self._data_flows_by_target.pop(target, None)
+
+    def update_data_flow_index(self):
+        """Rebuilds the indices of data flows by their origin and by their target
+
+        The method has to be called, whenever the origin or target of a data flow is changed without using
+        add_data_flow, remove_data_flow or the data_flows setter.
+        """
+        self._data_flows_by_origin = {}
+        self._data_flows_by_target = {}
+        for data_flow in self._data_flows.itervalues():
+            self._add_data_flow_to_index(data_flow)
 
     @lock_state_machine
     def remove_data_flows_with_data_port_id(self, data_port_id):
@@ -1478,22 +1555,18 @@ class ContainerState(State):
         result_dict.update(tmp_dict)
 
         for input_port_key, value in state.input_data_ports.iteritems():
-            # for all input keys fetch the correct data_flow connection and read data into the result_dict
-            actual_value = None
-            actual_value_time = 0
-            for data_flow_key, data_flow in self.data_flows.iteritems():
-
-                if data_flow.to_key == input_port_key:
-                    if data_flow.to_state == state.state_id:
-                        # fetch data from the scoped_data list: the key is the data_port_key + the state_id
-                        key = str(data_flow.from_key) + data_flow.from_state
-                        if key in self.scoped_data:
-                            if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
-                                actual_value = deepcopy(self.scoped_data[key].value)
-                                actual_value_time = self.scoped_data[key].timestamp
-
-            if actual_value is not None:
-                result_dict[value.name] = actual_value
+            # for all input keys fetch the incoming data_flow connections and read data into the result_dict
+            actual_scoped_data = None
+            for key, data_flow in self._data_flows_by_target.get((state.state_id, input_port_key), ()):
+                # fetch data from the scoped_data list: the key is the data_port_key + the state_id
+                scoped_data = self.scoped_data.get(key)
+                if scoped_data is not None:
+                    if actual_scoped_data is None or actual_scoped_data.value is None or \
+                            actual_scoped_data.timestamp < scoped_data.timestamp:
+                        actual_scoped_data = scoped_data
+
+            if actual_scoped_data is not None and actual_scoped_data.value is not None:
+                result_dict[value.name] = data_passing.copy_value(actual_scoped_data.value)
 
         return result_dict
 
@@ -1517,13 +1590,12 @@ class ContainerState(State):
                     self.scoped_data[str(input_data_port_key) + self.state_id] = \
                         ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self)
                     # forward the data to scoped variables
-                    for data_flow_key, data_flow in self.data_flows.iteritems():
-                        if data_flow.from_key == input_data_port_key and data_flow.from_state == self.state_id:
-                            if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
-                                current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                                self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                    ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
-                                               ScopedVariable, parent=self)
+                    for data_flow in self._data_flows_by_origin.get((self.state_id, input_data_port_key), ()):
+                        if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
+                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                                ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
+                                           ScopedVariable, parent=self)
 
     @lock_state_machine
     def add_state_execution_output_to_scoped_data(self, dictionary, state):
@@ -1572,14 +1644,13 @@ class ContainerState(State):
                 if not key == "error":
                     logger.warning("Output variable %s was written during state execution, "
                                    "that has no data port connected to it.", str(key))
-            for data_flow_key, data_flow in self.data_flows.iteritems():
-                if data_flow.from_key == output_data_port_key and data_flow.from_state == state.state_id:
-                    if data_flow.to_state == self.state_id:  # is target of data flow own state id?
-                        if data_flow.to_key in self.scoped_variables.iterkeys():  # is target data port scoped?
-                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
-                                           ScopedVariable, parent=self)
+            for data_flow in self._data_flows_by_origin.get((state.state_id, output_data_port_key), ()):
+                if data_flow.to_state == self.state_id:  # is target of data flow own state id?
+                    if data_flow.to_key in self.scoped_variables:  # is target data port scoped?
+                        current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                        self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                            ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
+                                       ScopedVariable, parent=self)
 
     # ---------------------------------------------------------------------------------------------
     # ------------------------ functions to modify the scoped data end ----------------------------
@@ -1610,6 +1681,18 @@ class ContainerState(State):
             if data_flow.to_state == old_state_id:
                 data_flow._to_state = self.state_id
 
+        self.update_transition_origin_index()
+        self.update_data_flow_index()
+
+    def invalidate_path_cache(self):
+        """Removes the cached paths of the state and all its descendants
+
+        The paths of the child states contain the path of this state, thus they are invalidated as well.
+        """
+        super(ContainerState, self).invalidate_path_cache()
+        for child_state in self._states.itervalues():
+            child_state.invalidate_path_cache()
+
     def get_state_for_transition(self, transition):
         """Calculate the target state of a transition
 
@@ -1649,7 +1732,7 @@ class ContainerState(State):
                             # if self.scoped_data[scoped_data_key].timestamp > actual_value_time is True
                             # the data of a previous execution of the same state is overwritten
                             if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
-                                actual_value = deepcopy(self.scoped_data[scoped_data_key].value)
+                                actual_value = data_passing.copy_value(self.scoped_data[scoped_data_key].value)
                                 actual_value_time = self.scoped_data[scoped_data_key].timestamp
                                 actual_value_was_written = True
                         else:
@@ -2130,6 +2213,7 @@ class ContainerState(State):
 
         self._transitions = dict((transition_id, d) for (transition_id, d) in self._transitions.iteritems()
                                 if not transition_id in transition_ids_to_delete)
+        self.update_transition_origin_index()
 
     @property
     def data_flows(self):
@@ -2182,6 +2266,7 @@ class ContainerState(State):
 
         self._data_flows= dict((data_flow_id, d) for (data_flow_id, d) in self._data_flows.iteritems()
                                if not data_flow_id in data_flow_ids_to_delete)
+        self.update_data_flow_index()
 
     @property
     def start_state_id(self):
@@ -2192,13 +2277,13 @@ class ContainerState(State):
 
         :return: The id of the start state
         """
-        for transition_id in self.transitions:
-            if self.transitions[transition_id].from_state is None:
-                to_state = self.transitions[transition_id].to_state
-                if to_state is not None:
-                    return to_state
-                else:
-                    return self.state_id
+        # start transitions are the only transitions without origin
+        start_transition = self._transitions_by_origin.get((None, None))
+        if start_transition is not None:
+            if start_transition.to_state is not None:
+                return start_transition.to_state
+            else:
+                return self.state_id
         return None
 
     @start_state_id.setter
@@ -31,6 +31,7 @@ from rafcon.core.state_elements.outcome import Outcome
 from rafcon.core.script import Script
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.execution.execution_history import CallType
+from rafcon.core.execution import process_execution
 
 from rafcon.utils import log
 logger = log.get_logger(__name__)
@@ -40,6 +41,9 @@ class ExecutionState(State):
     """A class to represent a state for executing arbitrary functions
 
     This kind of state does not have any child states.
+
+    :ivar bool run_in_process: if True, the script is executed in a worker process instead of the thread of the state,
+        see :mod:`rafcon.core.execution.process_execution`
     """
 
     yaml_tag = u'!ExecutionState'
@@ -53,6 +57,7 @@ class ExecutionState(State):
         self.logger = log.get_logger(self.name)
         # here all persistent variables that should be available for the next state run should be stored
         self.persistent_variables = {}
+        self._run_in_process = False
 
     def __eq__(self, other):
         # logger.info("compare method \n\t\t\t{0} \n\t\t\t{1}\n{2}\n{3}".format(self, other, self.script_text, other.script_text))
@@ -69,6 +74,7 @@ class ExecutionState(State):
         state.description = deepcopy(self.description)
         state.semantic_data = deepcopy(self.semantic_data)
         state._file_system_path = self.file_system_path
+        state._run_in_process = self._run_in_process
         return state
 
     def __deepcopy__(self, memo=None, _nil=[]):
@@ -78,6 +84,16 @@ class ExecutionState(State):
     def update_hash(self, obj_hash):
         super(ExecutionState, self).update_hash(obj_hash)
         obj_hash.update(self.script.script)
+        if self.run_in_process:
+            obj_hash.update("run_in_process")
+
+    @staticmethod
+    def state_to_dict(state):
+        dict_representation = State.state_to_dict(state)
+        # only stored if set, to keep the files of other states unchanged
+        if state.run_in_process:
+            dict_representation['run_in_process'] = True
+        return dict_representation
 
     @classmethod
     def from_dict(cls, dictionary):
@@ -93,15 +109,19 @@ class ExecutionState(State):
             import traceback
             formatted_lines = traceback.format_exc().splitlines()
             logger.warning("Erroneous description for state '{1}': {0}".format(formatted_lines[-1], dictionary['name']))
+        state.run_in_process = dictionary.get('run_in_process', False)
         return state
 
     def _execute(self, execute_inputs, execute_outputs, backward_execution=False):
         """Calls the custom execute function of the script.py of the state
 
         """
-        self._script.build_module()
-
-        outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
+        if self.run_in_process:
+            outcome_item = process_execution.execute_in_process(self, execute_inputs, execute_outputs,
+                                                                backward_execution)
+        else:
+            self._script.build_module()
+            outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
 
         # in the case of backward execution the outcome is not relevant
         if backward_execution:
@@ -198,6 +218,21 @@ class ExecutionState(State):
     def script_text(self):
         return self._script.script
 
+    @property
+    def run_in_process(self):
+        """Property for the _run_in_process field
+
+        """
+        return self._run_in_process
+
+    @run_in_process.setter
+    @lock_state_machine
+    @Observable.observed
+    def run_in_process(self, run_in_process):
+        if not isinstance(run_in_process, bool):
+            raise TypeError("run_in_process must be of type bool")
+        self._run_in_process = run_in_process
+
     @script_text.setter
     @lock_state_machine
     @Observable.observed
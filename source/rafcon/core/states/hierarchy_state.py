@@ -109,6 +109,11 @@ class HierarchyState(ContainerState):
                     else:
                         break
                 elif execution_mode == StateMachineExecutionStatus.BACKWARD:
+                    if not self.execution_history.is_backward_step_possible():
+                        # the history items were evicted, thus ignore the step and wait for the next one
+                        logger.warning("Cannot step backward from {0}, as the required history items were evicted "
+                                       "from the execution history".format(self.child_state))
+                        continue
                     break_loop = self._handle_backward_execution_before_child_execution()
                     if break_loop:
                         break
@@ -181,7 +186,7 @@ class HierarchyState(ContainerState):
             self.execution_history.push_call_history_item(
                 self.child_state, CallType.EXECUTE, self, self.child_state.input_data)
         self.child_state.start(self.execution_history, backward_execution=self.backward_execution,
-                               generate_run_id=False)
+                               generate_run_id=False, concurrent=False)
 
         self.child_state.join()
 
@@ -227,7 +232,7 @@ class HierarchyState(ContainerState):
         # was executed; this leads to the backward and forward execution of a hierarchy child_state
         # having the exact same number of steps
         last_history_item = self.execution_history.get_last_history_item()
-        if last_history_item.state_reference is self:
+        if last_history_item is not None and last_history_item.state_reference is self:
             last_history_item = self.execution_history.pop_last_item()
             assert isinstance(last_history_item, CallItem)
             self.scoped_data = last_history_item.scoped_data
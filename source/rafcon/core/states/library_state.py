@@ -18,6 +18,7 @@
 
 """
 from copy import copy, deepcopy
+from threading import RLock
 
 from gtkmvc import Observable
 from rafcon.core.states.state import StateExecutionStatus
@@ -49,6 +50,10 @@ class LibraryState(State):
     :ivar dict output_data_port_runtime_values: a dict to store all the runtime values for the output data ports
     :ivar dict use_runtime_value_output_data_ports: flags to indicate if the runtime or the default value should be used
                                                     for a specific output data port
+
+    The library state only copies the outcomes and data ports of the library root state, which is loaded once by the
+    library manager and shared by all library states. The library root state itself is only copied, when the
+    `state_copy` is accessed the first time, e.g. when the library state is executed.
     """
 
     yaml_tag = u'!LibraryState'
@@ -63,6 +68,8 @@ class LibraryState(State):
     _output_data_port_runtime_values = {}
     _use_runtime_value_output_data_ports = {}
 
+    _state_copy_creation_lock = RLock()
+
     def __init__(self, library_path=None, library_name=None, version=None,  # library state specific attributes
                  # the following are the container state specific attributes
                  name=None, state_id=None, outcomes=None,
@@ -91,22 +98,21 @@ class LibraryState(State):
             logger.info("Old library name '{0}' was located at {1}".format(library_name, library_path))
             logger.info("New library name '{0}' is located at {1}".format(new_library_name, new_library_path))
 
-        # key = load_library_root_state_timer.start()
-        lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
-        self.state_copy = state_copy
-        # load_library_root_state_timer.stop(key)
-        self.state_copy.parent = self
+        # the library root state is shared and must not be modified, the state_copy is created on its first access
+        lib_version, library_root_state = library_manager.get_library_state_template(self.lib_os_path)
         if not str(lib_version) == version and not str(lib_version) == "None":
             raise AttributeError("Library does not have the correct version!")
 
         if name is None:
-            self.name = self.state_copy.name
+            self.name = library_root_state.name
 
-        # copy all ports and outcomes of self.state_copy to let the library state appear like the container state
-        # this will also set the parent of all outcomes and data ports to self
-        self.outcomes = self.state_copy.outcomes
-        self.input_data_ports = self.state_copy.input_data_ports
-        self.output_data_ports = self.state_copy.output_data_ports
+        # copy all ports and outcomes of the library root state to let the library state appear like the container
+        # state, this will also set the parent of all outcomes and data ports to self
+        self.outcomes = {outcome_id: copy(outcome) for outcome_id, outcome in library_root_state.outcomes.iteritems()}
+        self.input_data_ports = {data_port_id: copy(data_port)
+                                 for data_port_id, data_port in library_root_state.input_data_ports.iteritems()}
+        self.output_data_ports = {data_port_id: copy(data_port)
+                                  for data_port_id, data_port in library_root_state.output_data_ports.iteritems()}
 
         # handle input runtime values
         self.input_data_port_runtime_values = input_data_port_runtime_values
@@ -171,7 +177,15 @@ class LibraryState(State):
         # logger.info("compare method \n\t\t\t{0} \n\t\t\t{1}".format(self, other))
         if not isinstance(other, self.__class__):
             return False
-        return str(self) == str(other) and self._state_copy == other.state_copy
+        if str(self) != str(other):
+            return False
+        # the state copies are not created for the comparison, as copies of the same library only differ in the
+        # outcomes and data ports, which they take from their library states
+        if self._state_copy is None and other._state_copy is None:
+            return self.lib_os_path == other.lib_os_path and self.version == other.version and \
+                self.outcomes == other.outcomes and self.input_data_ports == other.input_data_ports and \
+                self.output_data_ports == other.output_data_ports
+        return self.state_copy == other.state_copy
 
     def __copy__(self):
         outcomes = {elem_id: copy(elem) for elem_id, elem in self.outcomes.iteritems()}
@@ -195,11 +209,25 @@ class LibraryState(State):
     def destroy(self, recursive=True):
         super(LibraryState, self).destroy(recursive)
         if recursive:
-            if self.state_copy:
-                self.state_copy.destroy(recursive)
-            else:
+            if self._state_copy:
+                self._state_copy.destroy(recursive)
+            elif not self.initialized:
                 logger.verbose("Multiple calls of destroy {0}".format(self))
             self._state_copy = None
+            # a destroyed library state does not create a new state copy
+            self.initialized = False
+
+    def _create_state_copy(self):
+        """Copies the library root state, which is shared by all library states of the library
+
+        The state copy uses the outcomes and data ports of the library state, so that both appear as the same state.
+        """
+        lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
+        state_copy._outcomes = self._outcomes
+        state_copy._input_data_ports = self._input_data_ports
+        state_copy._output_data_ports = self._output_data_ports
+        state_copy.parent = self
+        self._state_copy = state_copy
 
     def run(self):
         """ This defines the sequence of actions that are taken when the library state is executed
@@ -224,19 +252,22 @@ class LibraryState(State):
         """Preempt the state and all of it child states.
         """
         super(LibraryState, self).recursively_preempt_states()
-        self.state_copy.recursively_preempt_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_preempt_states()
 
     def recursively_pause_states(self):
         """Pause the state and all of it child states.
         """
         super(LibraryState, self).recursively_pause_states()
-        self.state_copy.recursively_pause_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_pause_states()
 
     def recursively_resume_states(self):
         """Resume the state and all of it child states.
         """
         super(LibraryState, self).recursively_resume_states()
-        self.state_copy.recursively_resume_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_resume_states()
 
     @lock_state_machine
     def add_outcome(self, name, outcome_id=None):
@@ -316,7 +347,7 @@ class LibraryState(State):
     @lock_state_machine
     @Observable.observed
     def set_input_runtime_value(self, input_data_port_id, value):
-        checked_value = self.state_copy.input_data_ports[input_data_port_id].check_default_value(value)
+        checked_value = self.input_data_ports[input_data_port_id].check_default_value(value)
         self._input_data_port_runtime_values[input_data_port_id] = checked_value
 
     @lock_state_machine
@@ -327,7 +358,7 @@ class LibraryState(State):
     @lock_state_machine
     @Observable.observed
     def set_output_runtime_value(self, output_data_port_id, value):
-        checked_value = self.state_copy.output_data_ports[output_data_port_id].check_default_value(value)
+        checked_value = self.output_data_ports[output_data_port_id].check_default_value(value)
         self._output_data_port_runtime_values[output_data_port_id] = checked_value
 
     @lock_state_machine
@@ -369,7 +400,11 @@ class LibraryState(State):
 
     def update_hash(self, obj_hash):
         super(LibraryState, self).update_hash(obj_hash)
-        self.state_copy.update_hash(obj_hash)
+        if self._state_copy is not None:
+            self._state_copy.update_hash(obj_hash)
+        else:
+            # the state copy does not differ from the library root state, as long as it is not created
+            library_manager.get_library_state_template(self.lib_os_path)[1].update_hash(obj_hash)
 
     @staticmethod
     def state_to_dict(state):
@@ -457,7 +492,12 @@ class LibraryState(State):
     def state_copy(self):
         """Property for the _state_copy field
 
+        The copy of the library root state is created, when it is accessed the first time.
         """
+        if self._state_copy is None and self.initialized:
+            with self._state_copy_creation_lock:
+                if self._state_copy is None:
+                    self._create_state_copy()
         return self._state_copy
 
     @state_copy.setter
@@ -550,6 +590,12 @@ class LibraryState(State):
         else:
             return False
 
+    def invalidate_path_cache(self):
+        """Removes the cached paths of the state, its library root state and all their descendants"""
+        super(LibraryState, self).invalidate_path_cache()
+        if self._state_copy is not None:
+            self._state_copy.invalidate_path_cache()
+
     def get_storage_path(self, appendix=None):
         if appendix is None:
             return super(LibraryState, self).get_storage_path(appendix)
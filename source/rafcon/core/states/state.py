@@ -26,6 +26,7 @@ import copy
 import os
 import threading
 from __builtin__ import staticmethod
+from functools import partial
 from weakref import ref
 import copy
 
@@ -35,6 +36,7 @@ from jsonconversion.jsonobject import JSONObject
 from yaml import YAMLObject
 
 from rafcon.core.id_generator import *
+from rafcon.core.execution import execution_backend
 from rafcon.core.state_elements.state_element import StateElement
 from rafcon.core.state_elements.data_port import DataPort, InputDataPort, OutputDataPort
 from rafcon.core.state_elements.outcome import Outcome
@@ -78,6 +80,8 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         Observable.__init__(self)
         self._state_id = None
         self._name = None
+        # the paths by id (key False) and by name (key True), cached as they are frequently requested during execution
+        self._path_cache = {}
         self._input_data_ports = {}
         self._output_data_ports = {}
         self._outcomes = {}
@@ -236,17 +240,35 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     # ---------------------------------------------------------------------------------------------
 
     # give the state the appearance of a thread that can be started several times
-    def start(self, execution_history, backward_execution=False, generate_run_id=True):
-        """ Starts the execution of the state in a new thread.
-
+    def start(self, execution_history, backward_execution=False, generate_run_id=True, concurrent=True,
+              finished_callback=None):
+        """ Starts the execution of the state.
+
+        Root states are always executed in a new thread. All other states are executed as defined by the
+        EXECUTION_BACKEND of the core config, i.e. in a new thread, on a pooled worker thread or, if the caller joins
+        the state right away (`concurrent` is False), directly in the thread of the caller.
+
+        :param execution_history: the execution history the state adds its history items to
+        :param bool backward_execution: Flag whether to run the state in backwards mode
+        :param bool generate_run_id: Flag whether a new run id is generated
+        :param bool concurrent: False, if the state is joined directly after starting it
+        :param finished_callback: function called without arguments in the executing thread, after the execution of
+            the state finished
         :return:
         """
         self.execution_history = execution_history
         if generate_run_id:
             self._run_id = run_id_generator()
         self.backward_execution = copy.copy(backward_execution)
-        self.thread = threading.Thread(target=self.run)
-        self.thread.start()
+        function = self.run if finished_callback is None else partial(self._run_and_call, finished_callback)
+        self.thread = execution_backend.start_execution(function, concurrent, dedicated_thread=self.is_root_state)
+
+    def _run_and_call(self, finished_callback):
+        """Runs the state and calls the callback afterwards, even if the execution failed"""
+        try:
+            self.run()
+        finally:
+            finished_callback()
 
     def generate_run_id(self):
         self._run_id = run_id_generator()
@@ -519,26 +541,38 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         concatenates either State.state_id (always unique) or State.name (maybe not unique but human readable) as
         state identifier for the path.
 
+        The path is cached and only recreated after the parent, the id or the name of the state or one of its
+        ancestors has changed.
+
         :param str appendix: the part of the path that was already calculated by previous function calls
         :param bool by_name: The boolean enables name usage to generate the path
         :rtype: str
         :return: the full path to the root state
         """
-        if by_name:
-            state_identifier = self.name
-        else:
-            state_identifier = self.state_id
+        path = self._path_cache.get(by_name)
+        if path is None:
+            if by_name:
+                state_identifier = self.name
+            else:
+                state_identifier = self.state_id
 
-        if not self.is_root_state:
-            if appendix is None:
-                return self.parent.get_path(state_identifier, by_name)
+            if not self.is_root_state:
+                path = self.parent.get_path(by_name=by_name) + PATH_SEPARATOR + state_identifier
             else:
-                return self.parent.get_path(state_identifier + PATH_SEPARATOR + appendix, by_name)
+                path = state_identifier
+            self._path_cache[by_name] = path
+
+        if appendix is None:
+            return path
         else:
-            if appendix is None:
-                return state_identifier
-            else:
-                return state_identifier + PATH_SEPARATOR + appendix
+            return path + PATH_SEPARATOR + appendix
+
+    def invalidate_path_cache(self):
+        """Removes the cached paths of the state and all its descendants
+
+        The method has to be called, whenever the parent, the id or the name of the state changes.
+        """
+        self._path_cache = {}
 
     def get_storage_path(self, appendix=None):
         """ Recursively create the storage path of the state.
@@ -853,6 +887,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 state_id = state_id_generator()
 
         self._state_id = state_id
+        self.invalidate_path_cache()
 
     def get_states_statistics(self, hierarchy_level):
         """Get states statistic tuple
@@ -965,6 +1000,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise ValueError("Name must have at least one character")
 
         self._name = name
+        self.invalidate_path_cache()
 
     @property
     def parent(self):
@@ -990,6 +1026,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise TypeError("parent must be of type State or StateMachine or None")
 
             self._parent = ref(parent)
+        self.invalidate_path_cache()
 
     @property
     def input_data_ports(self):
@@ -23,11 +23,16 @@ import shutil
 import glob
 import copy
 import yaml
+import zipfile
+import threading
+from StringIO import StringIO
 from distutils.version import StrictVersion
+from multiprocessing.pool import ThreadPool
 
 import rafcon
 
-from rafcon.utils.filesystem import read_file, write_file
+from rafcon.utils.filesystem import read_file, remember_file_content, forget_file_contents, write_file_atomically, \
+    write_file_if_changed
 from rafcon.utils import storage_utils
 from rafcon.utils import log
 from rafcon.utils.timer import measure_time
@@ -52,9 +57,16 @@ STATEMACHINE_FILE = 'statemachine.json'
 STATEMACHINE_FILE_OLD = 'statemachine.yaml'
 ID_NAME_DELIMITER = "_"
 
+#: File extension of state machines packed into a single archive file
+PACKED_STATE_MACHINE_EXTENSION = '.rafcon'
+
 REPLACED_CHARACTERS_FOR_NO_OS_LIMITATION = {'/': '', r'\0': '', '<': '', '>': '', ':': '_',
                                             '\\': '', '|': '_', '?': '', '*': '_'}
 
+#: Storage ids of the child states and modification time of the state folders last checked for obsolete folders
+_known_state_folders = {}
+_known_state_folders_lock = threading.Lock()
+
 # clean the DEFAULT_SCRIPT_PATH folder at each program start
 if os.path.exists(DEFAULT_SCRIPT_PATH):
     files = glob.glob(os.path.join(DEFAULT_SCRIPT_PATH, "*"))
@@ -71,6 +83,13 @@ def remove_obsolete_folders(states, path):
     :param list states: the states that should reside in this very folder
     :param str path: the file system path to be checked for valid folders
     """
+    storage_ids = frozenset(get_storage_id_for_state(state) for state in states)
+    with _known_state_folders_lock:
+        known_state_folder = _known_state_folders.get(os.path.abspath(path))
+    if known_state_folder is not None and known_state_folder == (storage_ids, os.stat(path).st_mtime):
+        # neither the states nor the folder changed since the last check
+        return
+
     elements_in_folder = os.listdir(path)
     # find all state folder elements in system path
     state_folders_in_file_system = []
@@ -88,6 +107,36 @@ def remove_obsolete_folders(states, path):
     # remove the remaining state folders
     for folder_name in state_folders_in_file_system:
         shutil.rmtree(os.path.join(path, folder_name))
+        _forget_folder(os.path.join(path, folder_name))
+
+
+def _forget_folder(path):
+    """Forgets the files and state folders remembered within a removed folder
+
+    :param str path: the file system path of the removed folder
+    """
+    forget_file_contents(path)
+    path = os.path.abspath(path)
+    folder_prefix = os.path.join(path, '')
+    with _known_state_folders_lock:
+        for folder_path in [folder_path for folder_path in _known_state_folders
+                            if folder_path == path or folder_path.startswith(folder_prefix)]:
+            del _known_state_folders[folder_path]
+
+
+def _remember_state_folder(states, path):
+    """Remembers that the folder `path` contains exactly the folders of the given states
+
+    This allows :func:`remove_obsolete_folders` to skip listing the folder, as long as neither the states nor the
+    folder change.
+
+    :param list states: the states residing in this very folder
+    :param str path: the file system path of the folder
+    """
+    storage_ids = frozenset(get_storage_id_for_state(state) for state in states)
+    known_state_folder = storage_ids, os.stat(path).st_mtime
+    with _known_state_folders_lock:
+        _known_state_folders[os.path.abspath(path)] = known_state_folder
 
 
 def clean_path_from_deprecated_naming(base_path):
@@ -142,7 +191,17 @@ def clean_path(base_path):
     return base_path
 
 
-def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False):
+def is_packed_state_machine_path(path):
+    """Checks whether the given path points to a state machine packed into a single archive file
+
+    :param str path: the path to be checked
+    :rtype: bool
+    """
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False,
+                               packed=None):
     """Saves a state machine recursively to the file system
 
     The `as_copy` flag determines whether the state machine is saved as copy. If so (`as_copy=True`), some state
@@ -152,7 +211,15 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
     :param str base_path: base_path to which all further relative paths refers to
     :param bool delete_old_state_machine: Whether to delete any state machine existing at the given path
     :param bool as_copy: Whether to use a copy storage for the state machine
+    :param bool packed: Whether to pack the state machine into a single archive file instead of a folder, if None,
+        the state machine is packed if the path ends with PACKED_STATE_MACHINE_EXTENSION
     """
+    if packed is None:
+        packed = base_path.endswith(PACKED_STATE_MACHINE_EXTENSION)
+    if packed:
+        save_packed_state_machine_to_path(state_machine, base_path, as_copy)
+        return
+
     # warns the user in the logger when using deprecated names
     clean_path_from_deprecated_naming(base_path)
 
@@ -164,6 +231,7 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         if delete_old_state_machine:
             if os.path.exists(base_path):
                 shutil.rmtree(base_path)
+                _forget_folder(base_path)
 
         # Ensure that path is existing
         if not os.path.exists(base_path):
@@ -172,7 +240,8 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         old_update_time = state_machine.last_update
         state_machine.last_update = storage_utils.get_current_time_string()
         state_machine_dict = state_machine.to_dict()
-        storage_utils.write_dict_to_json(state_machine_dict, os.path.join(base_path, STATEMACHINE_FILE))
+        write_file_atomically(os.path.join(base_path, STATEMACHINE_FILE),
+                              storage_utils.get_json_string_from_dict(state_machine_dict))
 
         # set the file_system_path of the state machine
         if not as_copy:
@@ -183,6 +252,7 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         # add root state recursively
         remove_obsolete_folders([root_state], base_path)
         save_state_recursively(root_state, base_path, "", as_copy)
+        _remember_state_folder([root_state], base_path)
 
         if state_machine.marked_dirty and not as_copy:
             state_machine.marked_dirty = False
@@ -193,6 +263,119 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         state_machine.release_modification_lock()
 
 
+def _get_previous_meta_data_files(state_machine):
+    """Reads the GUI meta data files of a state machine from its current storage location
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state machine
+    :return: the content of the meta data files and their state, None for the meta data file of the state machine
+    :rtype: list
+    """
+    previous_base_path = state_machine.file_system_path
+    if previous_base_path is None or not os.path.exists(previous_base_path):
+        return []
+    if is_packed_state_machine_path(previous_base_path):
+        packed_files = read_packed_state_machine_files(previous_base_path)
+    else:
+        packed_files = None
+
+    meta_data_files = []
+    folder_paths = [(None, previous_base_path)]
+    states = [state_machine.root_state]
+    while states:
+        state = states.pop()
+        if state.file_system_path is not None and state.file_system_path.startswith(previous_base_path):
+            folder_paths.append((state, state.file_system_path))
+        if hasattr(state, 'states'):
+            states.extend(state.states.itervalues())
+    for state, folder_path in folder_paths:
+        if packed_files is not None:
+            relative_path = os.path.relpath(os.path.join(folder_path, FILE_NAME_META_DATA), previous_base_path)
+            meta_data = packed_files.get(relative_path)
+        else:
+            meta_data = read_file(folder_path, FILE_NAME_META_DATA)
+        if meta_data is not None:
+            meta_data_files.append((state, meta_data))
+    return meta_data_files
+
+
+def save_packed_state_machine_to_path(state_machine, path, as_copy=False):
+    """Saves a state machine into a single archive file
+
+    The archive contains the same files as a state machine folder, including the GUI meta data files found at the
+    previous storage location of the state machine. The archive is written to a temporary file, which replaces the
+    file at the given path after it was completely written.
+    The state paths of the saved state machine point into the archive, e.g. `path/root_state_id/child_state_id`.
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state_machine to be saved
+    :param str path: the path of the archive file
+    :param bool as_copy: Whether to use a copy storage for the state machine
+    """
+    state_machine.acquire_modification_lock()
+    try:
+        meta_data_files = _get_previous_meta_data_files(state_machine)
+
+        old_update_time = state_machine.last_update
+        state_machine.last_update = storage_utils.get_current_time_string()
+        packed_files = {STATEMACHINE_FILE: storage_utils.get_json_string_from_dict(state_machine.to_dict())}
+        if as_copy:
+            state_machine.last_update = old_update_time
+
+        state_paths = {}
+        states = [(state_machine.root_state, get_storage_id_for_state(state_machine.root_state))]
+        while states:
+            state, state_path = states.pop()
+            state_paths[id(state)] = state, state_path
+            packed_files.update(_get_state_files(state, state_path))
+            if hasattr(state, 'states'):
+                states.extend((child_state, os.path.join(state_path, get_storage_id_for_state(child_state)))
+                              for child_state in state.states.itervalues())
+        for state, meta_data in meta_data_files:
+            state_path = state_paths[id(state)][1] if state is not None else ''
+            packed_files[os.path.join(state_path, FILE_NAME_META_DATA)] = meta_data
+
+        folder_path = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+        archive_content = StringIO()
+        archive = zipfile.ZipFile(archive_content, 'w', zipfile.ZIP_DEFLATED)
+        for name in sorted(packed_files):
+            archive.writestr(name.replace(os.path.sep, '/'), packed_files[name])
+        archive.close()
+        write_file_atomically(path, archive_content.getvalue(), mode='wb')
+
+        if not as_copy:
+            from rafcon.core.states.execution_state import ExecutionState
+            state_machine.file_system_path = path
+            for state, state_path in state_paths.itervalues():
+                state.file_system_path = os.path.join(path, state_path)
+                if isinstance(state, ExecutionState):
+                    state.script.filename = SCRIPT_FILE
+                    state.script.path = state.file_system_path
+            if state_machine.marked_dirty:
+                state_machine.marked_dirty = False
+        logger.debug("State machine with id {0} was packed into {1}".format(state_machine.state_machine_id, path))
+    finally:
+        state_machine.release_modification_lock()
+
+
+def _get_state_files(state, state_path):
+    """Creates the content of the core data, script and semantic data files of a state
+
+    :param state: the state
+    :param str state_path: the path of the state folder, relative to the state machine folder
+    :return: the content of the files by their path
+    :rtype: dict
+    """
+    from rafcon.core.states.execution_state import ExecutionState
+    state_files = {
+        os.path.join(state_path, FILE_NAME_CORE_DATA): storage_utils.get_json_string_from_dict(state),
+        os.path.join(state_path, SEMANTIC_DATA_FILE): storage_utils.get_json_string_from_dict(state.semantic_data)
+    }
+    if isinstance(state, ExecutionState):
+        state_files[os.path.join(state_path, SCRIPT_FILE)] = state.script_text
+    return state_files
+
+
 def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=False):
     """Saves the script file for a state to the directory of the state.
 
@@ -208,7 +391,7 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
         destination_script_file = os.path.join(state_path_full, SCRIPT_FILE)
 
         try:
-            write_file(destination_script_file, state.script_text)
+            write_file_if_changed(destination_script_file, state.script_text)
         except Exception:
             logger.exception("Storing of script file failed: {0} -> {1}".format(state.get_path(),
                                                                                 destination_script_file))
@@ -229,7 +412,7 @@ def save_semantic_data_for_state(state, state_path_full):
     destination_script_file = os.path.join(state_path_full, SEMANTIC_DATA_FILE)
 
     try:
-        storage_utils.write_dict_to_json(state.semantic_data, destination_script_file)
+        write_file_if_changed(destination_script_file, storage_utils.get_json_string_from_dict(state.semantic_data))
     except IOError:
         logger.exception("Storing of semantic data for state {0} failed! Destination path: {1}".
                          format(state.get_path(), destination_script_file))
@@ -255,7 +438,8 @@ def save_state_recursively(state, base_path, parent_path, as_copy=False):
     if not os.path.exists(state_path_full):
         os.makedirs(state_path_full)
 
-    storage_utils.write_dict_to_json(state, os.path.join(state_path_full, FILE_NAME_CORE_DATA))
+    write_file_if_changed(os.path.join(state_path_full, FILE_NAME_CORE_DATA),
+                          storage_utils.get_json_string_from_dict(state))
     if not as_copy:
         state.file_system_path = state_path_full
 
@@ -266,9 +450,10 @@ def save_state_recursively(state, base_path, parent_path, as_copy=False):
 
     # create yaml files for all children
     if isinstance(state, ContainerState):
-        remove_obsolete_folders(state.states.values(), os.path.join(base_path, state_path))
-        for state in state.states.itervalues():
-            save_state_recursively(state, base_path, state_path, as_copy)
+        remove_obsolete_folders(state.states.values(), state_path_full)
+        for child_state in state.states.itervalues():
+            save_state_recursively(child_state, base_path, state_path, as_copy)
+        _remember_state_folder(state.states.values(), state_path_full)
 
 
 @measure_time
@@ -281,6 +466,9 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     """
     logger.debug("Loading state machine from path {0}...".format(base_path))
 
+    if is_packed_state_machine_path(base_path):
+        return load_packed_state_machine_from_path(base_path, state_machine_id)
+
     state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
     state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
 
@@ -298,48 +486,7 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
 
     if os.path.exists(state_machine_file_path):
         state_machine_dict = storage_utils.load_objects_from_json(state_machine_file_path)
-        if 'used_rafcon_version' in state_machine_dict:
-            previously_used_rafcon_version = StrictVersion(state_machine_dict['used_rafcon_version']).version
-            active_rafcon_version = StrictVersion(rafcon.__version__).version
-
-            rafcon_newer_than_sm_version = "You are trying to load a state machine that was stored with an older " \
-                                           "version of RAFCON ({0}) than the one you are using ({1}).".format(
-                                            state_machine_dict['used_rafcon_version'], rafcon.__version__)
-            rafcon_older_than_sm_version = "You are trying to load a state machine that was stored with an newer " \
-                                           "version of RAFCON ({0}) than the one you are using ({1}).".format(
-                                            state_machine_dict['used_rafcon_version'], rafcon.__version__)
-            note_about_possible_incompatibility = "The state machine will be loaded with no guarantee of success."
-
-            if active_rafcon_version[0] > previously_used_rafcon_version[0]:
-                # this is the default case
-                # for a list of breaking changes please see: doc/breaking_changes.rst
-                # logger.warn(rafcon_newer_than_sm_version)
-                # logger.warn(note_about_possible_incompatibility)
-                pass
-            if active_rafcon_version[0] == previously_used_rafcon_version[0]:
-                if active_rafcon_version[1] > previously_used_rafcon_version[1]:
-                    # this is the default case
-                    # for a list of breaking changes please see: doc/breaking_changes.rst
-                    # logger.info(rafcon_newer_than_sm_version)
-                    # logger.info(note_about_possible_incompatibility)
-                    pass
-                elif active_rafcon_version[1] == previously_used_rafcon_version[1]:
-                    # Major and minor version of RAFCON and the state machine match
-                    # It should be safe to load the state machine, as the patch level does not change the format
-                    pass
-                else:
-                    logger.warn(rafcon_older_than_sm_version)
-                    logger.warn(note_about_possible_incompatibility)
-            else:
-                logger.warn(rafcon_older_than_sm_version)
-                logger.warn(note_about_possible_incompatibility)
-
-        state_machine = StateMachine.from_dict(state_machine_dict, state_machine_id)
-        if "root_state_storage_id" not in state_machine_dict:
-            root_state_storage_id = state_machine_dict['root_state_id']
-            state_machine.supports_saving_state_names = False
-        else:
-            root_state_storage_id = state_machine_dict['root_state_storage_id']
+        state_machine, root_state_storage_id = _create_state_machine_from_dict(state_machine_dict, state_machine_id)
 
     # TODO: Remove this with next minor release
     else:
@@ -360,11 +507,78 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
                                      state_machine_id=state_machine_id)
         state_machine.supports_saving_state_names = False
 
+    state_files = read_state_files_recursively(os.path.join(base_path, root_state_storage_id))
+    return _load_states_of_state_machine(state_machine, base_path, root_state_storage_id, state_files)
+
+
+def _create_state_machine_from_dict(state_machine_dict, state_machine_id=None):
+    """Creates a state machine without states from the content of its state machine file
+
+    :param dict state_machine_dict: the content of the state machine file
+    :param int state_machine_id: the optional id of the state machine
+    :return: the state machine and the storage id of its root state
+    :rtype: (rafcon.core.state_machine.StateMachine, str)
+    """
+    if 'used_rafcon_version' in state_machine_dict:
+        previously_used_rafcon_version = StrictVersion(state_machine_dict['used_rafcon_version']).version
+        active_rafcon_version = StrictVersion(rafcon.__version__).version
+
+        rafcon_newer_than_sm_version = "You are trying to load a state machine that was stored with an older " \
+                                       "version of RAFCON ({0}) than the one you are using ({1}).".format(
+                                        state_machine_dict['used_rafcon_version'], rafcon.__version__)
+        rafcon_older_than_sm_version = "You are trying to load a state machine that was stored with an newer " \
+                                       "version of RAFCON ({0}) than the one you are using ({1}).".format(
+                                        state_machine_dict['used_rafcon_version'], rafcon.__version__)
+        note_about_possible_incompatibility = "The state machine will be loaded with no guarantee of success."
+
+        if active_rafcon_version[0] > previously_used_rafcon_version[0]:
+            # this is the default case
+            # for a list of breaking changes please see: doc/breaking_changes.rst
+            # logger.warn(rafcon_newer_than_sm_version)
+            # logger.warn(note_about_possible_incompatibility)
+            pass
+        if active_rafcon_version[0] == previously_used_rafcon_version[0]:
+            if active_rafcon_version[1] > previously_used_rafcon_version[1]:
+                # this is the default case
+                # for a list of breaking changes please see: doc/breaking_changes.rst
+                # logger.info(rafcon_newer_than_sm_version)
+                # logger.info(note_about_possible_incompatibility)
+                pass
+            elif active_rafcon_version[1] == previously_used_rafcon_version[1]:
+                # Major and minor version of RAFCON and the state machine match
+                # It should be safe to load the state machine, as the patch level does not change the format
+                pass
+            else:
+                logger.warn(rafcon_older_than_sm_version)
+                logger.warn(note_about_possible_incompatibility)
+        else:
+            logger.warn(rafcon_older_than_sm_version)
+            logger.warn(note_about_possible_incompatibility)
+
+    state_machine = StateMachine.from_dict(state_machine_dict, state_machine_id)
+    if "root_state_storage_id" not in state_machine_dict:
+        root_state_storage_id = state_machine_dict['root_state_id']
+        state_machine.supports_saving_state_names = False
+    else:
+        root_state_storage_id = state_machine_dict['root_state_storage_id']
+    return state_machine, root_state_storage_id
+
+
+def _load_states_of_state_machine(state_machine, base_path, root_state_storage_id, state_files):
+    """Loads the states of a state machine
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state machine without states
+    :param str base_path: the path of the state machine
+    :param str root_state_storage_id: the storage id of the root state
+    :param dict state_files: the already read files of the state folders, see :func:`read_state_files_recursively`
+    :return: the state machine
+    :rtype: rafcon.core.state_machine.StateMachine
+    """
     root_state_path = os.path.join(base_path, root_state_storage_id)
     state_machine.file_system_path = base_path
     dirty_states = []
     state_machine.root_state = load_state_recursively(parent=state_machine, state_path=root_state_path,
-                                                      dirty_states=dirty_states)
+                                                      dirty_states=dirty_states, state_files=state_files)
     if len(dirty_states) > 0:
         state_machine.marked_dirty = True
     else:
@@ -380,6 +594,62 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     return state_machine
 
 
+def read_packed_state_machine_files(path):
+    """Reads all files of a state machine packed into a single archive file
+
+    :param str path: the path of the archive file
+    :return: the content of the files by their path within the archive
+    :rtype: dict
+    """
+    archive = zipfile.ZipFile(path, 'r')
+    try:
+        return {name.replace('/', os.path.sep): archive.read(name) for name in archive.namelist()}
+    finally:
+        archive.close()
+
+
+def load_packed_state_machine_from_path(path, state_machine_id=None):
+    """Loads a state machine packed into a single archive file
+
+    All files are read from the archive at once. The paths of the loaded states point into the archive, see
+    :func:`save_packed_state_machine_to_path`.
+
+    :param str path: the path of the archive file
+    :param int state_machine_id: the optional id of the state machine
+    :return: the loaded state machine
+    :rtype: rafcon.core.state_machine.StateMachine
+    :raises ValueError: if the archive does not contain a valid state machine
+    """
+    try:
+        packed_files = read_packed_state_machine_files(path)
+    except zipfile.BadZipfile as e:
+        raise ValueError("Provided file is no valid state machine archive: {0} ({1})".format(path, e))
+    if STATEMACHINE_FILE not in packed_files:
+        raise ValueError("Provided archive doesn't contain a valid state machine: {0}".format(path))
+    state_machine_dict = storage_utils.load_objects_from_json_string(packed_files.pop(STATEMACHINE_FILE))
+    state_machine, root_state_storage_id = _create_state_machine_from_dict(state_machine_dict, state_machine_id)
+
+    state_files = {}
+    for name, content in packed_files.iteritems():
+        state_path, filename = os.path.split(os.path.join(path, name))
+        if state_path == path:
+            continue
+        if state_path not in state_files:
+            state_files[state_path] = {'core_data_file': FILE_NAME_CORE_DATA, 'core_data': None, 'script': None,
+                                       'semantic_data': None, 'child_state_paths': []}
+        for key, state_filename in (('core_data', FILE_NAME_CORE_DATA), ('script', SCRIPT_FILE),
+                                    ('semantic_data', SEMANTIC_DATA_FILE)):
+            if filename == state_filename:
+                state_files[state_path][key] = content
+    for state_path in state_files:
+        parent_path = os.path.dirname(state_path)
+        if parent_path in state_files:
+            state_files[parent_path]['child_state_paths'].append(state_path)
+    for files in state_files.itervalues():
+        files['child_state_paths'].sort()
+    return _load_states_of_state_machine(state_machine, path, root_state_storage_id, state_files)
+
+
 def load_state_from_path(state_path):
     """Loads a state from a given path
 
@@ -389,7 +659,71 @@ def load_state_from_path(state_path):
     return load_state_recursively(parent=None, state_path=state_path)
 
 
-def load_state_recursively(parent, state_path=None, dirty_states=[]):
+def _read_state_files(state_path):
+    """Reads the core data, script and semantic data files of a state folder
+
+    :param str state_path: the path of the state folder
+    :return: the content of the files, None for missing files, and the paths of the child state folders
+    :rtype: dict
+    """
+    names = os.listdir(state_path)
+    core_data_file = FILE_NAME_CORE_DATA if FILE_NAME_CORE_DATA in names else FILE_NAME_CORE_DATA_OLD
+    state_files = {'core_data_file': core_data_file, 'child_state_paths': []}
+    for key, filename in (('core_data', core_data_file), ('script', SCRIPT_FILE),
+                          ('semantic_data', SEMANTIC_DATA_FILE)):
+        state_files[key] = read_file(state_path, filename) if filename in names else None
+        if state_files[key] is not None:
+            # allows to skip writing unchanged files when saving the state machine
+            remember_file_content(os.path.join(state_path, filename), state_files[key])
+    for name in names:
+        child_state_path = os.path.join(state_path, name)
+        if os.path.isdir(child_state_path):
+            state_files['child_state_paths'].append(child_state_path)
+    return state_files
+
+
+def read_state_files_recursively(state_path):
+    """Reads the files of a state and all its child states with a pool of threads
+
+    The files of all states of one hierarchy level are read concurrently, which speeds up the loading of large state
+    machines, especially from network file systems. The number of threads is given by the config option
+    LOAD_STATE_MACHINE_THREADS. Decoding the files and creating the states is left to
+    :func:`load_state_recursively`, as the creation of states is not thread-safe.
+
+    :param str state_path: the path of the state folder
+    :return: the files of all state folders by their path, see :func:`_read_state_files`, None if the files are to be
+        read one after another while loading the states
+    :rtype: dict
+    """
+    number_of_threads = global_config.get_config_value("LOAD_STATE_MACHINE_THREADS", 8)
+    if number_of_threads <= 1:
+        return None
+
+    try:
+        state_files = {state_path: _read_state_files(state_path)}
+    except (IOError, OSError):
+        return None
+    state_paths = state_files[state_path]['child_state_paths']
+    if not state_paths:
+        return state_files
+
+    pool = ThreadPool(number_of_threads)
+    try:
+        while state_paths:
+            results = pool.map(_read_state_files, state_paths)
+            state_files.update(zip(state_paths, results))
+            state_paths = [child_state_path for result in results for child_state_path in result['child_state_paths']]
+    except (IOError, OSError) as e:
+        # the files are read again while loading the states, which results in the usual error handling
+        logger.debug("Reading the state files of {0} in parallel failed: {1}".format(state_path, e))
+        return None
+    finally:
+        pool.close()
+        pool.join()
+    return state_files
+
+
+def load_state_recursively(parent, state_path=None, dirty_states=[], state_files=None):
     """Recursively loads the state
 
     It calls this method on each sub-state of a container state.
@@ -397,29 +731,41 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     :param parent:  the root state of the last load call to which the loaded state will be added
     :param state_path: the path on the filesystem where to find the meta file for the state
     :param dirty_states: a dict of states which changed during loading
+    :param dict state_files: the already read files of the state folders, see :func:`read_state_files_recursively`,
+        None to read the files of each state while loading it
     :return:
     """
     from rafcon.core.states.execution_state import ExecutionState
     from rafcon.core.states.container_state import ContainerState
     from rafcon.core.states.hierarchy_state import HierarchyState
 
-    path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA)
-
     logger.debug("Load state recursively: {0}".format(str(state_path)))
 
-    # TODO: Should be removed with next minor release
-    if not os.path.exists(path_core_data):
-        path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA_OLD)
+    files = state_files.get(state_path) if state_files is not None else None
+
+    if files is not None:
+        path_core_data = os.path.join(state_path, files['core_data_file'])
+    else:
+        path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA)
+        # TODO: Should be removed with next minor release
+        if not os.path.exists(path_core_data):
+            path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA_OLD)
 
     try:
-        state_info = load_data_file(path_core_data)
+        if files is not None and files['core_data'] is not None:
+            state_info = storage_utils.load_objects_from_json_string(files['core_data'])
+        else:
+            state_info = load_data_file(path_core_data)
     except ValueError, e:
         logger.exception("Error while loading state data: {0}".format(e))
         return
     except LibraryNotFoundException, e:
         logger.error("Library could not be loaded: {0}\n"
                      "Skipping library and continuing loading the state machine".format(str(e.message)))
-        state_info = storage_utils.load_objects_from_json(path_core_data, as_dict=True)
+        if files is not None and files['core_data'] is not None:
+            state_info = storage_utils.load_objects_from_json_string(files['core_data'], as_dict=True)
+        else:
+            state_info = storage_utils.load_objects_from_json(path_core_data, as_dict=True)
         state_id = state_info["state_id"]
         dummy_state = HierarchyState(LIBRARY_NOT_FOUND_DUMMY_STATE_NAME, state_id=state_id)
         # set parent of dummy state
@@ -447,12 +793,18 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
 
     # read script file if an execution state
     if isinstance(state, ExecutionState):
-        script_text = read_file(state_path, state.script.filename)
+        if files is not None and files['script'] is not None and state.script.filename == SCRIPT_FILE:
+            script_text = files['script']
+        else:
+            script_text = read_file(state_path, state.script.filename)
         state.script_text = script_text
 
     # load semantic data
     try:
-        semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
+        if files is not None and files['semantic_data'] is not None:
+            semantic_data = storage_utils.load_objects_from_json_string(files['semantic_data'])
+        else:
+            semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
         state.semantic_data = semantic_data
     except Exception, e:
         # semantic data file does not have to be there
@@ -461,12 +813,15 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     one_of_my_child_states_not_found = False
 
     # load child states
-    for p in os.listdir(state_path):
-        child_state_path = os.path.join(state_path, p)
-        if os.path.isdir(child_state_path):
-            child_state = load_state_recursively(state, child_state_path, dirty_states)
-            if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
-                one_of_my_child_states_not_found = True
+    if files is not None:
+        child_state_paths = files['child_state_paths']
+    else:
+        child_state_paths = [os.path.join(state_path, p) for p in os.listdir(state_path)
+                             if os.path.isdir(os.path.join(state_path, p))]
+    for child_state_path in child_state_paths:
+        child_state = load_state_recursively(state, child_state_path, dirty_states, state_files)
+        if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
+            one_of_my_child_states_not_found = True
 
     if one_of_my_child_states_not_found:
         # omit adding transitions and data flows in this case
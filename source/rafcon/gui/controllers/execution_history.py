@@ -44,6 +44,60 @@ from rafcon.utils import log
 logger = log.get_logger(__name__)
 
 
+class HistoryTreeNode(object):
+    """A node of the execution history tree
+
+    The nodes hold the structure of the whole execution history tree, while the tree store only contains the rows of
+    the expanded parts of the tree. The rows of the children of a node are only inserted into the tree store, when
+    the row of the node is expanded for the first time. Until then, a placeholder row shows the expander.
+
+    :ivar rafcon.core.execution.execution_history.HistoryItem history_item: the history item of the node
+    :ivar str description: the description of the history item, e.g. "Call" or "Return"
+    :ivar bool dummy: whether the node only groups its children, e.g. a concurrency branch
+    :ivar HistoryTreeNode parent: the parent node, None for the root node
+    :ivar list children: the child nodes, None if there are none
+    :ivar gtk.TreeIter row: the row of the node, None if not inserted into the tree store
+    :ivar bool children_inserted: whether the rows of the children are inserted into the tree store
+    """
+    __slots__ = ('history_item', 'description', 'dummy', 'parent', 'children', 'row', 'children_inserted')
+
+    def __init__(self, history_item, description, dummy=False, parent=None):
+        self.history_item = history_item
+        self.description = description
+        self.dummy = dummy
+        self.parent = parent
+        self.children = None
+        self.row = None
+        self.children_inserted = False
+
+
+class HistoryTreeCursor(object):
+    """The position up to which an execution history was inserted into the execution history tree
+
+    :ivar rafcon.core.execution.execution_history.ExecutionHistory execution_history: the execution history
+    :ivar HistoryTreeNode container_node: the node to add the node of the run or concurrency branch to
+    :ivar int run_number: the number of the run, None for concurrency branches
+    :ivar HistoryTreeNode parent_node: the node to add the next history item to, None until the first item is added
+    :ivar str last_history_item_id: the id of the history item added last
+    :ivar rafcon.core.execution.execution_history.HistoryItem last_history_item: the history item added last
+    :ivar HistoryTreeNode last_node: the node of the history item added last
+    :ivar int number_of_evicted_items: the number of history items evicted from the execution history before the
+        items were added
+    """
+    __slots__ = ('execution_history', 'container_node', 'run_number', 'parent_node', 'last_history_item_id',
+                 'last_history_item', 'last_node', 'number_of_evicted_items')
+
+    def __init__(self, execution_history, container_node, run_number=None):
+        self.execution_history = execution_history
+        self.container_node = container_node
+        self.run_number = run_number
+        self.parent_node = None
+        self.last_history_item_id = None
+        self.last_history_item = None
+        self.last_node = None
+        self.number_of_evicted_items = 0
+
+
 class ExecutionHistoryTreeController(ExtendedController):
     """Controller handling the execution history.
 
@@ -56,6 +110,7 @@ class ExecutionHistoryTreeController(ExtendedController):
     LABEL_NAME_STORAGE_ID = 0
     HISTORY_ITEM_STORAGE_ID = 1
     TOOL_TIP_STORAGE_ID = 2
+    NODE_STORAGE_ID = 3
     TOOL_TIP_TEXT = "Right click for more details\n" \
                     "Double click to select corresponding state"
 
@@ -64,7 +119,7 @@ class ExecutionHistoryTreeController(ExtendedController):
         assert isinstance(view, ExecutionHistoryView)
 
         super(ExecutionHistoryTreeController, self).__init__(model, view)
-        self.history_tree_store = gtk.TreeStore(str, gobject.TYPE_PYOBJECT, str)
+        self.history_tree_store = gtk.TreeStore(str, gobject.TYPE_PYOBJECT, str, gobject.TYPE_PYOBJECT)
         # a TreeView
         self.history_tree = view['history_tree']
         self.history_tree.set_model(self.history_tree_store)
@@ -73,6 +128,10 @@ class ExecutionHistoryTreeController(ExtendedController):
         self.observe_model(state_machine_execution_model)
         self._expansion_state = {}
         self._update_lock = RLock()
+        self._displayed_state_machine_id = None
+        self._displayed_execution_histories = []
+        self._cursors = []
+        self._root_node = None
 
         self.update()
 
@@ -83,6 +142,7 @@ class ExecutionHistoryTreeController(ExtendedController):
     def register_view(self, view):
         super(ExecutionHistoryTreeController, self).register_view(view)
         self.history_tree.connect('button_press_event', self.mouse_click)
+        self.history_tree.connect('test-expand-row', self.on_test_expand_row)
         view['reload_button'].connect('clicked', self.reload_history)
         view['clean_button'].connect('clicked', self.clean_history)
 
@@ -184,12 +244,6 @@ class ExecutionHistoryTreeController(ExtendedController):
 
             return True
 
-    # TODO: implement! To do this efficiently a mechanism is needed that does not regenerate the whole tree view
-    # TODO: the appropriate state machine would have to be observed as well
-    # @ExtendedController.observe("execution_history_container", after=True)
-    # def model_changed(self, model, prop_name, info):
-    #     #self.update()
-
     def get_history_item_for_tree_iter(self, child_tree_iter):
         """Hands history item for tree iter and compensate if tree item is a dummy item
 
@@ -199,9 +253,9 @@ class ExecutionHistoryTreeController(ExtendedController):
         """
         history_item = self.history_tree_store[child_tree_iter][self.HISTORY_ITEM_STORAGE_ID]
         if history_item is None:  # is dummy item
-            if self.history_tree_store.iter_n_children(child_tree_iter) > 0:
-                child_iter = self.history_tree_store.iter_nth_child(child_tree_iter, 0)
-                history_item = self.history_tree_store[child_iter][self.HISTORY_ITEM_STORAGE_ID]
+            node = self.history_tree_store[child_tree_iter][self.NODE_STORAGE_ID]
+            if node is not None and node.children:
+                history_item = node.children[0].history_item
             else:
                 logger.warning("In a dummy history should be respective real call element.")
         return history_item
@@ -222,7 +276,9 @@ class ExecutionHistoryTreeController(ExtendedController):
 
             for n in range(self.history_tree_store.iter_n_children(child_tree_iter)):
                 child_iter = self.history_tree_store.iter_nth_child(child_tree_iter, n)
-                store_tree_expansion(child_iter, expansion_state)
+                # skip the placeholder rows of not yet expanded rows
+                if self.history_tree_store[child_iter][self.NODE_STORAGE_ID] is not None:
+                    store_tree_expansion(child_iter, expansion_state)
 
         root_iter = self.history_tree_store.get_iter_root()
         if not root_iter:
@@ -251,7 +307,8 @@ class ExecutionHistoryTreeController(ExtendedController):
 
             for n in range(self.history_tree_store.iter_n_children(child_tree_iter)):
                 child_iter = self.history_tree_store.iter_nth_child(child_tree_iter, n)
-                restore_tree_expansion(child_iter, expansion_state)
+                if self.history_tree_store[child_iter][self.NODE_STORAGE_ID] is not None:
+                    restore_tree_expansion(child_iter, expansion_state)
 
         root_iter = self.history_tree_store.get_iter_root()
         if not root_iter:
@@ -302,7 +359,7 @@ class ExecutionHistoryTreeController(ExtendedController):
 
         Empties the execution history tree by adjusting the start index and updates tree store and view.
         """
-        self.history_tree_store.clear()
+        self._clear_tree()
         selected_sm_m = self.model.get_selected_state_machine_model()
         if selected_sm_m:
             selected_sm_m.state_machine.clear_execution_histories()
@@ -313,127 +370,207 @@ class ExecutionHistoryTreeController(ExtendedController):
         self.update()
 
     def update(self):
+        """Update the tree view of the history item tree store
+
+        Only the history items added since the last update are inserted. The tree is rebuilt, if another state machine
+        was selected or if history items were removed, e.g. by stepping backwards or by evicting old items.
         """
-        rebuild the tree view of the history item tree store
-        :return:
-        """
-        # with self._update_lock:
-        self._update_lock.acquire()
-        self._store_expansion_state()
+        with self._update_lock:
+            selected_sm_m = self.model.get_selected_state_machine_model()
+            if not selected_sm_m:
+                self._store_expansion_state()
+                self._clear_tree()
+                return
+            state_machine = selected_sm_m.state_machine
+            execution_histories = list(state_machine.execution_histories)
+
+            rebuild = state_machine.state_machine_id != self._displayed_state_machine_id or \
+                len(execution_histories) < len(self._displayed_execution_histories) or \
+                any(displayed is not current for displayed, current in zip(self._displayed_execution_histories,
+                                                                            execution_histories))
+            if not rebuild:
+                rebuild = not self._insert_new_history_items(execution_histories)
+            if rebuild:
+                self._store_expansion_state()
+                self._clear_tree()
+                self._displayed_state_machine_id = state_machine.state_machine_id
+                self._insert_new_history_items(execution_histories)
+                self._restore_expansion_state()
+
+    def _clear_tree(self):
         self.history_tree_store.clear()
-        selected_sm_m = self.model.get_selected_state_machine_model()
-        if not selected_sm_m:
-            return
-
-        for execution_number, execution_history in enumerate(selected_sm_m.state_machine.execution_histories):
-            if len(execution_history) > 0:
-                first_history_item = execution_history[0]
-                # the next lines filter out the StateMachineStartItem, which is not intended to
-                # be displayed, but merely as convenient entry point in the saved log file
-                if isinstance(first_history_item, StateMachineStartItem):
-                    if len(execution_history) > 1:
-                        first_history_item = execution_history[1]
-                        tree_item = self.history_tree_store.insert_after(
-                            None,
-                            None,
-                            (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
-                             first_history_item, self.TOOL_TIP_TEXT))
-                        self.insert_execution_history(tree_item, execution_history[1:], is_root=True)
-                    else:
-                        pass  # there was only the Start item in the history
-                else:
-                    tree_item = self.history_tree_store.insert_after(
-                        None,
-                        None,
-                        (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
-                         first_history_item, self.TOOL_TIP_TEXT))
-                    self.insert_execution_history(tree_item, execution_history, is_root=True)
-
-        self._restore_expansion_state()
-        self._update_lock.release()
-
-    def insert_history_item(self, parent, history_item, description, dummy=False):
-        """Enters a single history item into the tree store
-
-        :param gtk.TreeItem parent: Parent tree item
-        :param HistoryItem history_item: History item to be inserted
-        :param str description: A description to be added to the entry
-        :param None dummy: Whether this is just a dummy entry (wrapper for concurrency items)
-        :return: Inserted tree item
-        :rtype: gtk.TreeItem
+        self._displayed_state_machine_id = None
+        self._displayed_execution_histories = []
+        self._cursors = []
+        self._root_node = HistoryTreeNode(None, None)
+        self._root_node.children_inserted = True
+
+    def _insert_new_history_items(self, execution_histories):
+        """Inserts the history items added since the last update
+
+        :param list execution_histories: the execution histories of all runs of the displayed state machine
+        :return: False, if history items were removed since the last update and the tree has to be rebuilt
+        :rtype: bool
+        """
+        for run_number in range(len(self._displayed_execution_histories), len(execution_histories)):
+            execution_history = execution_histories[run_number]
+            self._displayed_execution_histories.append(execution_history)
+            self._cursors.append(HistoryTreeCursor(execution_history, self._root_node, run_number + 1))
+        # the cursors of concurrency branches are added while iterating
+        for cursor in list(self._cursors):
+            if not self._insert_new_history_items_of_cursor(cursor):
+                return False
+        return True
+
+    def _get_new_history_items(self, cursor):
+        """Determines the history items of an execution history added since the last update
+
+        :param HistoryTreeCursor cursor: the cursor of the execution history
+        :return: the new history items, None if history items were removed since the last update
+        :rtype: list
         """
-        if not history_item.state_reference:
-            logger.error("This must never happen! Current history_item is {}".format(history_item))
+        number_of_evicted_items = cursor.execution_history.number_of_evicted_items
+        history_items = list(cursor.execution_history)
+        if cursor.last_history_item_id is None:
+            cursor.number_of_evicted_items = number_of_evicted_items
+            return history_items
+        if number_of_evicted_items != cursor.number_of_evicted_items:
+            # the nodes of the evicted items are dropped by rebuilding the tree, so that the items can be released
             return None
-        content = None
-
-        if global_gui_config.get_config_value("SHOW_PATH_NAMES_IN_EXECUTION_HISTORY", False):
-            content = (history_item.state_reference.name + " - " +
-                           history_item.state_reference.get_path() + " - " +
-                           description, None if dummy else history_item,
-                           None if dummy else self.TOOL_TIP_TEXT)
-        else:
-            content = (history_item.state_reference.name + " - " +
-                           description, None if dummy else history_item,
-                           None if dummy else self.TOOL_TIP_TEXT)
-
-        tree_item = self.history_tree_store.insert_before(
-            parent, None, content)
-        return tree_item
+        # history item ids are increasing
+        index = len(history_items)
+        while index > 0 and history_items[index - 1].history_item_id > cursor.last_history_item_id:
+            index -= 1
+        if index == 0 or history_items[index - 1].history_item_id != cursor.last_history_item_id:
+            # the last inserted item was removed, e.g. by stepping backwards
+            return None
+        return history_items[index:]
 
-    def insert_execution_history(self, parent, execution_history, is_root=False):
-        """Insert a list of history items into a the tree store
+    def _insert_new_history_items_of_cursor(self, cursor):
+        """Inserts the history items of an execution history added since the last update
 
-        If there are concurrency history items, the method is called recursively.
+        If there are concurrency history items, the child execution histories are inserted right away and their
+        cursors are added for the next updates.
 
-        :param gtk.TreeItem parent: the parent to add the next history item to
-        :param ExecutionHistory execution_history: all history items of a certain state machine execution
-        :param bool is_root: Whether this is the root execution history
+        :param HistoryTreeCursor cursor: the cursor of the execution history
+        :return: False, if history items were removed since the last update
+        :rtype: bool
         """
-        current_parent = parent
-        execution_history_iterator = iter(execution_history)
-        for history_item in execution_history_iterator:
+        new_history_items = self._get_new_history_items(cursor)
+        if new_history_items is None:
+            return False
+
+        for history_item in new_history_items:
+            is_root = cursor.parent_node is None
+            if is_root:
+                # the StateMachineStartItem is not intended to be displayed, but merely as convenient entry point in
+                # the saved log file
+                if isinstance(history_item, StateMachineStartItem):
+                    continue
+                if not history_item.state_reference:
+                    logger.error("This must never happen! Current history_item is {}".format(history_item))
+                    return True
+                if cursor.run_number is not None:
+                    cursor.parent_node = self._add_node(cursor.container_node, history_item,
+                                                        "Run " + str(cursor.run_number))
+                else:
+                    # this is just a dummy item to have an extra parent for each branch
+                    # gives better overview in case that one of the child state is a simple execution state
+                    cursor.parent_node = self._add_node(cursor.container_node, history_item, "Concurrency Branch",
+                                                        dummy=True)
+                    is_root = False
+
+            node = None
             if isinstance(history_item, ConcurrencyItem):
-                self.insert_concurrent_execution_histories(current_parent, history_item.execution_histories)
+                for execution_history in history_item.execution_histories:
+                    branch_cursor = HistoryTreeCursor(execution_history, cursor.parent_node)
+                    self._cursors.append(branch_cursor)
+                    if not self._insert_new_history_items_of_cursor(branch_cursor):
+                        return False
 
             elif isinstance(history_item, CallItem):
-                tree_item = self.insert_history_item(current_parent, history_item, "Enter" if is_root else "Call")
-                if not tree_item:
-                    return
-                if history_item.call_type is CallType.EXECUTE:
+                last_history_item = cursor.last_history_item
+                if history_item.call_type is CallType.CONTAINER and isinstance(last_history_item, CallItem) and \
+                        last_history_item.call_type is CallType.EXECUTE and last_history_item.next is history_item:
                     # this is necessary that already the CallType.EXECUTE item opens a new hierarchy in the
                     # tree view and not the CallType.CONTAINER item
-                    next_history_item = history_item.next
-                    if next_history_item and next_history_item.call_type is CallType.CONTAINER:
-                        current_parent = tree_item
-                        self.insert_history_item(current_parent, next_history_item, "Enter")
-                        next(execution_history_iterator)  # skips the next history item in the iterator
+                    cursor.parent_node = cursor.last_node
+                    node = self._add_node(cursor.parent_node, history_item, "Enter")
+                else:
+                    node = self._add_node(cursor.parent_node, history_item, "Enter" if is_root else "Call")
 
             else:  # history_item is ReturnItem
-                if current_parent is None:
+                if cursor.parent_node is None:
                     # The reasons here can be: missing history items, items in the wrong order etc.
                     # Does not happen when using RAFCON without plugins
                     logger.error("Invalid execution history: current_parent is None")
-                    return
+                    return True
                 if history_item.call_type is CallType.EXECUTE:
-                    self.insert_history_item(current_parent, history_item, "Return")
+                    node = self._add_node(cursor.parent_node, history_item, "Return")
                 else:  # CONTAINER
-                    self.insert_history_item(current_parent, history_item, "Exit")
-                    current_parent = self.history_tree_store.iter_parent(current_parent)
+                    node = self._add_node(cursor.parent_node, history_item, "Exit")
+                    cursor.parent_node = cursor.parent_node.parent
 
-            is_root = False
+            cursor.last_history_item_id = history_item.history_item_id
+            cursor.last_history_item = history_item
+            cursor.last_node = node
+        return True
 
-    def insert_concurrent_execution_histories(self, parent, concurrent_execution_histories):
-        """Adds the child execution histories of a concurrency state.
+    def _add_node(self, parent_node, history_item, description, dummy=False):
+        """Adds a node for a history item to the tree
 
-        :param gtk.TreeItem parent: the parent to add the next history item to
-        :param list[ExecutionHistory] concurrent_execution_histories: a list of all child execution histories
-        :return:
+        The row of the node is only inserted, if the rows of the siblings are inserted, i.e. the parent row was
+        expanded before. Otherwise, a placeholder row is added to the parent row for the first child.
+
+        :param HistoryTreeNode parent_node: the parent node
+        :param HistoryItem history_item: History item to be inserted
+        :param str description: A description to be added to the entry
+        :param bool dummy: Whether this is just a dummy entry (wrapper for concurrency items)
+        :return: the new node
+        :rtype: HistoryTreeNode
+        """
+        node = HistoryTreeNode(history_item, description, dummy, parent_node)
+        if parent_node.children is None:
+            parent_node.children = []
+            if not parent_node.children_inserted and parent_node.row is not None:
+                self.history_tree_store.append(parent_node.row, ("", None, None, None))
+        parent_node.children.append(node)
+        if parent_node.children_inserted:
+            self._insert_row(node)
+        return node
+
+    def _insert_row(self, node):
+        """Inserts the row of a node into the tree store
+
+        :param HistoryTreeNode node: the node to insert the row for
         """
-        for execution_history in concurrent_execution_histories:
-            if len(execution_history) >= 1:
-                first_history_item = execution_history[0]
-                # this is just a dummy item to have an extra parent for each branch
-                # gives better overview in case that one of the child state is a simple execution state
-                tree_item = self.insert_history_item(parent, first_history_item, "Concurrency Branch", dummy=True)
-                self.insert_execution_history(tree_item, execution_history)
+        history_item = node.history_item
+        if node.parent is self._root_node:
+            # the runs are shown in reverse order
+            node.row = self.history_tree_store.prepend(None, (
+                history_item.state_reference.name + " - " + node.description, history_item, self.TOOL_TIP_TEXT, node))
+        else:
+            if global_gui_config.get_config_value("SHOW_PATH_NAMES_IN_EXECUTION_HISTORY", False):
+                label = history_item.state_reference.name + " - " + history_item.state_reference.get_path() + " - " + \
+                    node.description
+            else:
+                label = history_item.state_reference.name + " - " + node.description
+            node.row = self.history_tree_store.append(node.parent.row, (
+                label, None if node.dummy else history_item, None if node.dummy else self.TOOL_TIP_TEXT, node))
+        if node.children:
+            # placeholder row to show the expander
+            self.history_tree_store.append(node.row, ("", None, None, None))
+
+    def on_test_expand_row(self, tree_view, tree_iter, path):
+        """Inserts the rows of the children of a node, when its row is expanded for the first time"""
+        node = self.history_tree_store[tree_iter][self.NODE_STORAGE_ID]
+        if node is None or node.children_inserted:
+            return False
+        placeholder_iter = self.history_tree_store.iter_children(tree_iter)
+        node.children_inserted = True
+        for child_node in node.children or []:
+            self._insert_row(child_node)
+        if placeholder_iter is not None:
+            self.history_tree_store.remove(placeholder_iter)
+        # allow the expansion
+        return False
@@ -13,6 +13,7 @@ import gtk
 import threading
 
 from rafcon.gui.utils import wait_for_gui
+from rafcon.gui.utils.log_entries import LogEntries
 from rafcon.gui.models.config_model import ConfigModel
 from rafcon.gui.views.logging_console import LoggingConsoleView
 from rafcon.gui.controllers.utils.extended_controller import ExtendedController
@@ -33,7 +34,9 @@ class LoggingConsoleController(ExtendedController):
         super(LoggingConsoleController, self).__init__(model, view)
 
         self._lock = threading.Lock()
-        self._log_entries = []
+        # the log entries are needed to refill the text buffer, when the log level filters are changed, only the
+        # entries of the lines that can be shown are kept
+        self._log_entries = LogEntries(view.max_lines)
         self._enables = self._get_config_enables()
         log_helpers.LoggingViewHandler.add_logging_view('main', self)
 
@@ -54,7 +57,7 @@ class LoggingConsoleController(ExtendedController):
         # Store all new log entries
         if new:
             self._lock.acquire()
-            self._log_entries.append((log_level, message))
+            self._log_entries.append((log_level, message), message)
             self._lock.release()
         self.view.print_message(message, log_level)
 
@@ -65,7 +68,9 @@ class LoggingConsoleController(ExtendedController):
         # update text buffer
         self.view.clean_buffer()
 
-        for entry in self._log_entries:
+        with self._lock:
+            log_entries = list(self._log_entries)
+        for entry in log_entries:
             level = entry[0]
             message = entry[1]
             self.print_message(message, level, new=False)
@@ -82,7 +87,8 @@ class LoggingConsoleController(ExtendedController):
         self.print_filtered_buffer()
 
     def _clear_buffer(self, widget, data=None):
-        self._log_entries = []
+        with self._lock:
+            self._log_entries.clear()
         self.print_filtered_buffer()
 
     def add_clear_menu_item(self, widget, menu):
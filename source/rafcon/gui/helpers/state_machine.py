@@ -196,7 +196,11 @@ def save_state_machine(delete_old_state_machine=False, recent_opened_notificatio
     if recent_opened_notification and \
             (not previous_path == save_path or previous_path == save_path and previous_marked_dirty):
         global_runtime_config.update_recently_opened_state_machines_with(state_machine_m.state_machine)
-    state_machine_m.store_meta_data(copy_path=copy_path if as_copy else None)
+    if storage.is_packed_state_machine_path(copy_path if as_copy else sm_path):
+        # the meta data files of the previous storage location are packed together with the state machine
+        logger.warning("The changes of the meta data are not stored in packed state machines.")
+    else:
+        state_machine_m.store_meta_data(copy_path=copy_path if as_copy else None)
     logger.debug("Saved state machine and its meta data.")
     library_manager_model.state_machine_was_stored(state_machine_m, old_file_system_path)
     return True
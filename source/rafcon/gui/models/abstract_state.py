@@ -11,12 +11,14 @@
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 
 import os.path
+import threading
 from copy import copy, deepcopy
 from weakref import ref
 from gtkmvc import ModelMT, Signal
 
 from rafcon.gui.models.signals import MetaSignalMsg, Notification
 from rafcon.gui.models.meta import MetaModel
+from rafcon.gui.utils.execution_status_aggregator import execution_status_aggregator
 
 from rafcon.core.states.container_state import ContainerState
 from rafcon.core.states.library_state import LibraryState
@@ -24,6 +26,7 @@ from rafcon.core.states.state import State
 from rafcon.core.storage import storage
 
 from rafcon.utils import storage_utils, constants
+from rafcon.utils.filesystem import write_file_if_changed
 from rafcon.utils.hashable import Hashable
 from rafcon.utils.vividict import Vividict
 from rafcon.utils import log
@@ -114,6 +117,28 @@ class AbstractStateModel(MetaModel, Hashable):
     def __str__(self):
         return "Model of state: {0}".format(self.state)
 
+    def __notify_observer__(self, observer, method, *args, **kwargs):
+        """Passes execution status changes caused by the execution threads to the execution status aggregator
+
+        The aggregator passes only the latest change to the GUI thread and limits the rate of the updates. All other
+        notifications are passed as usual.
+        """
+        info = args[-1] if args else None
+        execution_triggered = isinstance(info, dict) and \
+            info.get('method_name') in constants.BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS
+        if execution_triggered and execution_status_aggregator.update_rate > 0:
+            from rafcon.gui.singleton import thread_identifier
+            if threading.currentThread().ident != thread_identifier:
+                key = (id(self), id(observer), method.__name__, 'before' in info)
+                execution_status_aggregator.add_notification(
+                    key, lambda: self._notify_observer_if_not_destroyed(observer, method, *args, **kwargs))
+                return
+        return super(AbstractStateModel, self).__notify_observer__(observer, method, *args, **kwargs)
+
+    def _notify_observer_if_not_destroyed(self, observer, method, *args, **kwargs):
+        if self.state is not None:
+            super(AbstractStateModel, self).__notify_observer__(observer, method, *args, **kwargs)
+
     def __eq__(self, other):
         if type(self) != type(other):
             return False
@@ -197,6 +222,7 @@ class AbstractStateModel(MetaModel, Hashable):
         if self.state is None:
             logger.verbose("Multiple calls of prepare destruction for {0}".format(self))
         self.destruction_signal.emit()
+        execution_status_aggregator.remove_notifications(id(self))
         try:
             self.unregister_observer(self)
         except KeyError:  # Might happen if the observer was already unregistered
@@ -510,7 +536,7 @@ class AbstractStateModel(MetaModel, Hashable):
             meta_file_path_json = os.path.join(self.state.file_system_path, storage.FILE_NAME_META_DATA)
         meta_data = deepcopy(self.meta)
         self._generate_element_meta_data(meta_data)
-        storage_utils.write_dict_to_json(meta_data, meta_file_path_json)
+        write_file_if_changed(meta_file_path_json, storage_utils.get_json_string_from_dict(meta_data))
 
     def copy_meta_data_from_state_m(self, source_state_m):
         """Dismiss current meta data and copy meta data from given state model
@@ -31,6 +31,7 @@ from rafcon.gui.models.selection import Selection
 from rafcon.gui.models.signals import MetaSignalMsg
 from rafcon.utils import log
 from rafcon.utils import storage_utils
+from rafcon.utils.filesystem import write_file_if_changed
 from rafcon.utils.hashable import Hashable
 from rafcon.utils.vividict import Vividict
 
@@ -367,6 +368,6 @@ class StateMachineModel(MetaModel, Hashable):
         else:
             meta_file_json = os.path.join(self.state_machine.file_system_path, storage.FILE_NAME_META_DATA)
 
-        storage_utils.write_dict_to_json(self.meta, meta_file_json)
+        write_file_if_changed(meta_file_json, storage_utils.get_json_string_from_dict(self.meta))
 
         self.root_state.store_meta_data(copy_path)
@@ -23,11 +23,15 @@ class MyCanvas(gaphas.canvas.Canvas):
 
     _core_view_map = None
     _model_view_map = None
+    _id_view_map = None
+    _view_id_map = None
 
     def __init__(self):
         super(MyCanvas, self).__init__()
         self._core_view_map = {}
         self._model_view_map = {}
+        self._id_view_map = {}
+        self._view_id_map = {}
 
     def _add_view_maps(self, view):
         model = view.model
@@ -37,6 +41,7 @@ class MyCanvas(gaphas.canvas.Canvas):
             raise RuntimeError("Model is already existing in _model_view_map")
         self._core_view_map[model.core_element] = view
         self._model_view_map[model] = view
+        self._add_id_view_map(view, model)
 
     def _remove_view_maps(self, view):
         model = view.model
@@ -44,6 +49,32 @@ class MyCanvas(gaphas.canvas.Canvas):
         # Do not retrieve core element from model, as the model could have already been destroyed
         core_element = self._core_view_map.keys()[self._core_view_map.values().index(view)]
         del self._core_view_map[core_element]
+        self._remove_id_view_map(view)
+
+    def _add_id_view_map(self, view, model):
+        from rafcon.gui.mygaphas.items.state import StateView
+        from rafcon.gui.mygaphas.items.connection import DataFlowView, TransitionView
+        if isinstance(view, StateView):
+            key = StateView, model.state.state_id
+        elif isinstance(view, TransitionView):
+            key = TransitionView, model.transition.transition_id
+        elif isinstance(view, DataFlowView):
+            key = DataFlowView, model.data_flow.data_flow_id
+        else:
+            return
+        # Transition and data flow ids are only unique within their parent state
+        self._id_view_map.setdefault(key, []).append(view)
+        self._view_id_map[view] = key
+
+    def _remove_id_view_map(self, view):
+        # Do not retrieve the id from the model, as the model could have already been destroyed
+        key = self._view_id_map.pop(view, None)
+        if key is None:
+            return
+        views = self._id_view_map[key]
+        views.remove(view)
+        if not views:
+            del self._id_view_map[key]
 
     def add(self, item, parent=None, index=None):
         from rafcon.gui.mygaphas.items.state import StateView
@@ -65,6 +96,8 @@ class MyCanvas(gaphas.canvas.Canvas):
         # The LibraryState and its state_copy share the same port core_elements
         if not port_v.parent.is_root_state_of_library:
             self._add_view_maps(port_v)
+        # Let the views update their port index
+        self.request_update(port_v.parent, matrix=False)
 
     def remove_port(self, port_v):
         # The LibraryState and its state_copy share the same port core_elements
@@ -78,6 +111,8 @@ class MyCanvas(gaphas.canvas.Canvas):
         del self._model_view_map[old_model]
         self._core_view_map[new_model.core_element] = view
         self._model_view_map[new_model] = view
+        self._remove_id_view_map(view)
+        self._add_id_view_map(view, new_model)
 
     def update_root_items(self):
         for root_item in self.get_root_items():
@@ -118,21 +153,9 @@ class MyCanvas(gaphas.canvas.Canvas):
         :param gaphas.item.Item parent_item: Restrict the search to this parent item
         :return: The view for the given id or None if not found
         """
-        from rafcon.gui.mygaphas.items.state import StateView
-        from rafcon.gui.mygaphas.items.connection import DataFlowView, TransitionView
-        if parent_item is None:
-            items = self.get_all_items()
-        else:
-            items = self.get_children(parent_item)
-        for item in items:
-            if view_class is StateView and isinstance(item, StateView) and item.model.state.state_id == element_id:
-                return item
-            if view_class is TransitionView and isinstance(item, TransitionView) and \
-                    item.model.transition.transition_id == element_id:
-                return item
-            if view_class is DataFlowView and isinstance(item, DataFlowView) and \
-                    item.model.data_flow.data_flow_id == element_id:
-                return item
+        for view in self._id_view_map.get((view_class, element_id), ()):
+            if parent_item is None or self.get_parent(view) is parent_item:
+                return view
         return None
 
     def wait_for_update(self, trigger_update=False):
@@ -184,7 +184,20 @@ class PerpLine(Line):
         if self.parent and self.parent.moving:
             return
 
+        if not context.draw_all:
+            # Do not draw connections outside of the view
+            if not self._is_in_view([handle.pos for handle in self._handles]):
+                return
+            # Within states that are too small for details, only one line is drawn between two states
+            parent_state_v = self.get_parent_state_v()
+            if self.from_port and self.to_port and parent_state_v and not parent_state_v.show_details():
+                self._draw_aggregated(context)
+                return
+
         def draw_line_end(pos, angle, port, draw):
+            # Do not draw line ends outside of the view
+            if not context.draw_all and not self._is_in_view([pos], self._head_offset(port) + self._head_length(port)):
+                return
             cr.save()
             cr.translate(*pos)
             cr.rotate(angle)
@@ -218,6 +231,40 @@ class PerpLine(Line):
                           global_gui_config.get_config_value("SHOW_NAMES_ON_DATA_FLOWS", default=True)):
             self._draw_name(context)
 
+    def _draw_aggregated(self, context):
+        """Draws the connection as straight line without ends and name
+
+        Of all connections of the same type between the same two states, only the first one is drawn.
+        """
+        connected_states = self.__class__, self.from_port.parent, self.to_port.parent
+        if connected_states in self.view.aggregated_connections:
+            return
+        self.view.aggregated_connections.add(connected_states)
+
+        cr = context.cairo
+        cr.set_line_cap(LINE_CAP_ROUND)
+        cr.set_line_width(self._calc_line_width())
+        cr.move_to(*self._handles[0].pos)
+        cr.line_to(*self._handles[-1].pos)
+        cr.set_source_rgba(*self._line_color)
+        cr.stroke()
+
+    def _is_in_view(self, points, margin=0.):
+        """Checks whether the bounding box of the given points overlaps with the visible area of the view
+
+        :param points: The points in item coordinates
+        :param float margin: Distance in item coordinates by which the bounding box is extended
+        :return: Whether the bounding box is (partly) visible
+        """
+        view = self.view
+        i2v = view.get_matrix_i2v(self)
+        view_points = [i2v.transform_point(*point) for point in points]
+        view_margin = abs(i2v.transform_distance(margin, 0)[0])
+        x_values = [point[0] for point in view_points]
+        y_values = [point[1] for point in view_points]
+        return max(x_values) + view_margin >= 0 and min(x_values) - view_margin <= view.allocation[2] and \
+            max(y_values) + view_margin >= 0 and min(y_values) - view_margin <= view.allocation[3]
+
     def _draw_name(self, context):
         c = context.cairo
 
@@ -242,6 +289,10 @@ class PerpLine(Line):
             else:
                 angle = 0
 
+        # Do not draw names outside of the view
+        if not context.draw_all and not self._is_in_view([(cx, cy)], max(self._last_label_size)):
+            return
+
         c.set_antialias(ANTIALIAS_SUBPIXEL)
 
         parameters = {
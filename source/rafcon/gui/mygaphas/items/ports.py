@@ -298,7 +298,9 @@ class PortView(object):
             # Copy image surface to current cairo context
             self._port_image_cache.copy_image_to_context(context.cairo, upper_left_corner, zoom=current_zoom)
 
-        if self.name and self.has_label():
+        # Port names are only drawn if the port is large enough
+        if self.name and self.has_label() and \
+                (view_length >= constants.MINIMUM_PORT_NAME_SIZE_FOR_DISPLAY or context.draw_all):
             self.draw_name(context, transparency, value)
 
         if self.is_selected() or self.handle is view.hovered_handle or context.draw_all:
@@ -352,9 +354,6 @@ class PortView(object):
             relative_pos = label_pos[0] - position[0], label_pos[1] - position[1]
             label_size = extents[2] - extents[0], extents[3] - extents[1]
 
-            # print label_size[0], self.name, self.parent.model.state.name
-            # if label_size[0] < constants.MINIMUM_PORT_NAME_SIZE_FOR_DISPLAY and self.parent:
-            #     return
             self._last_label_relative_pos = relative_pos
             self._last_label_size = label_size
 
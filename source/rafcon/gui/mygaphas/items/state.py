@@ -319,6 +319,16 @@ class StateView(Element):
         # TODO: Implement transparency logic here (e.g. for different viewing modes)
         return 0.
 
+    def show_details(self):
+        """Checks whether the state is large enough on the screen to draw its ports, name and symbols
+
+        Smaller states are only drawn as box and the connections within them are aggregated.
+
+        :return: Whether the details of the state are drawn
+        """
+        view_width, view_height = self.view.get_matrix_i2v(self).transform_distance(self.width, self.height)
+        return min(view_width, view_height) >= constants.MINIMUM_STATE_SIZE_FOR_DETAILS
+
     def child_state_views(self):
         for child in self.canvas.get_children(self):
             if isinstance(child, StateView):
@@ -400,6 +410,7 @@ class StateView(Element):
         if min(view_width, view_height) < constants.MINIMUM_STATE_SIZE_FOR_DISPLAY and self.parent and not \
                 context.draw_all:
             return
+        show_details = min(view_width, view_height) >= constants.MINIMUM_STATE_SIZE_FOR_DETAILS or context.draw_all
 
         c = context.cairo
         nw = self._handles[NW].pos
@@ -460,6 +471,10 @@ class StateView(Element):
             # Copy image surface to current cairo context
             self._image_cache.copy_image_to_context(context.cairo, upper_left_corner, zoom=current_zoom)
 
+        # Small states are drawn as box only
+        if not show_details:
+            return
+
         self._income.draw(context, self)
 
         for outcome_v in self._outcomes:
@@ -954,6 +969,8 @@ class NameView(Element):
         view_width, view_height = self.view.get_matrix_i2v(self).transform_distance(width, height)
         if min(view_width, view_height) < constants.MINIMUM_NAME_SIZE_FOR_DISPLAY and not context.draw_all:
             return
+        if not context.draw_all and not self.parent.show_details():
+            return
         font_transparency = self.transparency
 
         c = context.cairo
@@ -130,6 +130,17 @@ class LineSegmentPainter(ItemPaintHovered):
             cr.restore()
 
 
+class ItemPainter(gaphas.painter.ItemPainter):
+    """
+    This painter draws the items and resets the aggregated connections
+    before, so that each aggregated connection is drawn once per painting.
+    """
+
+    def paint(self, context):
+        self.view.aggregated_connections.clear()
+        super(ItemPainter, self).paint(context)
+
+
 class BoundingBoxPainter(gaphas.painter.BoundingBoxPainter):
     """
     This specific case of an ItemPainter is used to calculate the bounding
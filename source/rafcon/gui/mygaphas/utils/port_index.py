@@ -0,0 +1,97 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+from itertools import product
+from math import ceil, floor, log
+
+
+class PortIndex(object):
+    """Spatial index of ports, used to find the ports close to a position
+
+    The ports are stored in a hierarchical grid. Each port is stored in the grid level whose cell size is the smallest
+    power of two not smaller than the port, in the cell containing the center of the port. Thus, the large ports of
+    high level states as well as the small ports of deeply nested states are found by checking only a few cells.
+    """
+
+    MIN_LEVEL = -20
+
+    def __init__(self):
+        self.clear()
+
+    def __contains__(self, item):
+        return item in self._item_entries
+
+    def clear(self):
+        """Removes all ports from the index"""
+        self._levels = {}
+        self._item_entries = {}
+
+    def add(self, item, ports):
+        """Adds the ports of an item, replacing the previously added ports of the item
+
+        :param item: The item the ports belong to
+        :param ports: List of tuples with a port and its bounds (x0, y0, x1, y1)
+        """
+        self.remove(item)
+        entries = []
+        for port, bounds in ports:
+            x0, y0, x1, y1 = bounds
+            level = self._get_level(max(x1 - x0, y1 - y0))
+            cell_size = 2. ** level
+            cell = int(floor((x0 + x1) / 2. / cell_size)), int(floor((y0 + y1) / 2. / cell_size))
+            entry = item, port, bounds
+            self._levels.setdefault(level, {}).setdefault(cell, []).append(entry)
+            entries.append((level, cell, entry))
+        self._item_entries[item] = entries
+
+    def remove(self, item):
+        """Removes all ports of an item
+
+        :param item: The item the ports belong to
+        """
+        for level, cell, entry in self._item_entries.pop(item, ()):
+            cells = self._levels[level]
+            cells[cell].remove(entry)
+            if not cells[cell]:
+                del cells[cell]
+                if not cells:
+                    del self._levels[level]
+
+    def find_intersect(self, rect):
+        """Returns the ports whose bounds intersect the given rectangle
+
+        :param rect: The rectangle (x, y, width, height)
+        :return: List of tuples with the item and the port
+        """
+        x0, y0 = rect[0], rect[1]
+        x1, y1 = x0 + rect[2], y0 + rect[3]
+        found_ports = []
+        for level, cells in self._levels.iteritems():
+            cell_size = 2. ** level
+            # A port reaches at most half a cell size beyond the cell containing its center
+            cell_x_range = int(floor((x0 - cell_size / 2.) / cell_size)), int(floor((x1 + cell_size / 2.) / cell_size))
+            cell_y_range = int(floor((y0 - cell_size / 2.) / cell_size)), int(floor((y1 + cell_size / 2.) / cell_size))
+            number_of_cells = (cell_x_range[1] - cell_x_range[0] + 1) * (cell_y_range[1] - cell_y_range[0] + 1)
+            # If the rectangle covers more cells than are occupied, it is cheaper to check the occupied cells
+            if number_of_cells > len(cells):
+                candidate_cells = [entries for cell, entries in cells.iteritems()
+                                   if cell_x_range[0] <= cell[0] <= cell_x_range[1] and
+                                   cell_y_range[0] <= cell[1] <= cell_y_range[1]]
+            else:
+                candidate_cells = [cells[cell] for cell in product(range(cell_x_range[0], cell_x_range[1] + 1),
+                                                                   range(cell_y_range[0], cell_y_range[1] + 1))
+                                   if cell in cells]
+            for entries in candidate_cells:
+                for item, port, bounds in entries:
+                    if bounds[0] <= x1 and bounds[2] >= x0 and bounds[1] <= y1 and bounds[3] >= y0:
+                        found_ports.append((item, port))
+        return found_ports
+
+    def _get_level(self, size):
+        if size <= 0:
+            return self.MIN_LEVEL
+        return max(self.MIN_LEVEL, int(ceil(log(size, 2))))
@@ -17,9 +17,12 @@ from gtkmvc.observer import Observer
 
 from gaphas.view import GtkView
 from gaphas.item import Element
+from gaphas.matrix import Matrix
 
+from rafcon.gui.mygaphas.items.state import StateView
 from rafcon.gui.mygaphas.painter import BoundingBoxPainter
 from rafcon.gui.mygaphas.utils.cache.value_cache import ValueCache
+from rafcon.gui.mygaphas.utils.port_index import PortIndex
 
 
 
@@ -27,12 +30,15 @@ class ExtendedGtkView(GtkView, Observer):
 
     hovered_handle = None
     _selection = None
+    _port_index = None
 
     def __init__(self, graphical_editor_v, state_machine_m, *args):
         GtkView.__init__(self, *args)
         Observer.__init__(self)
         self._selection = state_machine_m.selection
         self.value_cache = ValueCache()
+        # Connections drawn in aggregated form during the current painting, see PerpLine._draw_aggregated
+        self.aggregated_connections = set()
         self.observe_model(self._selection)
         self.observe_model(state_machine_m.root_state)
         self._bounding_box_painter = BoundingBoxPainter(self)
@@ -71,6 +77,8 @@ class ExtendedGtkView(GtkView, Observer):
         """
         # Method had to be inherited, as the base method has a bug:
         # It misses the statement max_dist = d
+        # In addition, the ports are looked up in the port index instead of checking all ports of all items in the
+        # rectangle. Only the ports of states are considered, as connections cannot be connected to connections.
         v2i = self.get_matrix_v2i
         vx, vy = vpos
 
@@ -79,12 +87,24 @@ class ExtendedGtkView(GtkView, Observer):
         glue_pos = None
         item = None
 
-        rect = (vx - distance, vy - distance, distance * 2, distance * 2)
-        items = self.get_items_in_rectangle(rect, reverse=True)
-        for i in items:
+        # The glue distance is compared in item coordinates, the rectangle is defined in view coordinates. Thus, the
+        # larger of both distances in canvas coordinates is searched for ports.
+        v2c = Matrix(*self._matrix)
+        v2c.invert()
+        cx, cy = v2c.transform_point(vx, vy)
+        search_distance = max(distance, distance / self.get_zoom_factor())
+        rect = (cx - search_distance, cy - search_distance, search_distance * 2, search_distance * 2)
+        self._update_port_index()
+        ports_of_items = {}
+        for i, p in self._port_index.find_intersect(rect):
+            ports_of_items.setdefault(i, set()).add(p)
+
+        for i in self.canvas.sort(ports_of_items.keys(), reverse=True):
             if exclude and i in exclude:
                 continue
             for p in i.ports():
+                if p not in ports_of_items[i]:
+                    continue
                 if not p.connectable:
                     continue
                 if exclude_port_fun and exclude_port_fun(p):
@@ -106,6 +126,49 @@ class ExtendedGtkView(GtkView, Observer):
 
         return item, port, glue_pos
 
+    def request_update(self, items, matrix_only_items=(), removed_items=()):
+        """Extends the base class method to update the port index for the changed items
+
+        The ports of the changed items are indexed again before the next port lookup.
+        """
+        if self._port_index is not None:
+            self._port_index_dirty_items.update(items)
+            self._port_index_dirty_items.update(matrix_only_items)
+            for removed_item in removed_items:
+                self._port_index_dirty_items.discard(removed_item)
+                self._port_index.remove(removed_item)
+        super(ExtendedGtkView, self).request_update(items, matrix_only_items, removed_items)
+
+    def _update_port_index(self):
+        """Indexes the ports of all items changed since the last update
+
+        The index is created with the first port lookup and recreated if the canvas changed.
+        """
+        if self._port_index is None or self._port_index_canvas is not self.canvas:
+            self._port_index = PortIndex()
+            self._port_index_canvas = self.canvas
+            self._port_index_dirty_items = set(self.canvas.get_all_items())
+
+        for item in self._port_index_dirty_items:
+            if isinstance(item, StateView) and item.canvas is self.canvas:
+                self._port_index.add(item, [(port, self._get_port_bounds(item, port)) for port in item.ports()])
+            else:
+                self._port_index.remove(item)
+        self._port_index_dirty_items.clear()
+
+    def _get_port_bounds(self, item, port):
+        """Returns the bounds of a port in canvas coordinates
+
+        :param item: The item the port belongs to
+        :param port: The port
+        :return: The bounds (x0, y0, x1, y1) of the port
+        """
+        i2c = self.canvas.get_matrix_i2c(item)
+        x, y = i2c.transform_point(*port.point)
+        width, height = i2c.transform_distance(getattr(port, "width", 0.), getattr(port, "height", 0.))
+        width, height = abs(width), abs(height)
+        return x - width / 2., y - height / 2., x + width / 2., y + height / 2.
+
     def get_item_at_point_exclude(self, pos, selected=True, exclude=None):
         """
         Return the topmost item located at ``pos`` (x, y).
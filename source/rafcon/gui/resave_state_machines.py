@@ -19,9 +19,11 @@ import threading
 import time
 
 from rafcon.utils import log
+from rafcon.utils.filesystem import write_file
 from rafcon.gui.utils import wait_for_gui
 
 from rafcon.core.config import global_config
+from rafcon.core.storage import storage
 import rafcon.core.singleton as core_singletons
 
 from rafcon.gui.controllers.main_window import MainWindowController
@@ -161,25 +163,67 @@ def convert(config_path, source_path, target_path=None):
     logger.debug("Conversion done")
 
 
-def convert_libraries_in_path(config_path, lib_path, target_path=None):
+def convert_packed(config_path, source_path, target_path, packed):
+    """Converts a state machine from or into the packed single file format
+
+    The conversion does not need the GUI, as the meta data files are packed and unpacked together with the state
+    machine.
+
+    :param config_path: the path of the core config
+    :param source_path: the path of the state machine folder or archive file
+    :param target_path: the path of the converted state machine
+    :param bool packed: Whether to pack the state machine into a single archive file
+    """
+    global_config.load(path=config_path)
+    core_singletons.library_manager.initialize()
+    state_machine = storage.load_state_machine_from_path(source_path)
+    meta_data_files = {}
+    if storage.is_packed_state_machine_path(source_path):
+        meta_data_files = {name: content for name, content in
+                           storage.read_packed_state_machine_files(source_path).iteritems()
+                           if os.path.basename(name) == storage.FILE_NAME_META_DATA}
+    storage.save_state_machine_to_path(state_machine, target_path, packed=packed)
+    for name, content in meta_data_files.iteritems():
+        if not packed and os.path.isdir(os.path.join(target_path, os.path.dirname(name))):
+            write_file(os.path.join(target_path, name), content)
+    logger.info("Converted {0} -> {1}".format(source_path, target_path))
+
+
+def get_target_path(target_path, packed):
+    """Adds or removes the file extension of packed state machines to or from the target path"""
+    if target_path.endswith(storage.PACKED_STATE_MACHINE_EXTENSION):
+        target_path = target_path[:-len(storage.PACKED_STATE_MACHINE_EXTENSION)]
+    return target_path + storage.PACKED_STATE_MACHINE_EXTENSION if packed else target_path
+
+
+def convert_libraries_in_path(config_path, lib_path, target_path=None, packed=None):
     """
     This function resaves all libraries found at the spcified path
     :param lib_path: the path to look for libraries
+    :param bool packed: Whether to convert the libraries into (True) or from (False) the packed single file format,
+        None to resave them in the same format using the GUI
     :return:
     """
     for lib in os.listdir(lib_path):
-        if os.path.isdir(os.path.join(lib_path, lib)) and not '.' == lib[0]:
+        if packed is not None and storage.is_packed_state_machine_path(os.path.join(lib_path, lib)):
+            convert_packed(config_path, os.path.join(lib_path, lib),
+                           get_target_path(os.path.join(target_path or lib_path, lib), packed), packed)
+        elif os.path.isdir(os.path.join(lib_path, lib)) and not '.' == lib[0]:
             if os.path.exists(os.path.join(os.path.join(lib_path, lib), "statemachine.yaml")) or \
                     os.path.exists(os.path.join(os.path.join(lib_path, lib), "statemachine.json")):
-                if not target_path:
+                if packed is not None:
+                    convert_packed(config_path, os.path.join(lib_path, lib),
+                                   get_target_path(os.path.join(target_path or lib_path, lib), packed), packed)
+                elif not target_path:
                     convert(config_path, os.path.join(lib_path, lib))
                 else:
                     convert(config_path, os.path.join(lib_path, lib), os.path.join(target_path, lib))
             else:
                 if not target_path:
-                    convert_libraries_in_path(config_path, os.path.join(lib_path, lib))
+                    convert_libraries_in_path(config_path, os.path.join(lib_path, lib), packed=packed)
                 else:
-                    convert_libraries_in_path(config_path, os.path.join(lib_path, lib), os.path.join(target_path, lib))
+                    convert_libraries_in_path(config_path, os.path.join(lib_path, lib), os.path.join(target_path, lib),
+                                              packed)
         else:
             if os.path.isdir(os.path.join(lib_path, lib)) and '.' == lib[0]:
                 logger.debug("lib_root_path/lib_path .*-folder are ignored if within lib_path, "
@@ -188,14 +232,17 @@ def convert_libraries_in_path(config_path, lib_path, target_path=None):
 
 if __name__ == '__main__':
     import sys
-    if not len(sys.argv) >= 3:
+    arguments = [argument for argument in sys.argv if argument not in ("--pack", "--unpack")]
+    packed = True if "--pack" in sys.argv else False if "--unpack" in sys.argv else None
+    if not len(arguments) >= 3:
         logger.error("Wrong number of arguments")
-        logger.error("Usage: resave_state_machine.py config_path library_folder_to_convert optional_target_folder")
+        logger.error("Usage: resave_state_machine.py [--pack|--unpack] config_path library_folder_to_convert "
+                     "optional_target_folder")
         exit(0)
-    config_path = sys.argv[1]
-    folder_to_convert = sys.argv[2]
+    config_path = arguments[1]
+    folder_to_convert = arguments[2]
     target_path = None
-    if len(sys.argv) >= 4:
-        target_path = sys.argv[3]
+    if len(arguments) >= 4:
+        target_path = arguments[3]
     logger.info("folder to convert: " + folder_to_convert)
-    convert_libraries_in_path(config_path, folder_to_convert, target_path)
+    convert_libraries_in_path(config_path, folder_to_convert, target_path, packed)
@@ -62,9 +62,11 @@ RECURSIVE_RESIZE_MODIFIER = gtk.gdk.CONTROL_MASK
 MAX_VALUE_LABEL_TEXT_LENGTH = 7
 
 MINIMUM_STATE_SIZE_FOR_DISPLAY = 5
+# Below this size (in pixel), states are drawn as box only and the connections within them are aggregated
+MINIMUM_STATE_SIZE_FOR_DETAILS = 30
 MINIMUM_NAME_SIZE_FOR_DISPLAY = 10
 MINIMUM_PORT_SIZE_FOR_DISPLAY = 4
-MINIMUM_PORT_NAME_SIZE_FOR_DISPLAY = 4
+MINIMUM_PORT_NAME_SIZE_FOR_DISPLAY = 8
 
 GRID_SIZE = 10
 BORDER_WIDTH_STATE_SIZE_FACTOR = 25.
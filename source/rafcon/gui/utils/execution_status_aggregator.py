@@ -0,0 +1,80 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_status_aggregator
+   :synopsis: Passes the execution status changes of states to the GUI thread with a limited rate
+
+"""
+
+import threading
+from collections import OrderedDict
+
+import glib
+
+from rafcon.gui.config import global_gui_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+class ExecutionStatusAggregator(object):
+    """Collects notifications about execution status changes of states and passes them to the GUI thread
+
+    The execution engine changes the execution status of states from its threads. Instead of passing each change to
+    the GUI thread on its own, the notifications are collected and passed at most EXECUTION_STATUS_UPDATE_RATE times
+    per second. Of several notifications with the same key, only the latest one is passed, as only the current
+    execution status is shown by the GUI.
+    """
+
+    def __init__(self):
+        self._pending_notifications = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+
+    @property
+    def update_rate(self):
+        """The maximum number of updates per second, 0 if the notifications are to be passed one by one"""
+        return global_gui_config.get_config_value("EXECUTION_STATUS_UPDATE_RATE", 30)
+
+    def add_notification(self, key, notify):
+        """Adds a notification to be passed to the GUI thread with the next update
+
+        :param tuple key: identifies the notification, a pending notification with the same key is replaced
+        :param notify: the function to be called in the GUI thread
+        """
+        with self._lock:
+            self._pending_notifications[key] = notify
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        glib.timeout_add(int(1000. / self.update_rate), self._flush)
+
+    def remove_notifications(self, model_id):
+        """Drops the pending notifications of a model, e.g. if the model is destroyed
+
+        :param int model_id: the id of the model, the first element of the keys of its notifications
+        """
+        with self._lock:
+            for key in [key for key in self._pending_notifications if key[0] == model_id]:
+                del self._pending_notifications[key]
+
+    def _flush(self):
+        with self._lock:
+            pending_notifications = self._pending_notifications
+            self._pending_notifications = OrderedDict()
+            self._flush_scheduled = False
+        for notify in pending_notifications.itervalues():
+            try:
+                notify()
+            except Exception:
+                logger.exception("Error while passing an execution status change to the GUI")
+        # do not repeat the timeout
+        return False
+
+
+execution_status_aggregator = ExecutionStatusAggregator()
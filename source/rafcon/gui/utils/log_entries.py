@@ -0,0 +1,69 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: log_entries
+   :synopsis: A queue of log entries bounded by the number of lines shown in the logging console
+
+"""
+
+from collections import deque
+
+
+def get_number_of_lines(message):
+    """Returns the number of lines a message occupies in the logging console
+
+    :param str message: the message
+    :rtype: int
+    """
+    return message.strip().count('\n') + 1
+
+
+class LogEntries(object):
+    """A queue of log entries, which only keeps the entries of the last lines
+
+    The logging console limits its text buffer to a number of lines, while a single log message, e.g. a traceback,
+    can span several lines. The queue counts the lines of its entries in the same unit, so that it keeps exactly the
+    entries that can be shown. The oldest entries are dropped, as soon as the entries exceed the maximum number of
+    lines. The last entry is always kept, even if it exceeds the maximum number of lines on its own.
+
+    :ivar int max_lines: the maximum number of lines of all entries, None for no limit
+    """
+
+    def __init__(self, max_lines=None):
+        self.max_lines = max_lines
+        # entries with their number of lines
+        self._entries = deque()
+        self._number_of_lines = 0
+
+    def __iter__(self):
+        return (entry for entry, _ in self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def number_of_lines(self):
+        return self._number_of_lines
+
+    def append(self, entry, message):
+        """Appends an entry and drops the oldest entries exceeding the maximum number of lines
+
+        :param entry: the entry
+        :param str message: the message of the entry, which determines the number of lines of the entry
+        """
+        number_of_lines = get_number_of_lines(message)
+        self._entries.append((entry, number_of_lines))
+        self._number_of_lines += number_of_lines
+        if self.max_lines is None:
+            return
+        while self._number_of_lines > self.max_lines and len(self._entries) > 1:
+            self._number_of_lines -= self._entries.popleft()[1]
+
+    def clear(self):
+        self._entries.clear()
+        self._number_of_lines = 0
@@ -22,7 +22,7 @@ from gaphas import painter
 from rafcon.gui.mygaphas.view import ExtendedGtkView
 from rafcon.gui.mygaphas.tools import HoverItemTool, ConnectionCreationTool, ConnectionModificationTool, \
     MoveItemTool, MultiSelectionTool, RightClickTool, MoveHandleTool, ZoomTool, PanTool, ToolChain
-from rafcon.gui.mygaphas.painter import HoveredItemPainter
+from rafcon.gui.mygaphas.painter import ItemPainter, HoveredItemPainter
 
 from rafcon.gui.config import global_gui_config
 from rafcon.utils import log
@@ -57,7 +57,7 @@ class GraphicalEditorView(View, gobject.GObject):
             append(MultiSelectionTool()). \
             append(RightClickTool())
         self.editor.painter = painter.PainterChain(). \
-            append(painter.ItemPainter()). \
+            append(ItemPainter()). \
             append(HoveredItemPainter()). \
             append(painter.FocusedItemPainter()). \
             append(painter.ToolPainter())
@@ -16,6 +16,7 @@ import gtk
 import threading
 from gtkmvc import View
 import glib
+from rafcon.gui.utils.log_entries import LogEntries
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
@@ -51,6 +52,11 @@ class LoggingConsoleView(View):
 
         from rafcon.gui.config import global_gui_config
         self.logging_priority = global_gui_config.get_config_value("LOGGING_CONSOLE_GTK_PRIORITY", glib.PRIORITY_LOW)
+        self.max_lines = global_gui_config.get_config_value("LOGGING_CONSOLE_MAX_LINES", 10000) or None
+
+        # messages waiting to be printed with their tag, only the messages of the last max_lines lines can be shown
+        self._pending_messages = LogEntries(self.max_lines)
+        self._flush_scheduled = False
 
         self._stored_line_number = None
         self._stored_line_offset = None
@@ -58,31 +64,78 @@ class LoggingConsoleView(View):
         self._stored_relative_lines = None
 
     def clean_buffer(self):
+        with self._lock:
+            self._pending_messages.clear()
         self.text_view.set_buffer(self.filtered_buffer)
 
         start, end = self.filtered_buffer.get_bounds()
         self.filtered_buffer.delete(start, end)
 
     def print_message(self, message, log_level):
-        self._lock.acquire()
-        if log_level <= log.logging.VERBOSE and self._enables.get('VERBOSE', False):
-            glib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "set_debug_color",
-                          priority=glib.PRIORITY_LOW)
-        if log.logging.VERBOSE < log_level <= log.logging.DEBUG and self._enables.get('DEBUG', True):
-            glib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "set_debug_color",
-                          priority=self.logging_priority)
-        elif log.logging.DEBUG < log_level <= log.logging.INFO and self._enables.get('INFO', True):
-            glib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "set_info_color",
-                          priority=self.logging_priority)
-        elif log.logging.INFO < log_level <= log.logging.WARNING and self._enables.get('WARNING', True):
-            glib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "set_warning_color",
-                          priority=self.logging_priority)
-        elif log.logging.WARNING < log_level and self._enables.get('ERROR', True):
-            glib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "set_error_color",
-                          priority=self.logging_priority)
-        self._lock.release()
-
-    def print_to_text_view(self, text, text_buf, use_tag=None):
+        """Queues a message to be printed with the next batch of messages
+
+        Messages of disabled log levels are dropped right away. The queued messages are printed by a single idle
+        callback in the GUI thread.
+
+        :param str message: the message to be printed
+        :param int log_level: the log level of the message
+        """
+        if log_level <= log.logging.VERBOSE:
+            if not self._enables.get('VERBOSE', False):
+                return
+            use_tag = "set_debug_color"
+        elif log_level <= log.logging.DEBUG:
+            if not self._enables.get('DEBUG', True):
+                return
+            use_tag = "set_debug_color"
+        elif log_level <= log.logging.INFO:
+            if not self._enables.get('INFO', True):
+                return
+            use_tag = "set_info_color"
+        elif log_level <= log.logging.WARNING:
+            if not self._enables.get('WARNING', True):
+                return
+            use_tag = "set_warning_color"
+        else:
+            if not self._enables.get('ERROR', True):
+                return
+            use_tag = "set_error_color"
+
+        with self._lock:
+            self._pending_messages.append((message, use_tag), message)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        glib.idle_add(self._print_pending_messages, priority=self.logging_priority)
+
+    def _print_pending_messages(self):
+        with self._lock:
+            pending_messages = list(self._pending_messages)
+            self._pending_messages.clear()
+            self._flush_scheduled = False
+        if not pending_messages:
+            return False
+
+        text_buf = self.filtered_buffer
+        for message, use_tag in pending_messages:
+            self.print_to_text_view(message, text_buf, use_tag, scroll=False)
+        self._limit_number_of_lines(text_buf)
+
+        if not self.quit_flag and self._enables['CONSOLE_FOLLOW_LOGGING']:
+            self.scroll_to_cursor_onscreen()
+        # do not repeat the idle callback
+        return False
+
+    def _limit_number_of_lines(self, text_buf):
+        """Removes the oldest lines exceeding the maximum number of lines from the text buffer"""
+        if self.max_lines is None:
+            return
+        # the last line is the empty line after the last message
+        number_of_exceeding_lines = text_buf.get_line_count() - 1 - self.max_lines
+        if number_of_exceeding_lines > 0:
+            text_buf.delete(text_buf.get_start_iter(), text_buf.get_iter_at_line(number_of_exceeding_lines))
+
+    def print_to_text_view(self, text, text_buf, use_tag=None, scroll=True):
         time, source, message = self.split_text(text)
         text_buf.insert_with_tags_by_name(text_buf.get_end_iter(), time + " ", "set_gray_text")
         text_buf.insert_with_tags_by_name(text_buf.get_end_iter(), source + ": ", "set_white_text")
@@ -94,7 +147,7 @@ class LoggingConsoleView(View):
         else:
             text_buf.insert(text_buf.get_end_iter(), message + "\n")
 
-        if not self.quit_flag and self._enables['CONSOLE_FOLLOW_LOGGING']:
+        if scroll and not self.quit_flag and self._enables['CONSOLE_FOLLOW_LOGGING']:
             self.scroll_to_cursor_onscreen()
 
     @staticmethod
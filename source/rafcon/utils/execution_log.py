@@ -11,14 +11,133 @@
 # Sebastian Riedel <sebastian.riedel@dlr.de>
 # ried_sa <Sebastian.Riedel@dlr.de>
 
+import os
 import shelve
 import json
 import pandas as pd
 import pickle
+from collections import Mapping, OrderedDict, namedtuple
 
 from rafcon.utils import log
+from rafcon.utils import record_file
+from rafcon.utils.record_file import BINARY_LOG_INDEX_FILE, BINARY_LOG_SEGMENT_FILE
 logger = log.get_logger(__name__)
 
+# the separator of the state ids in the path of a history item, see rafcon.core.states.state.PATH_SEPARATOR
+PATH_SEPARATOR = '/'
+
+# an entry of the index of a binary execution log
+LogIndexEntry = namedtuple('LogIndexEntry', ['history_item_id', 'segment', 'offset', 'run_id', 'path', 'timestamp',
+                                             'item_type'])
+
+
+class BinaryExecutionLog(Mapping):
+    """Read access to an execution log written in the binary format
+
+    The log behaves like the opened shelve of an execution log, i.e. like a dict mapping the history_item_id to the
+    dictionary of the history item. Thus, it can be passed to all functions of this module. Only the index of the log
+    is held in memory, the items are read from the disk when being accessed.
+
+    :ivar str log_path: the path of the log directory
+    """
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self._entries = OrderedDict()
+        self._index_file = open(os.path.join(log_path, BINARY_LOG_INDEX_FILE), 'rb')
+        self._index_offset = None
+        self._segment_files = {}
+        self.refresh()
+
+    def refresh(self):
+        """Reads the index entries added since the last call, which allows following a log that is still written
+
+        :return: the number of new entries
+        :rtype: int
+        """
+        number_of_entries = len(self._entries)
+        for offset, data in record_file.iter_raw_records(self._index_file, self._index_offset):
+            entry = LogIndexEntry(*pickle.loads(data))
+            self._entries[entry.history_item_id] = entry
+            self._index_offset = offset + record_file.record_size(data)
+        return len(self._entries) - number_of_entries
+
+    def _get_segment_file(self, segment_number):
+        if segment_number not in self._segment_files:
+            self._segment_files[segment_number] = open(os.path.join(self.log_path,
+                                                                    BINARY_LOG_SEGMENT_FILE.format(segment_number)),
+                                                       'rb')
+        return self._segment_files[segment_number]
+
+    def read_item(self, entry):
+        """Reads the history item of an index entry
+
+        :param LogIndexEntry entry: the index entry of the item
+        :return: the dictionary of the history item
+        :rtype: dict
+        :raises exceptions.EOFError: if the item is not completely written to the disk, yet
+        """
+        return record_file.read_record(self._get_segment_file(entry.segment), entry.offset)
+
+    def __getitem__(self, history_item_id):
+        try:
+            return self.read_item(self._entries[history_item_id])
+        except EOFError:
+            raise KeyError("History item {0} is not yet written to the disk".format(history_item_id))
+
+    def __contains__(self, history_item_id):
+        return history_item_id in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self):
+        """Returns the index entries of all items in the order they were written
+
+        :return: iterator of LogIndexEntry
+        """
+        return self._entries.itervalues()
+
+    def iter_items(self):
+        """Reads all items of the log sequentially in the order they were written
+
+        In contrast to iterating over the index, the segments are read sequentially, which is the fastest way to
+        process all items of a large log.
+
+        :return: generator of tuples of the history_item_id and the dictionary of the history item
+        """
+        segment_number = 0
+        while os.path.exists(os.path.join(self.log_path, BINARY_LOG_SEGMENT_FILE.format(segment_number))):
+            for offset, item in record_file.iter_records(self._get_segment_file(segment_number)):
+                yield item['history_item_id'], item
+            segment_number += 1
+
+    def close(self):
+        self._index_file.close()
+        for segment_file in self._segment_files.itervalues():
+            segment_file.close()
+        self._segment_files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_execution_log(log_path):
+    """Opens an execution log for reading, independent of its format
+
+    :param str log_path: the path of the execution log, i.e. a shelve file or the directory of a binary log
+    :return: the shelve or a :class:`BinaryExecutionLog`, both behave like a dict mapping history_item_ids to items
+    """
+    if os.path.isdir(log_path):
+        return BinaryExecutionLog(log_path)
+    return shelve.open(log_path, flag='r')
+
 
 def log_to_raw_structure(execution_history_items):
     """
@@ -74,6 +193,70 @@ def log_to_raw_structure(execution_history_items):
     return start_item, previous, next_, concurrent, grouped_by_run_id
 
 
+def _unpickle_data(data_dict, throw_on_pickle_error, include_erroneous_data_ports):
+    r = dict()
+    # support backward compatibility
+    if isinstance(data_dict, basestring):  # formerly data dict was a json string
+        r = json.loads(data_dict)
+    else:
+        for k, v in data_dict.iteritems():
+            if not k.startswith('!'): # ! indicates storage error
+                try:
+                    r[k] = pickle.loads(v)
+                except Exception as e:
+                    if throw_on_pickle_error:
+                        raise
+                    elif include_erroneous_data_ports:
+                        r['!' + k] = (str(e), v)
+                    else:
+                        pass # ignore
+            elif include_erroneous_data_ports:
+                r[k] = v
+
+    return r
+
+
+def _collapse_call_and_return_item(call_item, return_item, throw_on_pickle_error, include_erroneous_data_ports):
+    """Merges the call and return item of a state execution into one collapsed item
+
+    :param dict call_item: the CallItem of the execution
+    :param dict return_item: the ReturnItem of the execution
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :return: the collapsed representation of the execution
+    :rtype: dict
+    """
+    execution_item = {}
+    ## add base properties will throw if not existing
+    for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
+        execution_item[l] = call_item[l]
+
+    ## add extended properties (added in later rafcon versions),
+    ## will add default value if not existing instead
+    for l, default in [('semantic_data', {}),
+                         ('is_library', None),
+                         ('library_state_name', None),
+                         ('library_name', None),
+                         ('library_path', None)]:
+        execution_item[l] = call_item.get(l, default)
+
+    for l in ['outcome_name', 'outcome_id']:
+        execution_item[l] = return_item[l]
+    for l in ['timestamp']:
+        execution_item[l+'_call'] = call_item[l]
+        execution_item[l+'_return'] = return_item[l]
+
+    execution_item['data_ins'] = _unpickle_data(call_item['input_output_data'], throw_on_pickle_error,
+                                                include_erroneous_data_ports)
+    execution_item['data_outs'] = _unpickle_data(return_item['input_output_data'], throw_on_pickle_error,
+                                                 include_erroneous_data_ports)
+    execution_item['scoped_data_ins'] = _unpickle_data(call_item['scoped_data'], throw_on_pickle_error,
+                                                       include_erroneous_data_ports)
+    execution_item['scoped_data_outs'] = _unpickle_data(return_item['scoped_data'], throw_on_pickle_error,
+                                                        include_erroneous_data_ports)
+    return execution_item
+
+
 def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=True,
                                include_erroneous_data_ports=False, full_next=False):
     """
@@ -236,54 +419,8 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
                     else:
                         collapsed_concurrent[prev_rid] = [rid]
 
-            # assemble grouped item
-            execution_item = {}
-            ## add base properties will throw if not existing
-            for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
-                execution_item[l] = call_item[l]
-
-            ## add extended properties (added in later rafcon versions),
-            ## will add default value if not existing instead
-            for l, default in [('semantic_data', {}),
-                                 ('is_library', None),
-                                 ('library_state_name', None),
-                                 ('library_name', None),
-                                 ('library_path', None)]:
-                execution_item[l] = call_item.get(l, default)
-
-            for l in ['outcome_name', 'outcome_id']:
-                execution_item[l] = return_item[l]
-            for l in ['timestamp']:
-                execution_item[l+'_call'] = call_item[l]
-                execution_item[l+'_return'] = return_item[l]
-
-            def unpickle_data(data_dict):
-                r = dict()
-                # support backward compatibility
-                if isinstance(data_dict, basestring):  # formerly data dict was a json string
-                    r = json.loads(data_dict)
-                else:
-                    for k, v in data_dict.iteritems():
-                        if not k.startswith('!'): # ! indicates storage error
-                            try:
-                                r[k] = pickle.loads(v)
-                            except Exception as e:
-                                if throw_on_pickle_error:
-                                    raise
-                                elif include_erroneous_data_ports:
-                                    r['!' + k] = (str(e), v)
-                                else:
-                                    pass # ignore
-                        elif include_erroneous_data_ports:
-                            r[k] = v
-
-                return r
-
-            execution_item['data_ins'] = unpickle_data(call_item['input_output_data'])
-            execution_item['data_outs'] = unpickle_data(return_item['input_output_data'])
-            execution_item['scoped_data_ins'] = unpickle_data(call_item['scoped_data'])
-            execution_item['scoped_data_outs'] = unpickle_data(return_item['scoped_data'])
-
+            execution_item = _collapse_call_and_return_item(call_item, return_item, throw_on_pickle_error,
+                                                            include_erroneous_data_ports)
             collapsed_items[rid] = execution_item
 
     return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
@@ -307,12 +444,19 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     start, next_, concurrency, hierarchy, gitems = log_to_collapsed_structure(
         execution_history_items, throw_on_pickle_error=throw_on_pickle_error)
     gitems.pop(start['run_id'])
-    if len(gitems) == 0:
+    return _collapsed_items_to_DataFrame(gitems.values(), data_in_columns, data_out_columns, scoped_in_columns,
+                                         scoped_out_columns, semantic_data_columns)
+
+
+def _collapsed_items_to_DataFrame(collapsed_items, data_in_columns, data_out_columns, scoped_in_columns,
+                                  scoped_out_columns, semantic_data_columns):
+    """Creates the table of log_to_DataFrame for a list of collapsed items"""
+    if len(collapsed_items) == 0:
         return pd.DataFrame()
 
     # remove columns which are not generic over all states (basically the
     # data flow stuff)
-    df_keys = gitems.values()[0].keys()
+    df_keys = collapsed_items[0].keys()
     df_keys.remove('data_ins')
     df_keys.remove('data_outs')
     df_keys.remove('scoped_data_ins')
@@ -322,7 +466,7 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
 
     df_items = []
 
-    for rid, item in gitems.items():
+    for item in collapsed_items:
         row_data = [item[k] for k in df_keys]
 
         for key, selected_columns in [('data_ins', data_in_columns),
@@ -352,6 +496,121 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     return df_timed
 
 
+def _matches_filter(path, timestamp, item_type, path_prefix, start_time, end_time, item_types):
+    if path_prefix is not None and path != path_prefix and \
+            not (path or '').startswith(path_prefix + PATH_SEPARATOR):
+        return False
+    if start_time is not None and timestamp < start_time:
+        return False
+    if end_time is not None and timestamp > end_time:
+        return False
+    if item_types is not None and item_type not in item_types:
+        return False
+    return True
+
+
+def iter_log_items(execution_history_items, path_prefix=None, start_time=None, end_time=None, item_types=None):
+    """Iterates over the history items of a log in the order of their execution
+
+    The items can be filtered. For binary logs, the filter is applied to the index, thus only matching items are read
+    from the disk. Other logs, e.g. shelves, are not ordered, thus their items are sorted by their timestamps first,
+    which requires reading all items once (without unpickling the data of the ports).
+
+    :param execution_history_items: history items, e.g. the opened shelve or :class:`BinaryExecutionLog`
+    :param str path_prefix: only yield items of the state with this path (by id) and of its descendants
+    :param float start_time: only yield items with a later or equal timestamp
+    :param float end_time: only yield items with an earlier or equal timestamp
+    :param item_types: only yield items of the given types, e.g. ['CallItem', 'ReturnItem']
+    :return: generator of tuples of the history_item_id and the history item
+    """
+    if isinstance(execution_history_items, BinaryExecutionLog):
+        for entry in execution_history_items.entries():
+            if _matches_filter(entry.path, entry.timestamp, entry.item_type,
+                               path_prefix, start_time, end_time, item_types):
+                yield entry.history_item_id, execution_history_items.read_item(entry)
+        return
+
+    timestamps_and_keys = []
+    for key, item in execution_history_items.iteritems():
+        if _matches_filter(item['path'], item['timestamp'], item['item_type'],
+                           path_prefix, start_time, end_time, item_types):
+            timestamps_and_keys.append((item['timestamp'], key))
+    timestamps_and_keys.sort()
+    for timestamp, key in timestamps_and_keys:
+        yield key, execution_history_items[key]
+
+
+def iter_collapsed_items(execution_history_items, throw_on_pickle_error=True, include_erroneous_data_ports=False,
+                         path_prefix=None, start_time=None, end_time=None):
+    """Iterates over the collapsed items of a log, see :func:`log_to_collapsed_structure`
+
+    In contrast to log_to_collapsed_structure, a collapsed item is yielded as soon as the ReturnItem of a state
+    execution was read, thus only the CallItems of the currently running states are held in memory. The relations
+    between the collapsed items (next, concurrent, hierarchy) are not determined.
+
+    If a time window is given, only executions which were called and returned within the window are yielded.
+
+    :param execution_history_items: history items, e.g. the opened shelve or :class:`BinaryExecutionLog`
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :param str path_prefix: only yield executions of the state with this path (by id) and of its descendants
+    :param float start_time: the start of the time window
+    :param float end_time: the end of the time window
+    :return: generator of collapsed items
+    """
+    # run_id --> {call_type: CallItem} of the executions, which did not return, yet
+    call_items = {}
+    for history_item_id, item in iter_log_items(execution_history_items, path_prefix, start_time, end_time,
+                                                ['CallItem', 'ReturnItem']):
+        if not (item['state_type'] in ('ExecutionState', 'HierarchyState', 'LibraryState') or
+                'Concurrency' in item['state_type']):
+            continue
+        rid = item['run_id']
+        if item['item_type'] == 'CallItem':
+            call_items.setdefault(rid, {})[item['call_type']] = item
+            continue
+
+        calls = call_items.get(rid, {})
+        # child states are called with call type EXECUTE by their parent, which also embraces the CONTAINER calls
+        # of container states. Only root states have just the CONTAINER call.
+        if item['call_type'] == 'EXECUTE' or 'EXECUTE' not in calls:
+            call_item = calls.get(item['call_type'], calls.get('CONTAINER'))
+            call_items.pop(rid, None)
+            if call_item is None:
+                continue
+            yield _collapse_call_and_return_item(call_item, item, throw_on_pickle_error, include_erroneous_data_ports)
+
+    if call_items:
+        logger.warn('The log contains {0} state executions without a ReturnItem, e.g. because the execution was '
+                    'interrupted or the time window ended'.format(len(call_items)))
+
+
+def iter_DataFrame_chunks(execution_history_items, chunk_size=10000, data_in_columns=[], data_out_columns=[],
+                          scoped_in_columns=[], scoped_out_columns=[], semantic_data_columns=[],
+                          throw_on_pickle_error=True, path_prefix=None, start_time=None, end_time=None):
+    """Iterates over the table of :func:`log_to_DataFrame` in chunks
+
+    Each chunk is a pandas.DataFrame with the rows of up to chunk_size state executions, which are collapsed by
+    :func:`iter_collapsed_items`. Thus, the table of a huge log can be processed without holding the whole log or
+    table in memory. The chunks can be concatenated with pandas.concat.
+
+    :param execution_history_items: history items, e.g. the opened shelve or :class:`BinaryExecutionLog`
+    :param int chunk_size: the maximum number of rows per chunk
+    :return: generator of pandas.DataFrame
+    """
+    chunk = []
+    for collapsed_item in iter_collapsed_items(execution_history_items, throw_on_pickle_error,
+                                               path_prefix=path_prefix, start_time=start_time, end_time=end_time):
+        chunk.append(collapsed_item)
+        if len(chunk) >= chunk_size:
+            yield _collapsed_items_to_DataFrame(chunk, data_in_columns, data_out_columns, scoped_in_columns,
+                                                scoped_out_columns, semantic_data_columns)
+            chunk = []
+    if chunk:
+        yield _collapsed_items_to_DataFrame(chunk, data_in_columns, data_out_columns, scoped_in_columns,
+                                            scoped_out_columns, semantic_data_columns)
+
+
 def log_to_ganttplot(execution_history_items):
     """
     Example how to use the DataFrame representation
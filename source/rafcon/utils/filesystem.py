@@ -20,10 +20,27 @@ import os
 import tarfile
 import stat
 import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
 from os.path import realpath, dirname, join, expanduser
 import shutil, errno
 
 
+#: Maximal number of files, whose state is remembered, the least recently used files are forgotten first
+MAX_KNOWN_FILE_STATES = 100000
+
+#: Content hash, modification time and size of the files last written by :func:`write_file_if_changed` or read
+#: before and passed to :func:`remember_file_content`, by their absolute path, ordered by their last use
+_known_file_states = OrderedDict()
+_known_file_states_lock = threading.Lock()
+
+# the umask can only be read by setting it, which affects all threads, thus it is only read once
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
 def create_path(path):
     """Creates a absolute path in the file system.
 
@@ -106,6 +123,134 @@ def write_file(file_path, content, create_full_path=False):
         file_pointer.write(content)
     
         
+def _get_content_hash(content):
+    if isinstance(content, unicode):
+        content = content.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+
+def _get_file_state(file_path, content_hash):
+    file_stat = os.stat(file_path)
+    return content_hash, file_stat.st_mtime, file_stat.st_size
+
+
+def remember_file_content(file_path, content):
+    """Remembers the content of a file that was just read, so that :func:`write_file_if_changed` can skip writing the
+    same content to the file again
+
+    :param str file_path: The path of the file
+    :param str content: The content of the file
+    """
+    file_path = os.path.abspath(file_path)
+    try:
+        file_state = _get_file_state(file_path, _get_content_hash(content))
+    except OSError:
+        return
+    _set_known_file_state(file_path, file_state)
+
+
+def _set_known_file_state(file_path, file_state):
+    with _known_file_states_lock:
+        _known_file_states.pop(file_path, None)
+        _known_file_states[file_path] = file_state
+        while len(_known_file_states) > MAX_KNOWN_FILE_STATES:
+            _known_file_states.popitem(last=False)
+
+
+def forget_file_contents(path):
+    """Forgets the contents remembered for a removed file or for all files within a removed folder
+
+    :param str path: The path of the file or folder
+    """
+    path = os.path.abspath(path)
+    folder_prefix = os.path.join(path, '')
+    with _known_file_states_lock:
+        for file_path in [file_path for file_path in _known_file_states
+                          if file_path == path or file_path.startswith(folder_prefix)]:
+            del _known_file_states[file_path]
+
+
+def file_content_changed(file_path, content):
+    """Checks whether the given content differs from the content of the file
+
+    The check relies on the content last written or remembered for the file. Files that were modified since then,
+    e.g. by another process, or that are unknown are considered to be changed.
+
+    :param str file_path: The path of the file
+    :param str content: The new content of the file
+    :return: False, if the file is known to have the given content, else True
+    :rtype: bool
+    """
+    return _file_content_hash_changed(os.path.abspath(file_path), _get_content_hash(content))
+
+
+def _file_content_hash_changed(file_path, content_hash):
+    with _known_file_states_lock:
+        known_file_state = _known_file_states.get(file_path)
+        if known_file_state is not None:
+            # mark the file as recently used
+            del _known_file_states[file_path]
+            _known_file_states[file_path] = known_file_state
+    if known_file_state is None or known_file_state[0] != content_hash:
+        return True
+    try:
+        return _get_file_state(file_path, content_hash) != known_file_state
+    except OSError:
+        return True
+
+
+def write_file_atomically(file_path, content, mode='w'):
+    """Writes the content to a temporary file and replaces the file by it
+
+    Thus, the file never contains partially written content, even if the writing fails. The file keeps its
+    permissions, a new file gets the permissions of a regular newly created file. Symbolic links are not replaced, but
+    the file they point to is written directly.
+
+    :param str file_path: The path of the file
+    :param str content: The content of the file
+    :param str mode: The mode to open the temporary file with
+    """
+    if os.path.islink(file_path):
+        write_file(file_path, content)
+        return
+    folder_path, file_name = os.path.split(os.path.abspath(file_path))
+    if os.path.exists(file_path):
+        file_mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    else:
+        file_mode = 0o666 & ~_UMASK
+    # the temporary file name is unique among all threads and processes
+    file_descriptor, tmp_file_path = tempfile.mkstemp(prefix=".{0}.".format(file_name), suffix=".tmp", dir=folder_path)
+    try:
+        with os.fdopen(file_descriptor, mode) as file_pointer:
+            file_pointer.write(content)
+        # mkstemp creates files only accessible by the owner
+        os.chmod(tmp_file_path, file_mode)
+        os.rename(tmp_file_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+        raise
+
+
+def write_file_if_changed(file_path, content):
+    """Writes the content to the file, if it changed since the file was last written or read
+
+    The file is written atomically, see :func:`write_file_atomically`.
+
+    :param str file_path: The path of the file
+    :param str content: The content of the file
+    :return: True, if the file was written, else False
+    :rtype: bool
+    """
+    file_path = os.path.abspath(file_path)
+    content_hash = _get_content_hash(content)
+    if not _file_content_hash_changed(file_path, content_hash):
+        return False
+    write_file_atomically(file_path, content)
+    _set_known_file_state(file_path, _get_file_state(file_path, content_hash))
+    return True
+
+
 def get_default_config_path():
     home_path = expanduser('~')
     if home_path:
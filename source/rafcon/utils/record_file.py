@@ -0,0 +1,134 @@
+# Copyright (C) 2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: record_file
+   :synopsis: A module for append-only files of length-prefixed, pickled records
+
+Each file starts with FILE_HEADER, followed by the records. A record consists of its length as 4 byte unsigned
+integer (big-endian) and the pickled object. As records are only appended, files can be read while they are still
+written: an incomplete record at the end of a file is treated like the end of the file.
+"""
+
+import os
+import struct
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+FILE_HEADER = "RAFCON-RECORDS-1\n"
+
+# the file names within the directory of a binary execution log
+BINARY_LOG_INDEX_FILE = "index.records"
+BINARY_LOG_SEGMENT_FILE = "segment_{0:05d}.records"
+_RECORD_LENGTH = struct.Struct(">I")
+
+
+def open_record_file(path):
+    """Opens a record file for appending records and creates it, if not existing
+
+    :param str path: the path of the file
+    :return: the file object, positioned at the end of the file
+    """
+    record_file = open(path, 'ab')
+    record_file.seek(0, os.SEEK_END)
+    if record_file.tell() == 0:
+        record_file.write(FILE_HEADER)
+    return record_file
+
+
+def append_record(record_file, obj):
+    """Appends an object as record to a record file
+
+    :param record_file: a file object opened with :func:`open_record_file`
+    :param obj: the object to store, it must be picklable
+    :return: the number of written bytes
+    :rtype: int
+    """
+    data = pickle.dumps(obj, 2)
+    record_file.write(_RECORD_LENGTH.pack(len(data)) + data)
+    return _RECORD_LENGTH.size + len(data)
+
+
+def record_size(data):
+    """Returns the size of a record on the disk
+
+    :param str data: the pickled data of the record
+    :return: the size in bytes, which is the difference to the offset of the next record
+    :rtype: int
+    """
+    return _RECORD_LENGTH.size + len(data)
+
+
+def read_raw_record(record_file, offset):
+    """Reads the pickled data of the record at the given offset
+
+    :param record_file: a file object opened for reading in binary mode
+    :param int offset: the position of the record within the file
+    :return: the pickled data of the record and the offset of the next record
+    :rtype: tuple(str, int)
+    :raises exceptions.EOFError: if there is no complete record at the offset
+    """
+    record_file.seek(offset)
+    length_data = record_file.read(_RECORD_LENGTH.size)
+    if len(length_data) < _RECORD_LENGTH.size:
+        raise EOFError("No complete record at offset {0}".format(offset))
+    length = _RECORD_LENGTH.unpack(length_data)[0]
+    data = record_file.read(length)
+    if len(data) < length:
+        raise EOFError("No complete record at offset {0}".format(offset))
+    return data, offset + _RECORD_LENGTH.size + length
+
+
+def read_record(record_file, offset):
+    """Reads and unpickles the record at the given offset
+
+    :param record_file: a file object opened for reading in binary mode
+    :param int offset: the position of the record within the file
+    :return: the stored object
+    :raises exceptions.EOFError: if there is no complete record at the offset
+    """
+    return pickle.loads(read_raw_record(record_file, offset)[0])
+
+
+def iter_raw_records(record_file, offset=None):
+    """Iterates over the pickled data of all complete records
+
+    :param record_file: a file object opened for reading in binary mode
+    :param int offset: the offset of the first record to read, if None, the file is read from the beginning
+    :return: generator of the offset and the pickled data of each record
+    :raises exceptions.ValueError: if the file is not a record file
+    """
+    if offset is None:
+        record_file.seek(0)
+        header = record_file.read(len(FILE_HEADER))
+        if header != FILE_HEADER:
+            if FILE_HEADER.startswith(header):
+                # the header is not completely written, yet
+                return
+            raise ValueError("{0} is not a record file".format(record_file.name))
+        offset = len(FILE_HEADER)
+    while True:
+        try:
+            data, next_offset = read_raw_record(record_file, offset)
+        except EOFError:
+            return
+        yield offset, data
+        offset = next_offset
+
+
+def iter_records(record_file, offset=None):
+    """Iterates over all complete records and unpickles them
+
+    :param record_file: a file object opened for reading in binary mode
+    :param int offset: the offset of the first record to read, if None, the file is read from the beginning
+    :return: generator of the offset and the stored object of each record
+    """
+    for offset, data in iter_raw_records(record_file, offset):
+        yield offset, pickle.loads(data)
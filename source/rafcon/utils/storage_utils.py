@@ -104,13 +104,35 @@ def write_dict_to_json(dictionary, path, **kwargs):
     :param dictionary: The dictionary to get saved
     :param kwargs: optional additional parameters for dumper
     """
-    result_string = json.dumps(dictionary, cls=JSONObjectEncoder,
-                               indent=4, check_circular=False, sort_keys=True, **kwargs)
+    result_string = get_json_string_from_dict(dictionary, **kwargs)
     with open(path, 'w') as f:
         # We cannot write directly to the file, as otherwise the 'encode' method wouldn't be called
         f.write(result_string)
 
 
+def get_json_string_from_dict(dictionary, **kwargs):
+    """Converts a dictionary to a json string, formatted the same way as the json files written by
+    :func:`write_dict_to_json`.
+
+    :param dictionary: The dictionary to be converted
+    :param kwargs: optional additional parameters for dumper
+    :return: The json string
+    :rtype: str
+    """
+    return json.dumps(dictionary, cls=JSONObjectEncoder, indent=4, check_circular=False, sort_keys=True, **kwargs)
+
+
+def load_objects_from_json_string(json_string, as_dict=False):
+    """Loads a dictionary from a json string, e.g. the already read content of a json file.
+
+    :param str json_string: The json string
+    :return: The dictionary specified in the json string
+    """
+    if as_dict:
+        return json.loads(json_string)
+    return json.loads(json_string, cls=JSONObjectDecoder, substitute_modules=substitute_modules)
+
+
 def load_objects_from_json(path, as_dict=False):
     """Loads a dictionary from a json file.
 
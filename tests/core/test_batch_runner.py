@@ -0,0 +1,111 @@
+import os
+import json
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.batch_runner import BatchJob, BatchRunner, load_jobs, write_report
+from rafcon.core.execution import execution_backend
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+SQUARE_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["square"] = inputs["number"] ** 2
+    return 0
+"""
+
+
+def create_state_machine_path():
+    root_state = ExecutionState("Square")
+    root_state.script_text = SQUARE_SCRIPT
+    root_state.add_input_data_port("number", "int", 2)
+    root_state.add_output_data_port("square", "int")
+    state_machine_path = testing_utils.get_unique_temp_path()
+    storage.save_state_machine_to_path(StateMachine(root_state), state_machine_path)
+    return state_machine_path
+
+
+@pytest.mark.parametrize("max_parallel_jobs", [1, 2])
+def test_batch_runner(max_parallel_jobs, caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine_path = create_state_machine_path()
+        jobs_path = os.path.join(testing_utils.get_unique_temp_path(), "jobs.yaml")
+        with open(jobs_path, "w") as jobs_file:
+            jobs_file.write("- {0}\n".format(state_machine_path))
+            for number in range(3, 6):
+                jobs_file.write("- {{path: {0}, inputs: {{number: {1}}}, name: job_{1}}}\n".format(
+                    state_machine_path, number))
+            jobs_file.write("- {{path: {0}, inputs: {{no_port: 1}}}}\n".format(state_machine_path))
+        jobs = load_jobs(jobs_path)
+        assert [job.name for job in jobs[1:4]] == ["job_3", "job_4", "job_5"]
+
+        results = BatchRunner(max_parallel_jobs).run(jobs)
+        assert [result.outputs.get("square") for result in results] == [4, 9, 16, 25, None]
+        assert [result.succeeded for result in results] == [True] * 4 + [False]
+        assert all(result.final_outcome == "success" for result in results[:4])
+        assert "no_port" in results[4].error
+        assert not rafcon.core.singleton.state_machine_manager.state_machines
+
+        report_path = os.path.join(testing_utils.get_unique_temp_path(), "report.json")
+        write_report(results, report_path, total_time=1.)
+        with open(report_path) as report_file:
+            report = json.load(report_file)
+        assert report["succeeded"] == 4 and report["failed"] == 1
+        assert report["jobs"][1]["name"] == "job_3"
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_errors=1 if max_parallel_jobs == 1 else 0)
+
+
+def test_parallel_batch_after_serial_concurrency_job(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = BarrierConcurrencyState("Barrier")
+        for name in ["A", "B"]:
+            branch = ExecutionState(name)
+            branch.script_text = "def execute(self, inputs, outputs, gvm):\n    return 0\n"
+            root_state.add_state(branch)
+        root_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, root_state.state_id, 0)
+        state_machine_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(StateMachine(root_state), state_machine_path)
+
+        # the serial run leaves idle workers in the worker pool of this process
+        assert BatchRunner().run([BatchJob(state_machine_path)])[0].succeeded
+        assert execution_backend.get_worker_pool().number_of_idle_workers > 0
+        # the forked processes must not use the inherited workers, whose threads do not exist in the fork
+        results = BatchRunner(2).run([BatchJob(state_machine_path, timeout=10.) for _ in range(4)])
+        assert all(result.succeeded for result in results)
+        assert all(result.execution_time < 5. for result in results)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_batch_job_timeout(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = ExecutionState("Waiting")
+        root_state.script_text = "def execute(self, inputs, outputs, gvm):\n" \
+                                 "    self.preemptive_wait(10.)\n" \
+                                 "    return 0\n"
+        state_machine_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(StateMachine(root_state), state_machine_path)
+
+        result = BatchRunner().run_job(BatchJob(state_machine_path, timeout=0.1))
+        assert not result.succeeded
+        assert result.error.startswith("The execution did not finish")
+        assert result.execution_time < 5.
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,111 @@
+import numpy
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core import data_passing
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+PRODUCER_SCRIPT = """
+import numpy
+
+def execute(self, inputs, outputs, gvm):
+    outputs["array"] = numpy.arange(10)
+    return 0
+"""
+
+CONSUMER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("writeable", inputs["array"].flags.writeable)
+    gvm.set_variable("sum", int(inputs["array"].sum()))
+    return 0
+"""
+
+
+def create_state_machine():
+    root_state = HierarchyState("Root")
+    producer = ExecutionState("Producer")
+    producer.script_text = PRODUCER_SCRIPT
+    output_port_id = producer.add_output_data_port("array", "object")
+    consumer = ExecutionState("Consumer")
+    consumer.script_text = CONSUMER_SCRIPT
+    input_port_id = consumer.add_input_data_port("array", "object")
+
+    root_state.add_state(producer)
+    root_state.add_state(consumer)
+    root_state.set_start_state(producer.state_id)
+    root_state.add_transition(producer.state_id, 0, consumer.state_id, None)
+    root_state.add_transition(consumer.state_id, 0, root_state.state_id, 0)
+    root_state.add_data_flow(producer.state_id, output_port_id, consumer.state_id, input_port_id)
+    return StateMachine(root_state)
+
+
+def test_copy_value():
+    array = numpy.arange(5)
+    for policy in data_passing.DATA_PASSING_POLICIES:
+        assert data_passing.copy_value(3, policy) == 3
+        assert data_passing.copy_value("text", policy) == "text"
+
+    copied_array = data_passing.copy_value(array, data_passing.DEEPCOPY_POLICY)
+    assert copied_array is not array and copied_array.flags.writeable
+    assert (copied_array == array).all()
+
+    read_only_array = data_passing.copy_value(array, data_passing.READ_ONLY_POLICY)
+    assert read_only_array.base is array and not read_only_array.flags.writeable
+    with pytest.raises(ValueError):
+        read_only_array[0] = 1
+    # other mutable values are still copied
+    value = {"list": [1, 2]}
+    assert data_passing.copy_value(value, data_passing.READ_ONLY_POLICY) == value
+    assert data_passing.copy_value(value, data_passing.READ_ONLY_POLICY) is not value
+
+    assert data_passing.copy_value(array, data_passing.SHARE_POLICY) is array
+    assert data_passing.copy_value(value, data_passing.SHARE_POLICY) is value
+
+
+def test_copy_values_of_dict():
+    array = numpy.arange(5)
+    copied_dict = data_passing.copy_values_of_dict({"array": array}, data_passing.DEEPCOPY_POLICY)
+    assert copied_dict["array"] is not array and (copied_dict["array"] == array).all()
+    assert data_passing.copy_values_of_dict({"array": array}, data_passing.SHARE_POLICY)["array"] is array
+    # history items without input or output data pass None
+    for policy in data_passing.DATA_PASSING_POLICIES:
+        assert data_passing.copy_values_of_dict(None, policy) is None
+
+
+@pytest.mark.parametrize("policy", data_passing.DATA_PASSING_POLICIES)
+def test_data_passing_policies(policy, caplog):
+    testing_utils.initialize_environment_core(core_config={"DATA_PASSING_POLICY": policy})
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        testing_utils.remove_all_gvm_variables()
+
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        assert gvm.get_variable("sum") == 45
+        assert gvm.get_variable("writeable") == (policy != data_passing.READ_ONLY_POLICY)
+
+        gvm.set_variable("array", numpy.arange(3))
+        assert gvm.get_variable("array").flags.writeable == (policy != data_passing.READ_ONLY_POLICY)
+        # explicitly requested copies are always writeable
+        explicit_copy = gvm.get_variable("array", per_reference=False)
+        explicit_copy[0] = 5
+        assert gvm.get_variable("array")[0] == 0
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution import execution_backend
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+COUNTER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("counter", gvm.get_variable("counter") + 1)
+    return 0
+"""
+
+# each branch signals its start and waits for the other branch, which is only possible if both run in parallel
+BRANCH_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("started_" + self.name, True)
+    other = "started_" + ("B" if self.name == "A" else "A")
+    for _ in range(200):
+        if gvm.variable_exist(other):
+            gvm.set_variable("parallel_" + self.name, True)
+            break
+        self.preemptive_wait(0.01)
+    return 0
+"""
+
+
+def create_state_machine():
+    root_state = HierarchyState("Root")
+    previous_state = None
+    for index in range(5):
+        state = ExecutionState("Counter{0}".format(index))
+        state.script_text = COUNTER_SCRIPT
+        root_state.add_state(state)
+        if previous_state is None:
+            root_state.set_start_state(state.state_id)
+        else:
+            root_state.add_transition(previous_state.state_id, 0, state.state_id, None)
+        previous_state = state
+
+    barrier_state = BarrierConcurrencyState("Barrier")
+    for name in ["A", "B"]:
+        branch = ExecutionState(name)
+        branch.script_text = BRANCH_SCRIPT
+        barrier_state.add_state(branch)
+    barrier_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, barrier_state.state_id, 0)
+    root_state.add_state(barrier_state)
+    root_state.add_transition(previous_state.state_id, 0, barrier_state.state_id, None)
+    root_state.add_transition(barrier_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+@pytest.mark.parametrize("backend", execution_backend.EXECUTION_BACKENDS)
+def test_execution_backends(backend, caplog):
+    testing_utils.initialize_environment_core(core_config={"EXECUTION_BACKEND": backend})
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        testing_utils.remove_all_gvm_variables()
+        gvm.set_variable("counter", 0)
+
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        assert gvm.get_variable("counter") == 5
+        # concurrency states must still execute their children in parallel
+        assert gvm.variable_exist("parallel_A") and gvm.variable_exist("parallel_B")
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_worker_pool_reuses_idle_workers():
+    pool = execution_backend.WorkerPool(max_idle_workers=1)
+    results = []
+    for index in range(3):
+        pool.submit(lambda: results.append(index)).join()
+    assert results == [0, 1, 2]
+    assert pool.number_of_idle_workers == 1
+    assert pool._worker_counter == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,65 @@
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.state_machine import StateMachine
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import threading
+import pytest
+import testing_utils
+
+WAITING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    self.preemptive_wait(0.2)
+    return 0
+"""
+
+
+def create_state_machine():
+    root_state = ExecutionState("Root")
+    root_state.script_text = WAITING_SCRIPT
+    return StateMachine(root_state)
+
+
+def test_execution_future(caplog):
+    testing_utils.initialize_environment_core()
+    execution_engine = rafcon.core.singleton.state_machine_execution_engine
+    try:
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        number_of_threads = threading.active_count()
+        execution_engine.start(state_machine.state_machine_id)
+        # the execution is not observed by a thread of its own, the thread of the root state completes the future
+        assert threading.active_count() == number_of_threads + 1
+
+        execution_future = execution_engine.execution_future
+        assert execution_future.state_machine is state_machine
+        finished_futures = []
+        execution_future.add_done_callback(finished_futures.append)
+        assert not execution_future.done() and execution_future.final_outcome is None
+        assert not execution_future.wait(0.01)
+
+        assert execution_future.wait(5.)
+        assert execution_engine.finished_or_stopped()
+        assert finished_futures == [execution_future]
+        assert execution_future.final_outcome.outcome_id == 0
+        # callbacks added after the execution finished are called right away
+        execution_future.add_done_callback(finished_futures.append)
+        assert len(finished_futures) == 2
+
+        # a stopped execution completes the future, too
+        execution_engine.start(state_machine.state_machine_id)
+        assert execution_engine.execution_future is not execution_future
+        execution_engine.stop()
+        assert execution_engine.execution_future.wait(5.)
+        assert execution_engine.join(0.)
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -9,10 +9,12 @@ import testing_utils
 import os
 
 
-def test_execution_log(caplog):
+@pytest.mark.parametrize("log_format", ["shelve", "binary"])
+def test_execution_log(log_format, caplog):
     try:
         testing_utils.initialize_environment_core(
             core_config={'EXECUTION_LOG_ENABLE': True,
+                         'EXECUTION_LOG_FORMAT': log_format,
                          'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log'})
 
         state_machine = global_storage.load_state_machine_from_path(
@@ -24,9 +26,7 @@ def test_execution_log(caplog):
         rafcon.core.singleton.state_machine_execution_engine.start()
         rafcon.core.singleton.state_machine_execution_engine.join()
 
-        import shelve
-        import json
-        ss = shelve.open(state_machine.get_last_execution_log_filename())
+        ss = log_helper.open_execution_log(state_machine.get_last_execution_log_filename())
 
         assert len(ss) == 36
 
@@ -56,9 +56,100 @@ def test_execution_log(caplog):
         assert len(all_starts) == 3
         assert list(all_starts['outcome_name']) == ['success', 'success', 'done']
 
+        # the streaming variants must yield the same executions
+        streamed_items = list(log_helper.iter_collapsed_items(ss))
+        assert len(streamed_items) == len(collapsed_items) - 1  # the start item of the state machine is not yielded
+        assert sorted(item['run_id'] for item in streamed_items) == \
+            sorted(rid for rid in collapsed_items.keys() if rid != start['run_id'])
+        streamed_starts = [item for item in streamed_items if item['state_name'] == 'Start' and
+                           item['state_type'] == 'ExecutionState']
+        assert [item['outcome_name'] for item in streamed_starts] == ['success', 'success', 'done']
+
+        # the executions of MakeProd2 and of its two concurrent children, the decider state has no history items
+        prod2_items = list(log_helper.iter_collapsed_items(ss, path_prefix=prod2['path']))
+        assert len(prod2_items) == 3
+        assert all(item['path'].startswith(prod2['path'] + '/') for item in prod2_items[:-1])
+        assert prod2_items[-1]['path'] == prod2['path'] and prod2_items[-1]['data_outs']['output_1'] == 3
+        # a part of a state id does not match the states with a longer id
+        assert list(log_helper.iter_collapsed_items(ss, path_prefix=prod2['path'][:-1])) == []
+
+        chunks = list(log_helper.iter_DataFrame_chunks(ss, chunk_size=5))
+        assert all(len(chunk) <= 5 for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == len(df)
+
         rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
     finally:
         testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
 
+
+def test_execution_history_storage(caplog):
+    import shelve
+    from rafcon.core.execution.execution_history import ExecutionHistoryStorage
+    filename = os.path.join(testing_utils.get_unique_temp_path(), 'test_execution_history_storage.shelve')
+
+    storage = ExecutionHistoryStorage(filename, flush_interval=0.1, queue_size=10)
+    for index in range(100):
+        storage.store_item(str(index), {'index': index})
+    storage.flush()
+    storage.close()
+    # closing twice must not fail
+    storage.close()
+
+    store = shelve.open(filename, flag='r')
+    try:
+        assert len(store) == 100
+        assert all(store[str(index)]['index'] == index for index in range(100))
+    finally:
+        store.close()
+
+    # items stored after closing are rejected with an error
+    storage.store_item('late', {})
+    testing_utils.assert_logger_warnings_and_errors(caplog, expected_errors=1)
+
+
+def test_execution_history_storage_without_store(caplog):
+    import threading
+    from rafcon.core.execution.execution_history import ExecutionHistoryStorage
+    # the parent directory of the log file does not exist, thus the store cannot be opened
+    filename = os.path.join(testing_utils.get_unique_temp_path(), 'missing', 'test_execution_history_storage.shelve')
+
+    number_of_threads = threading.active_count()
+    storage = ExecutionHistoryStorage(filename, flush_interval=0.1, queue_size=10)
+    assert threading.active_count() == number_of_threads
+    storage.store_item('0', {'index': 0})
+    storage.flush()
+    storage.close()
+    testing_utils.assert_logger_warnings_and_errors(caplog, expected_errors=1)
+
+
+def test_execution_history_binary_storage(caplog):
+    from rafcon.core.execution.execution_history import ExecutionHistoryBinaryStorage
+    log_path = os.path.join(testing_utils.get_unique_temp_path(), 'test_execution_history_storage.rlog')
+
+    storage = ExecutionHistoryBinaryStorage(log_path, flush_interval=0.1, segment_size=1000)
+    for index in range(50):
+        storage.store_item(str(index), {'history_item_id': str(index), 'run_id': index % 5, 'path': 'a/b',
+                                        'timestamp': float(index), 'item_type': 'CallItem'})
+    storage.flush()
+
+    # the log can be read while it is written
+    execution_log = log_helper.open_execution_log(log_path)
+    assert len(execution_log) == 50
+    storage.store_item('50', {'history_item_id': '50', 'run_id': 0, 'path': 'a/b', 'timestamp': 50.,
+                              'item_type': 'ReturnItem'})
+    storage.close()
+    assert execution_log.refresh() == 1
+
+    assert list(execution_log) == [str(index) for index in range(51)]
+    assert execution_log['42']['timestamp'] == 42.
+    assert '51' not in execution_log
+    # the items are distributed over several segments
+    assert len(set(entry.segment for entry in execution_log.entries())) > 1
+    assert [entry.run_id for entry in execution_log.entries()][:6] == [0, 1, 2, 3, 4, 0]
+    assert [item_id for item_id, item in execution_log.iter_items()] == [str(index) for index in range(51)]
+    execution_log.close()
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,97 @@
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+LOOP_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("counter", gvm.get_variable("counter") + 1)
+    if gvm.get_variable("counter") < 20:
+        return 0
+    return 1
+"""
+
+
+def create_state_machine():
+    root_state = HierarchyState("Root")
+    loop_state = ExecutionState("Loop")
+    loop_state.add_outcome("done", 1)
+    loop_state.script_text = LOOP_SCRIPT
+    root_state.add_state(loop_state)
+    root_state.set_start_state(loop_state.state_id)
+    root_state.add_transition(loop_state.state_id, 0, loop_state.state_id, None)
+    root_state.add_transition(loop_state.state_id, 1, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def run_state_machine():
+    state_machine = create_state_machine()
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+    return state_machine
+
+
+@pytest.mark.parametrize("max_items", [0, 10])
+def test_execution_history_max_items(max_items, caplog):
+    testing_utils.initialize_environment_core(core_config={"EXECUTION_HISTORY_MAX_ITEMS": max_items})
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        testing_utils.remove_all_gvm_variables()
+        gvm.set_variable("counter", 0)
+        state_machine = run_state_machine()
+        execution_history = state_machine.execution_histories[0]
+        assert gvm.get_variable("counter") == 20
+
+        # start item, call and return of the root state and 20 calls and returns of the loop state
+        number_of_items = 1 + 2 + 2 * 20
+        if max_items:
+            assert len(execution_history) == max_items
+            assert execution_history.number_of_evicted_items == number_of_items - max_items
+            assert execution_history[0].prev is None
+            # the CallItem of the root state was evicted
+            assert not execution_history.is_backward_step_possible()
+        else:
+            assert len(execution_history) == number_of_items
+            assert execution_history.number_of_evicted_items == 0
+            assert execution_history.is_backward_step_possible()
+        timestamps = [history_item.timestamp for history_item in execution_history]
+        assert timestamps == sorted(timestamps)
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_execution_history_max_age(caplog):
+    testing_utils.initialize_environment_core(core_config={"EXECUTION_HISTORY_MAX_AGE": 60.})
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        testing_utils.remove_all_gvm_variables()
+        gvm.set_variable("counter", 0)
+        state_machine = run_state_machine()
+        execution_history = state_machine.execution_histories[0]
+        assert execution_history.number_of_evicted_items == 0
+
+        # pretend that the first items were pushed long ago
+        for history_item in execution_history[:5]:
+            history_item.timestamp -= 120
+        execution_history.push_call_history_item(execution_history[-1].state_reference,
+                                                 execution_history[-1].call_type, None)
+        assert execution_history.number_of_evicted_items == 5
+        assert execution_history[0].prev is None
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,99 @@
+import os
+import time
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.states.library_state import LibraryState
+from rafcon.core.library_manager import LibraryManager
+import rafcon.core.library_index
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+
+def create_library(path):
+    storage.save_state_machine_to_path(StateMachine(ExecutionState("Library")), path)
+
+
+def test_library_index(monkeypatch, caplog):
+    library_root_path = testing_utils.get_unique_temp_path()
+    other_library_root_path = testing_utils.get_unique_temp_path()
+    create_library(os.path.join(library_root_path, "folder", "library_1"))
+    create_library(os.path.join(library_root_path, "library_2"))
+    create_library(os.path.join(other_library_root_path, "library_3"))
+    library_index_path = os.path.join(testing_utils.get_unique_temp_path(), "index", "library_index.json")
+
+    testing_utils.initialize_environment_core(core_config={"LIBRARY_INDEX_PATH": library_index_path},
+                                              libraries={"root": library_root_path, "other": other_library_root_path})
+    try:
+        assert os.path.isfile(library_index_path)
+
+        # a new library manager reads the directories from the persisted index instead of listing them
+        listed_directories = []
+        original_listdir = os.listdir
+
+        def listdir(path):
+            listed_directories.append(path)
+            return original_listdir(path)
+        monkeypatch.setattr(rafcon.core.library_index.os, "listdir", listdir)
+
+        library_manager = LibraryManager()
+        library_manager.initialize()
+        assert listed_directories == []
+        assert library_manager.libraries["root"]["folder"]["library_1"] == \
+            os.path.join(library_root_path, "folder", "library_1")
+        assert library_manager.libraries["root"]["library_2"] == os.path.join(library_root_path, "library_2")
+        assert library_manager.libraries["other"]["library_3"] == os.path.join(other_library_root_path, "library_3")
+
+        # only the changed directories are listed again
+        folder_path = os.path.join(library_root_path, "folder")
+        create_library(os.path.join(folder_path, "library_4"))
+        modification_time = time.time() + 10
+        os.utime(folder_path, (modification_time, modification_time))
+        library_manager.refresh_libraries()
+        assert folder_path in listed_directories and library_root_path not in listed_directories
+        assert "library_4" in library_manager.libraries["root"]["folder"]
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_packed_libraries(caplog):
+    library_root_path = testing_utils.get_unique_temp_path()
+    packed_library_root_path = os.path.join(testing_utils.get_unique_temp_path(), "packed_root.rafcon")
+    create_library(os.path.join(library_root_path, "folder", "packed_library.rafcon"))
+    create_library(os.path.join(library_root_path, "library"))
+    create_library(packed_library_root_path)
+
+    testing_utils.initialize_environment_core(libraries={"root": library_root_path,
+                                                         "packed": packed_library_root_path})
+    try:
+        library_manager = rafcon.core.singleton.library_manager
+        packed_library_path = os.path.join(library_root_path, "folder", "packed_library.rafcon")
+        assert library_manager.libraries["root"]["folder"]["packed_library"] == packed_library_path
+        assert library_manager.libraries["root"]["library"] == os.path.join(library_root_path, "library")
+        assert library_manager.libraries["packed"]["packed_root"] == packed_library_root_path
+
+        assert library_manager.get_os_path_to_library(os.path.join("root", "folder"), "packed_library",
+                                                      allow_user_interaction=False)[0] == packed_library_path
+        assert library_manager.get_library_path_and_name_for_os_path(packed_library_path) == \
+            (os.path.join("root", "folder"), "packed_library")
+        assert library_manager.get_library_path_and_name_for_os_path(packed_library_root_path) == \
+            ("packed", "packed_root")
+
+        library_state = LibraryState(os.path.join("root", "folder"), "packed_library", "0.1", "Packed")
+        assert library_state.lib_os_path == packed_library_path
+        assert library_state.state_copy.name == "Library"
+        library_state = library_manager.get_library_instance("packed", "packed_root")
+        assert library_state.lib_os_path == packed_library_root_path
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,132 @@
+import os
+from copy import copy
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.library_state import LibraryState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+INCREMENT_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["result"] = inputs["value"] + 1
+    return 0
+"""
+
+
+def create_library(library_root_path):
+    library_root_state = HierarchyState("Increment")
+    increment_state = ExecutionState("IncrementScript")
+    increment_state.script_text = INCREMENT_SCRIPT
+    library_root_state.add_state(increment_state)
+    library_root_state.set_start_state(increment_state.state_id)
+    value_port_id = increment_state.add_input_data_port("value", "int")
+    result_port_id = increment_state.add_output_data_port("result", "int")
+    root_value_port_id = library_root_state.add_input_data_port("value", "int", 0)
+    root_result_port_id = library_root_state.add_output_data_port("result", "int")
+    library_root_state.add_data_flow(library_root_state.state_id, root_value_port_id,
+                                     increment_state.state_id, value_port_id)
+    library_root_state.add_data_flow(increment_state.state_id, result_port_id,
+                                     library_root_state.state_id, root_result_port_id)
+    library_root_state.add_transition(increment_state.state_id, 0, library_root_state.state_id, 0)
+    storage.save_state_machine_to_path(StateMachine(library_root_state), os.path.join(library_root_path, "increment"))
+
+
+def create_state_machine(number_of_library_states):
+    """Creates a state machine incrementing its input with a chain of library states"""
+    root_state = HierarchyState("Root")
+    root_value_port_id = root_state.add_input_data_port("value", "int", 0)
+    root_result_port_id = root_state.add_output_data_port("result", "int")
+    library_states = [LibraryState("test_libraries", "increment", "0.1", "Increment{0}".format(i))
+                      for i in range(number_of_library_states)]
+    previous_state, previous_port_id = root_state, root_value_port_id
+    for library_state in library_states:
+        root_state.add_state(library_state)
+        value_port_id = [port_id for port_id, port in library_state.input_data_ports.iteritems()
+                         if port.name == "value"][0]
+        result_port_id = [port_id for port_id, port in library_state.output_data_ports.iteritems()
+                          if port.name == "result"][0]
+        library_state.use_runtime_value_input_data_ports[value_port_id] = False
+        root_state.add_data_flow(previous_state.state_id, previous_port_id, library_state.state_id, value_port_id)
+        if previous_state is root_state:
+            root_state.set_start_state(library_state.state_id)
+        else:
+            root_state.add_transition(previous_state.state_id, 0, library_state.state_id, None)
+        previous_state, previous_port_id = library_state, result_port_id
+    root_state.add_transition(previous_state.state_id, 0, root_state.state_id, 0)
+    root_state.add_data_flow(previous_state.state_id, previous_port_id, root_state.state_id, root_result_port_id)
+    return StateMachine(root_state), library_states
+
+
+def test_lazy_library_state_copies(caplog):
+    library_root_path = testing_utils.get_unique_temp_path()
+    testing_utils.initialize_environment_core(libraries={"test_libraries": library_root_path})
+    try:
+        create_library(library_root_path)
+        rafcon.core.singleton.library_manager.refresh_libraries()
+        state_machine, library_states = create_state_machine(5)
+        # the library root state is copied on demand only
+        assert all(library_state._state_copy is None for library_state in library_states)
+        assert all(library_state.name.startswith("Increment") for library_state in library_states)
+        assert copy(library_states[0])._state_copy is None
+        # the comparison is symmetric and does not create the state copies, unless one of them already exists
+        copied_library_state = copy(library_states[0])
+        assert copied_library_state == library_states[0] and library_states[0] == copied_library_state
+        assert copied_library_state._state_copy is None and library_states[0]._state_copy is None
+        assert copied_library_state.state_copy is not None
+        assert copied_library_state == library_states[0] and library_states[0] == copied_library_state
+        copied_library_state.destroy(recursive=True)
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        rafcon.core.singleton.state_machine_execution_engine.stop()
+        assert state_machine.root_state.output_data["result"] == 5
+
+        # the state copies share the outcomes and data ports of their library states
+        library_state = library_states[0]
+        assert library_state.state_copy is library_state._state_copy
+        assert library_state.state_copy.parent is library_state
+        assert library_state.state_copy.input_data_ports is library_state.input_data_ports
+        assert library_state.state_copy.outcomes is library_state.outcomes
+        assert library_states[1].state_copy is not library_state.state_copy
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_library_root_state_is_never_handed_out(caplog):
+    library_root_path = testing_utils.get_unique_temp_path()
+    testing_utils.initialize_environment_core(libraries={"test_libraries": library_root_path})
+    try:
+        create_library(library_root_path)
+        library_manager = rafcon.core.singleton.library_manager
+        library_manager.refresh_libraries()
+        library_state = LibraryState("test_libraries", "increment", "0.1", "Increment")
+        _, library_root_state = library_manager.get_library_state_template(library_state.lib_os_path)
+        library_root_outcomes = library_root_state.outcomes
+
+        # the state copy takes over the outcomes of the library state, which must not affect the shared root state
+        assert library_state.state_copy is not library_root_state
+        assert library_root_state.outcomes is library_root_outcomes
+
+        library_state.destroy(recursive=True)
+        assert library_root_state.states
+        other_library_state = LibraryState("test_libraries", "increment", "0.1", "Increment")
+        assert other_library_state.state_copy is not library_root_state
+        assert other_library_state.state_copy.states
+        other_library_state.destroy(recursive=True)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
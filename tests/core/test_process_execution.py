@@ -0,0 +1,151 @@
+import os
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.preemptive_concurrency_state import PreemptiveConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+import testing_utils
+
+WORKER_SCRIPT = """
+import os
+
+def execute(self, inputs, outputs, gvm):
+    self.logger.info("Computing in process %s", os.getpid())
+    self.persistent_variables["runs"] = self.persistent_variables.get("runs", 0) + 1
+    outputs["sum"] = sum(range(inputs["n"]))
+    gvm.set_variable("pid_" + self.name, os.getpid())
+    return 0
+"""
+
+WAITING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    if self.preemptive_wait(10.):
+        gvm.set_variable("waiting_state_preempted", True)
+        return "preempted"
+    return 0
+"""
+
+BLOCKING_SCRIPT = """
+import time
+
+def execute(self, inputs, outputs, gvm):
+    time.sleep(10.)
+    return 0
+"""
+
+COUNTER_SCRIPT = """
+counter = 0
+
+def execute(self, inputs, outputs, gvm):
+    global counter
+    counter += 1
+    outputs["sum"] = counter
+    return 0
+"""
+
+PREEMPTING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    self.preemptive_wait({0})
+    return 0
+"""
+
+
+def create_state_machine(script, preemption_time=0.2):
+    root_state = PreemptiveConcurrencyState("Root")
+    process_state = ExecutionState("ProcessState")
+    process_state.script_text = script
+    process_state.run_in_process = True
+    n_port_id = process_state.add_input_data_port("n", "int", 10)
+    process_state.add_output_data_port("sum", "int")
+    preempting_state = ExecutionState("PreemptingState")
+    preempting_state.script_text = PREEMPTING_SCRIPT.format(preemption_time)
+
+    root_state.add_state(process_state)
+    root_state.add_state(preempting_state)
+    root_n_port_id = root_state.add_input_data_port("n", "int", 10)
+    root_state.add_data_flow(root_state.state_id, root_n_port_id, process_state.state_id, n_port_id)
+    root_state.add_transition(preempting_state.state_id, 0, root_state.state_id, 0)
+    root_state.add_transition(process_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def run_state_machine(state_machine):
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+    rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+
+def get_process_state(state_machine):
+    return [state for state in state_machine.root_state.states.itervalues() if state.name == "ProcessState"][0]
+
+
+def test_run_in_process(caplog):
+    testing_utils.initialize_environment_core()
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        testing_utils.remove_all_gvm_variables()
+        # the preempting state must not finish first
+        state_machine = create_state_machine(WORKER_SCRIPT, preemption_time=5.)
+        process_state = get_process_state(state_machine)
+
+        for run in range(2):
+            run_state_machine(state_machine)
+            assert process_state.final_outcome.outcome_id == 0
+            assert process_state.output_data["sum"] == 45
+            assert gvm.get_variable("pid_ProcessState") != os.getpid()
+            assert process_state.persistent_variables["runs"] == run + 1
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_fresh_module_globals_in_process(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine(COUNTER_SCRIPT, preemption_time=5.)
+        process_state = get_process_state(state_machine)
+        # the module globals of the script are not kept by the worker process between executions
+        for run in range(2):
+            run_state_machine(state_machine)
+            assert process_state.output_data["sum"] == 1
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+@pytest.mark.parametrize("script, expected_warnings", [(WAITING_SCRIPT, 0), (BLOCKING_SCRIPT, 1)])
+def test_preemption_of_process(script, expected_warnings, caplog):
+    testing_utils.initialize_environment_core(core_config={"PROCESS_EXECUTION_TERMINATION_TIMEOUT": 0.5})
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        testing_utils.remove_all_gvm_variables()
+        state_machine = create_state_machine(script)
+        run_state_machine(state_machine)
+        assert get_process_state(state_machine).final_outcome.outcome_id == -2
+        # scripts using preemptive_wait return cooperatively, all others are terminated
+        assert gvm.variable_exist("waiting_state_preempted") == (script is WAITING_SCRIPT)
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=expected_warnings)
+
+
+def test_save_load_run_in_process():
+    state = ExecutionState("ProcessState")
+    state.run_in_process = True
+    assert 'run_in_process' not in ExecutionState.state_to_dict(ExecutionState("ThreadState"))
+    loaded_state = ExecutionState.from_dict(ExecutionState.state_to_dict(state))
+    assert loaded_state.run_in_process
+    storage_path = testing_utils.get_unique_temp_path()
+    storage.save_state_machine_to_path(StateMachine(state), storage_path)
+    assert storage.load_state_machine_from_path(storage_path).root_state.run_in_process
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -5,6 +5,7 @@ from rafcon.core.states.hierarchy_state import HierarchyState
 from rafcon.core.state_elements.data_port import InputDataPort, OutputDataPort
 from rafcon.core.storage import storage
 from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution.execution_history import ExecutionHistory, CallType
 
 # test environment elements
 import testing_utils
@@ -72,5 +73,57 @@ def test_scoped_data(caplog):
         testing_utils.test_multithreading_lock.release()
 
 
+def test_inputs_for_state_with_indexed_data_flows(caplog):
+    root_state = create_state_machine().root_state
+    state1, state2 = sorted(root_state.states.itervalues(), key=lambda state: state.name)
+    root_input_port_id = root_state.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)
+    state2_input_port_id = state2.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)
+
+    root_state.add_input_data_to_scoped_data({"data_input_port1": 3.0})
+    assert root_state.get_inputs_for_state(state1) == {"data_input_port1": 3.0}
+    root_state.add_state_execution_output_to_scoped_data({"data_output_port1": 5.0}, state1)
+    assert root_state.get_inputs_for_state(state2) == {"data_input_port1": 5.0}
+
+    # the index has to follow a modified data flow origin
+    data_flow = [df for df in root_state.data_flows.itervalues() if df.to_state == state2.state_id][0]
+    data_flow.modify_origin(root_state.state_id, root_input_port_id)
+    assert root_state.get_inputs_for_state(state2) == {"data_input_port1": 3.0}
+
+    root_state.remove_data_flow(data_flow.data_flow_id)
+    assert root_state.get_inputs_for_state(state2) == root_state.get_default_input_values_for_state(state2)
+    root_state.add_data_flow(state1.state_id,
+                             state1.get_io_data_port_id_from_name_and_type("data_output_port1", OutputDataPort),
+                             state2.state_id, state2_input_port_id)
+    assert root_state.get_inputs_for_state(state2) == {"data_input_port1": 5.0}
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
+def test_history_items_share_unchanged_scoped_data(caplog):
+    root_state = create_state_machine().root_state
+    state1 = [state for state in root_state.states.itervalues() if state.name == "first_state"][0]
+    root_state.add_input_data_to_scoped_data({"data_input_port1": 3.0})
+    execution_history = ExecutionHistory()
+
+    call_item = execution_history.push_call_history_item(state1, CallType.EXECUTE, root_state)
+    root_state.add_state_execution_output_to_scoped_data({"data_output_port1": 5.0}, state1)
+    return_item = execution_history.push_return_history_item(state1, CallType.EXECUTE, root_state)
+
+    assert len(call_item.scoped_data) == 1 and len(return_item.scoped_data) == 2
+    for key, scoped_data_element in call_item.scoped_data.iteritems():
+        # unchanged scoped data is not copied again
+        assert return_item.scoped_data[key] is scoped_data_element
+        assert scoped_data_element is not root_state.scoped_data[key]
+    assert sorted(element.value for element in return_item.scoped_data.itervalues()) == [3.0, 5.0]
+    assert not hasattr(return_item, "__dict__")
+    assert call_item.path is return_item.path
+
+    # the copies of a container state are dropped when it returns
+    assert root_state in execution_history._scoped_data_copies
+    execution_history.push_return_history_item(root_state, CallType.CONTAINER, root_state)
+    assert root_state not in execution_history._scoped_data_copies
+    execution_history.destroy()
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
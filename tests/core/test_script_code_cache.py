@@ -0,0 +1,71 @@
+import os
+from copy import copy
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core import script
+
+# test environment elements
+import pytest
+import testing_utils
+
+COUNTER_SCRIPT = """
+counter = 0
+
+def execute(self, inputs, outputs, gvm):
+    global counter
+    counter += 1
+    return 0
+"""
+
+
+def test_shared_code_objects(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state = ExecutionState("Counter")
+        state.script_text = COUNTER_SCRIPT
+        state_copy = copy(state)
+        state.script.build_module()
+        state_copy.script.build_module()
+
+        module = state.script.compiled_module
+        module_copy = state_copy.script.compiled_module
+        assert module is not module_copy
+        assert module.execute.func_code is module_copy.execute.func_code
+        # the module globals are not shared
+        module.execute(state, {}, {}, None)
+        assert module.counter == 1 and module_copy.counter == 0
+
+        state_copy.script_text = COUNTER_SCRIPT.replace("+= 1", "+= 2")
+        state_copy.script.build_module()
+        assert state_copy.script.compiled_module.execute.func_code is not module.execute.func_code
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_bytecode_cache(monkeypatch, caplog):
+    bytecode_cache_path = testing_utils.get_unique_temp_path()
+    testing_utils.initialize_environment_core(core_config={"SCRIPT_BYTECODE_CACHE_PATH": bytecode_cache_path})
+    try:
+        script.clear_code_cache()
+        state = ExecutionState("Counter")
+        state.script_text = COUNTER_SCRIPT
+        state.script.build_module()
+        assert len(os.listdir(bytecode_cache_path)) == 1
+
+        # a new process reads the code from the bytecode cache instead of compiling it
+        script.clear_code_cache()
+
+        def compile_not_allowed(*args):
+            raise AssertionError("The script must not be compiled again")
+        monkeypatch.setattr(script, "compile", compile_not_allowed, raising=False)
+        state.script.build_module()
+        state.script.compiled_module.execute(state, {}, {}, None)
+        assert state.script.compiled_module.counter == 1
+    finally:
+        script.clear_code_cache()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -255,6 +255,32 @@ def test_port_and_outcome_removal(caplog):
     assert_logger_warnings_and_errors(caplog)
 
 
+def test_state_path_cache(caplog):
+    root = ContainerState("Root")
+    child = ContainerState("Child")
+    leaf = ExecutionState("Leaf")
+    root.add_state(child)
+    child.add_state(leaf)
+
+    assert leaf.get_path() == "/".join([root.state_id, child.state_id, leaf.state_id])
+    assert leaf.get_path(by_name=True) == "Root/Child/Leaf"
+    assert leaf.get_path("appendix", by_name=True) == "Root/Child/Leaf/appendix"
+
+    # cached paths of all descendants are updated on changes of an ancestor
+    child.name = "Renamed"
+    assert leaf.get_path(by_name=True) == "Root/Renamed/Leaf"
+    root.change_state_id()
+    child.change_state_id()
+    assert leaf.get_path() == "/".join([root.state_id, child.state_id, leaf.state_id])
+
+    child.remove_state(leaf.state_id, recursive=False, destroy=False)
+    root.add_state(leaf)
+    assert leaf.get_path() == "/".join([root.state_id, leaf.state_id])
+    assert leaf.get_path(by_name=True) == "Root/Leaf"
+
+    assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     test_create_state(None)
     test_port_and_outcome_removal(None)
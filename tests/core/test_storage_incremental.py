@@ -0,0 +1,116 @@
+import os
+import stat
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import filesystem
+
+# test environment elements
+import pytest
+import testing_utils
+
+
+def create_state_machine():
+    root_state = HierarchyState("Root")
+    for i in range(3):
+        hierarchy_state = HierarchyState("Hierarchy{0}".format(i))
+        for j in range(3):
+            execution_state = ExecutionState("Execution{0}".format(j))
+            execution_state.script_text = "def execute(self, inputs, outputs, gvm):\n    return {0}\n".format(j)
+            hierarchy_state.add_state(execution_state)
+        root_state.add_state(hierarchy_state)
+    return StateMachine(root_state)
+
+
+def test_incremental_saving(monkeypatch, caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        written_files = []
+        original_write_file_atomically = filesystem.write_file_atomically
+
+        def write_file_atomically(file_path, content, mode='w'):
+            written_files.append(os.path.basename(file_path))
+            original_write_file_atomically(file_path, content, mode)
+        monkeypatch.setattr(filesystem, "write_file_atomically", write_file_atomically)
+        monkeypatch.setattr(storage, "write_file_atomically", write_file_atomically)
+
+        state_machine = create_state_machine()
+        state_machine_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, state_machine_path)
+        # core data and semantic data of 13 states, scripts of 9 execution states and the state machine file
+        assert len(written_files) == 2 * 13 + 9 + 1
+
+        # only the state machine file is written again
+        del written_files[:]
+        storage.save_state_machine_to_path(state_machine, state_machine_path)
+        assert written_files == [storage.STATEMACHINE_FILE]
+
+        # only the changed script is written
+        del written_files[:]
+        execution_state = state_machine.root_state.states.values()[0].states.values()[0]
+        execution_state.script_text += "\n"
+        storage.save_state_machine_to_path(state_machine, state_machine_path)
+        assert sorted(written_files) == [storage.SCRIPT_FILE, storage.STATEMACHINE_FILE]
+
+        # files modified by others are written again
+        del written_files[:]
+        script_file_path = os.path.join(execution_state.file_system_path, storage.SCRIPT_FILE)
+        with open(script_file_path, 'w') as f:
+            f.write("modified")
+        storage.save_state_machine_to_path(state_machine, state_machine_path)
+        assert sorted(written_files) == [storage.SCRIPT_FILE, storage.STATEMACHINE_FILE]
+        assert open(script_file_path).read() == execution_state.script_text
+
+        # a loaded state machine is saved incrementally as well
+        del written_files[:]
+        loaded_state_machine = storage.load_state_machine_from_path(state_machine_path)
+        storage.save_state_machine_to_path(loaded_state_machine, state_machine_path)
+        assert written_files == [storage.STATEMACHINE_FILE]
+
+        # obsolete state folders are still removed
+        removed_state = state_machine.root_state.states.values()[1]
+        removed_state_path = removed_state.file_system_path
+        state_machine.root_state.remove_state(removed_state.state_id)
+        storage.save_state_machine_to_path(state_machine, state_machine_path)
+        assert not os.path.exists(removed_state_path)
+        assert not any(name.endswith(".tmp") for _, _, names in os.walk(state_machine_path) for name in names)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_write_file_atomically(monkeypatch):
+    folder_path = testing_utils.get_unique_temp_path()
+    file_path = os.path.join(folder_path, "file.txt")
+
+    # the permissions of an existing file are kept
+    filesystem.write_file_atomically(file_path, "first")
+    os.chmod(file_path, 0o640)
+    filesystem.write_file_atomically(file_path, "second")
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o640
+    assert filesystem.read_file(file_path) == "second"
+    assert os.listdir(folder_path) == ["file.txt"]
+
+    # a symbolic link is not replaced by a file
+    link_path = os.path.join(folder_path, "link.txt")
+    os.symlink(file_path, link_path)
+    filesystem.write_file_atomically(link_path, "third")
+    assert os.path.islink(link_path)
+    assert filesystem.read_file(file_path) == "third"
+
+    # the least recently used file states are forgotten
+    monkeypatch.setattr(filesystem, "MAX_KNOWN_FILE_STATES", 2)
+    monkeypatch.setattr(filesystem, "_known_file_states", filesystem.OrderedDict())
+    file_paths = [os.path.join(folder_path, "file_{0}.txt".format(i)) for i in range(3)]
+    for path in file_paths:
+        assert filesystem.write_file_if_changed(path, "content")
+    assert filesystem.file_content_changed(file_paths[0], "content")
+    assert not filesystem.file_content_changed(file_paths[2], "content")
+    filesystem.forget_file_contents(folder_path)
+    assert not filesystem._known_file_states
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
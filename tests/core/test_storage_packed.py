@@ -0,0 +1,62 @@
+import os
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# test environment elements
+import pytest
+import testing_utils
+
+
+def create_state_machine():
+    root_state = HierarchyState("Root")
+    for i in range(3):
+        execution_state = ExecutionState("Execution{0}".format(i))
+        execution_state.script_text = "def execute(self, inputs, outputs, gvm):\n    return {0}\n".format(i)
+        execution_state.semantic_data = {"index": i}
+        root_state.add_state(execution_state)
+    return StateMachine(root_state)
+
+
+def test_packed_state_machine(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        state_machine_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, state_machine_path)
+        with open(os.path.join(state_machine_path, storage.FILE_NAME_META_DATA), 'w') as f:
+            f.write('{"test": 1}')
+
+        packed_path = os.path.join(testing_utils.get_unique_temp_path(), "state_machine" +
+                                   storage.PACKED_STATE_MACHINE_EXTENSION)
+        storage.save_state_machine_to_path(state_machine, packed_path)
+        assert storage.is_packed_state_machine_path(packed_path)
+        assert os.listdir(os.path.dirname(packed_path)) == [os.path.basename(packed_path)]
+        assert state_machine.file_system_path == packed_path
+        assert state_machine.root_state.file_system_path.startswith(packed_path + os.path.sep)
+        # the meta data of the previous storage location is packed as well
+        packed_files = storage.read_packed_state_machine_files(packed_path)
+        assert packed_files[storage.FILE_NAME_META_DATA] == '{"test": 1}'
+
+        packed_state_machine = storage.load_state_machine_from_path(packed_path)
+        assert packed_state_machine.mutable_hash().hexdigest() == state_machine.mutable_hash().hexdigest()
+        execution_state = packed_state_machine.root_state.states.values()[0]
+        assert execution_state.script_text.startswith("def execute")
+        assert "index" in execution_state.semantic_data
+        assert not packed_state_machine.marked_dirty
+
+        # resaving the packed state machine replaces the archive
+        packed_state_machine.root_state.states.values()[0].name = "Renamed"
+        storage.save_state_machine_to_path(packed_state_machine, packed_path)
+        assert storage.load_state_machine_from_path(packed_path).mutable_hash().hexdigest() == \
+            packed_state_machine.mutable_hash().hexdigest()
+        assert len(os.listdir(os.path.dirname(packed_path))) == 1
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,55 @@
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.config import global_config
+
+# test environment elements
+import pytest
+import testing_utils
+
+
+def create_state_machine(depth=3, width=3):
+    def create_hierarchy(level):
+        hierarchy_state = HierarchyState("Hierarchy{0}".format(level))
+        for i in range(width):
+            if level < depth:
+                child_state = create_hierarchy(level + 1)
+            else:
+                child_state = ExecutionState("Execution{0}".format(i))
+                child_state.script_text = "def execute(self, inputs, outputs, gvm):\n    return {0}\n".format(i)
+                child_state.semantic_data = {"index": i}
+            hierarchy_state.add_state(child_state)
+        return hierarchy_state
+    return StateMachine(create_hierarchy(1))
+
+
+def test_parallel_loading(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(create_state_machine(), state_machine_path)
+
+        state_files = storage.read_state_files_recursively(
+            storage.load_state_machine_from_path(state_machine_path).root_state.file_system_path)
+        # one root state, three hierarchy levels with three children each
+        assert len(state_files) == 1 + 3 + 9 + 27
+
+        global_config.set_config_value("LOAD_STATE_MACHINE_THREADS", 1)
+        state_machine = storage.load_state_machine_from_path(state_machine_path)
+        global_config.set_config_value("LOAD_STATE_MACHINE_THREADS", 4)
+        parallel_loaded_state_machine = storage.load_state_machine_from_path(state_machine_path)
+
+        assert state_machine.mutable_hash().hexdigest() == parallel_loaded_state_machine.mutable_hash().hexdigest()
+        root_state = parallel_loaded_state_machine.root_state
+        execution_state = root_state.states.values()[0].states.values()[0].states.values()[0]
+        assert execution_state.script_text.startswith("def execute")
+        assert "index" in execution_state.semantic_data
+        assert not parallel_loaded_state_machine.marked_dirty
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
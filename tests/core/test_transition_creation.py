@@ -1,3 +1,5 @@
+from copy import copy
+
 # core elements
 import rafcon.core.singleton
 from rafcon.core.states.execution_state import ExecutionState
@@ -85,5 +87,45 @@ def test_transition_creation(caplog):
     rafcon.core.singleton.state_machine_manager.delete_all_state_machines()
 
 
+def test_transition_lookup_by_origin(caplog):
+    sm = create_state_machine()
+    root_state = sm.root_state
+    state1, state2, state3 = sorted(root_state.states.itervalues(), key=lambda state: state.name)
+
+    def lookup(state, outcome_id):
+        return root_state.get_transition_for_outcome(state, state.outcomes[outcome_id])
+
+    assert lookup(state1, 3).to_state == state2.state_id
+    assert lookup(state1, -1) is None
+    assert root_state.start_state_id == state1.state_id
+
+    # remove and add transition
+    transition_id = lookup(state1, 3).transition_id
+    root_state.remove_transition(transition_id)
+    assert lookup(state1, 3) is None
+    root_state.add_transition(state1.state_id, 3, state3.state_id, None)
+    assert lookup(state1, 3).to_state == state3.state_id
+
+    # modify origin of existing transition
+    transition = lookup(state1, 3)
+    transition.modify_origin(state1.state_id, -1)
+    assert lookup(state1, 3) is None
+    assert lookup(state1, -1) is transition
+
+    # replace all transitions
+    root_state.transitions = {}
+    assert lookup(state1, -1) is None
+    assert root_state.start_state_id is None
+
+    # copies have their own index
+    root_state_copy = copy(create_state_machine().root_state)
+    for transition in root_state_copy.transitions.itervalues():
+        if transition.from_state is not None:
+            from_state = root_state_copy.states[transition.from_state]
+            assert root_state_copy.get_transition_for_outcome(
+                from_state, from_state.outcomes[transition.from_outcome]) is transition
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
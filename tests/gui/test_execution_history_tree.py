@@ -0,0 +1,157 @@
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.state_machine_manager import StateMachineManager
+from rafcon.core.execution.execution_history import ExecutionHistory, CallType
+
+# test environment elements
+import pytest
+import testing_utils
+
+
+def create_state_machine():
+    root_state = HierarchyState("Root")
+    root_state.add_state(ExecutionState("A"))
+    barrier_state = BarrierConcurrencyState("Barrier")
+    barrier_state.add_state(ExecutionState("B"))
+    barrier_state.add_state(ExecutionState("C"))
+    root_state.add_state(barrier_state)
+    return StateMachine(root_state)
+
+
+def get_state(state_machine, name):
+    states = [state_machine.root_state]
+    while states:
+        state = states.pop()
+        if state.name == name:
+            return state
+        if hasattr(state, 'states'):
+            states.extend(state.states.itervalues())
+
+
+def push_execution(execution_history, state):
+    execution_history.push_call_history_item(state, CallType.EXECUTE, None)
+    execution_history.push_return_history_item(state, CallType.EXECUTE, None)
+
+
+def get_tree_content(controller, parent_iter=None):
+    """Returns the labels and history items of all rows, the rows of not yet expanded nodes are inserted before"""
+    tree_store = controller.history_tree_store
+    content = []
+    tree_iter = tree_store.iter_children(parent_iter)
+    while tree_iter is not None:
+        node = tree_store[tree_iter][controller.NODE_STORAGE_ID]
+        if node is not None and node.children and not node.children_inserted:
+            # a not yet expanded node only has a placeholder row
+            assert tree_store.iter_n_children(tree_iter) == 1
+            assert tree_store[tree_store.iter_children(tree_iter)][controller.NODE_STORAGE_ID] is None
+            controller.on_test_expand_row(controller.history_tree, tree_iter, tree_store.get_path(tree_iter))
+        content.append((tree_store[tree_iter][controller.LABEL_NAME_STORAGE_ID],
+                        tree_store[tree_iter][controller.HISTORY_ITEM_STORAGE_ID],
+                        get_tree_content(controller, tree_iter)))
+        tree_iter = tree_store.iter_next(tree_iter)
+    return content
+
+
+def get_node_history_items(node):
+    history_items = [] if node.history_item is None else [node.history_item]
+    for child_node in node.children or []:
+        history_items.extend(get_node_history_items(child_node))
+    return history_items
+
+
+def assert_tree_equals_rebuild(controller, state_machine_manager_model):
+    from rafcon.gui.views.execution_history import ExecutionHistoryView
+    from rafcon.gui.controllers.execution_history import ExecutionHistoryTreeController
+    from rafcon.gui.controllers.utils.extended_controller import ExtendedController
+    controller.update()
+    rebuilt_controller = ExecutionHistoryTreeController(state_machine_manager_model, ExecutionHistoryView())
+    try:
+        content = get_tree_content(controller)
+        assert content == get_tree_content(rebuilt_controller)
+        return content
+    finally:
+        # the destroy method of the controller would also clear the execution histories of the state machine
+        ExtendedController.destroy(rebuilt_controller)
+
+
+def test_execution_history_tree(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        from rafcon.gui.models.state_machine_manager import StateMachineManagerModel
+        from rafcon.gui.views.execution_history import ExecutionHistoryView
+        from rafcon.gui.controllers.execution_history import ExecutionHistoryTreeController
+
+        state_machine = create_state_machine()
+        root_state = state_machine.root_state
+        barrier_state = get_state(state_machine, "Barrier")
+        state_machine_manager_model = StateMachineManagerModel(StateMachineManager([state_machine]))
+        controller = ExecutionHistoryTreeController(state_machine_manager_model, ExecutionHistoryView())
+
+        # the cursor continues with the items added since the last update
+        execution_history = ExecutionHistory(max_items=0)
+        state_machine.execution_histories.append(execution_history)
+        execution_history.push_state_machine_start_history_item(state_machine, 1)
+        execution_history.push_call_history_item(root_state, CallType.CONTAINER, root_state)
+        push_execution(execution_history, get_state(state_machine, "A"))
+        content = assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        assert content[0][0] == "Root - Run 1"
+        run_node = controller._root_node.children[0]
+        push_execution(execution_history, get_state(state_machine, "A"))
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        assert controller._root_node.children[0] is run_node
+        assert len(run_node.children) == 5
+
+        # the EXECUTE item of a container opens the hierarchy of the following CONTAINER item
+        execution_history.push_call_history_item(barrier_state, CallType.EXECUTE, None)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        execution_history.push_call_history_item(barrier_state, CallType.CONTAINER, barrier_state)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        barrier_node = run_node.children[-1]
+        assert barrier_node.description == "Call" and barrier_node.children[0].description == "Enter"
+
+        # the branches of a concurrency item are continued by their own cursors
+        concurrency_item = execution_history.push_concurrency_history_item(barrier_state, 2)
+        for branch_history, name in zip(concurrency_item.execution_histories, ["B", "C"]):
+            branch_history.push_call_history_item(get_state(state_machine, name), CallType.EXECUTE, None)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        for branch_history, name in zip(concurrency_item.execution_histories, ["B", "C"]):
+            branch_history.push_return_history_item(get_state(state_machine, name), CallType.EXECUTE, None)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        assert len(controller._cursors) == 3
+        execution_history.push_return_history_item(barrier_state, CallType.CONTAINER, barrier_state)
+        execution_history.push_return_history_item(barrier_state, CallType.EXECUTE, None)
+        execution_history.push_return_history_item(root_state, CallType.CONTAINER, root_state)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        assert controller._root_node.children[0] is run_node
+
+        # stepping back removes the last items, which rebuilds the tree
+        for _ in range(3):
+            execution_history.pop_last_item()
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        assert controller._root_node.children[0] is not run_node
+        execution_history.push_return_history_item(barrier_state, CallType.CONTAINER, barrier_state)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+
+        # the nodes of evicted history items are dropped
+        evicting_execution_history = ExecutionHistory(max_items=5)
+        state_machine.execution_histories.append(evicting_execution_history)
+        evicting_execution_history.push_call_history_item(root_state, CallType.CONTAINER, root_state)
+        assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        for _ in range(5):
+            push_execution(evicting_execution_history, get_state(state_machine, "A"))
+        content = assert_tree_equals_rebuild(controller, state_machine_manager_model)
+        assert content[0][0] == "A - Run 2"
+        retained_history_items = list(evicting_execution_history)
+        run_node = controller._root_node.children[-1]
+        assert all(history_item in retained_history_items for history_item in get_node_history_items(run_node))
+
+        controller.destroy()
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
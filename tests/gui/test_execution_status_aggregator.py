@@ -0,0 +1,44 @@
+import threading
+
+# test environment elements
+import pytest
+
+
+def run_main_loop(duration):
+    import glib
+    main_loop = glib.MainLoop()
+    glib.timeout_add(duration, main_loop.quit)
+    main_loop.run()
+
+
+def test_execution_status_aggregator():
+    from rafcon.gui.config import global_gui_config
+    from rafcon.gui.utils.execution_status_aggregator import ExecutionStatusAggregator
+    old_update_rate = global_gui_config.get_config_value("EXECUTION_STATUS_UPDATE_RATE")
+    global_gui_config.set_config_value("EXECUTION_STATUS_UPDATE_RATE", 20)
+    try:
+        aggregator = ExecutionStatusAggregator()
+        delivered_notifications = []
+
+        def change_execution_status():
+            for i in range(1000):
+                for model_id in (1, 2, 3):
+                    aggregator.add_notification(
+                        (model_id, "model_changed"),
+                        lambda model_id=model_id, i=i: delivered_notifications.append((model_id, i)))
+            aggregator.remove_notifications(3)
+
+        execution_thread = threading.Thread(target=change_execution_status)
+        execution_thread.start()
+        execution_thread.join()
+        assert delivered_notifications == []
+
+        run_main_loop(200)
+        # only the latest notification of each model is delivered, those of removed models are dropped
+        assert delivered_notifications == [(1, 999), (2, 999)]
+    finally:
+        global_gui_config.set_config_value("EXECUTION_STATUS_UPDATE_RATE", old_update_rate)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,180 @@
+import cairo
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+
+# gui elements
+from rafcon.gui.mygaphas.items.line import PerpLine
+
+# test environment elements
+import pytest
+
+
+class ViewStub(object):
+    """Stands in for the gaphas view, showing the item coordinates scaled by the zoom factor"""
+
+    def __init__(self, zoom=1.):
+        self.zoom = zoom
+        self.allocation = 0, 0, 100, 100
+        self.aggregated_connections = set()
+
+    def get_matrix_i2v(self, item):
+        return cairo.Matrix(self.zoom, 0, 0, self.zoom, 0, 0)
+
+    def get_zoom_factor(self):
+        return self.zoom
+
+
+class StateViewStub(object):
+    """Stands in for the view of the parent state of a connection"""
+
+    border_width = 1.
+
+    def __init__(self, details=True):
+        self.details = details
+
+    def show_details(self):
+        return self.details
+
+
+class PortStub(object):
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.name = "port"
+        self.port_size = 1., 1.
+
+
+class RecordingContext(object):
+    """Counts the strokes drawn on a cairo context"""
+
+    def __init__(self, context):
+        self._context = context
+        self.number_of_strokes = 0
+
+    def stroke(self):
+        self.number_of_strokes += 1
+        self._context.stroke()
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class DrawingContext(object):
+
+    def __init__(self, draw_all=False):
+        self.cairo = RecordingContext(cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 100, 100)))
+        self.draw_all = draw_all
+
+
+class DetachedLine(PerpLine):
+    """A connection, which is not part of a canvas"""
+    parent = None
+
+
+def create_line(view, parent_state_v, from_state_v, to_state_v, from_pos, to_pos):
+    line = DetachedLine(1)
+    line._view = view
+    line._parent_state_v = parent_state_v
+    line._from_port = PortStub(from_state_v)
+    line._to_port = PortStub(to_state_v)
+    line._line_color = line._arrow_color = 0., 0., 0., 1.
+    line.handles()[0].pos = from_pos
+    line.handles()[-1].pos = to_pos
+    line.drawn_parts = []
+    line.draw_tail = lambda context, port: line.drawn_parts.append("tail")
+    line.draw_head = lambda context, port: line.drawn_parts.append("head")
+    line._draw_name = lambda context: line.drawn_parts.append("name")
+    return line
+
+
+def test_connection_culling():
+    view = ViewStub()
+    parent_state_v = StateViewStub()
+    from_state_v, to_state_v = StateViewStub(), StateViewStub()
+
+    # a connection within the view is drawn with all its parts
+    line = create_line(view, parent_state_v, from_state_v, to_state_v, (10, 10), (90, 10))
+    context = DrawingContext()
+    line.draw(context)
+    assert line.drawn_parts == ["tail", "head", "name"]
+    assert context.cairo.number_of_strokes == 1
+
+    # a connection completely outside of the view is skipped
+    line = create_line(view, parent_state_v, from_state_v, to_state_v, (110, 10), (190, 10))
+    context = DrawingContext()
+    line.draw(context)
+    assert line.drawn_parts == []
+    assert context.cairo.number_of_strokes == 0
+
+    # a connection crossing the view is drawn, but not its ends outside of the view
+    line = create_line(view, parent_state_v, from_state_v, to_state_v, (-50, 50), (150, 50))
+    context = DrawingContext()
+    line.draw(context)
+    assert line.drawn_parts == ["name"]
+    assert context.cairo.number_of_strokes == 1
+
+    # the bounding box calculation draws everything
+    line = create_line(view, parent_state_v, from_state_v, to_state_v, (110, 10), (190, 10))
+    context = DrawingContext(draw_all=True)
+    line.draw(context)
+    assert line.drawn_parts == ["tail", "head", "name"]
+
+    # zooming moves the connection into or out of the view
+    line = create_line(ViewStub(zoom=0.5), parent_state_v, from_state_v, to_state_v, (110, 10), (190, 10))
+    line.draw(DrawingContext())
+    assert line.drawn_parts == ["tail", "head", "name"]
+    line = create_line(ViewStub(zoom=2.), parent_state_v, from_state_v, to_state_v, (60, 10), (90, 10))
+    line.draw(DrawingContext())
+    assert line.drawn_parts == []
+
+
+def test_connection_aggregation():
+    view = ViewStub()
+    small_parent_state_v = StateViewStub(details=False)
+    from_state_v, to_state_v, other_state_v = StateViewStub(), StateViewStub(), StateViewStub()
+    context = DrawingContext()
+
+    # of the connections between the same two states within a small state, only the first one is drawn
+    for _ in range(3):
+        line = create_line(view, small_parent_state_v, from_state_v, to_state_v, (10, 10), (90, 10))
+        line.draw(context)
+        assert line.drawn_parts == []
+    assert context.cairo.number_of_strokes == 1
+    line = create_line(view, small_parent_state_v, from_state_v, other_state_v, (10, 10), (90, 10))
+    line.draw(context)
+    assert context.cairo.number_of_strokes == 2
+
+    # the aggregated connections are reset with each painting
+    view.aggregated_connections.clear()
+    line = create_line(view, small_parent_state_v, from_state_v, to_state_v, (10, 10), (90, 10))
+    line.draw(context)
+    assert context.cairo.number_of_strokes == 3
+
+    # aggregated connections outside of the view are skipped as well
+    line = create_line(view, small_parent_state_v, from_state_v, other_state_v, (110, 10), (190, 10))
+    view.aggregated_connections.clear()
+    line.draw(context)
+    assert context.cairo.number_of_strokes == 3
+
+
+def test_state_details_threshold():
+    from rafcon.gui.models.state import StateModel
+    from rafcon.gui.mygaphas.items.state import StateView
+    from rafcon.gui.utils import constants
+    state_v = StateView(StateModel(ExecutionState("State")), (100, 50), 1)
+    minimum_zoom = constants.MINIMUM_STATE_SIZE_FOR_DETAILS / 50.
+
+    # the smaller side of the state on the screen decides about the details
+    state_v._view = ViewStub(zoom=minimum_zoom * 1.01)
+    assert state_v.show_details()
+    state_v._view = ViewStub(zoom=minimum_zoom * 0.99)
+    assert not state_v.show_details()
+    state_v._view = ViewStub(zoom=minimum_zoom * 1.5)
+    assert state_v.show_details()
+    state_v.height = 10
+    assert not state_v.show_details()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
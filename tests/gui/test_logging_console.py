@@ -0,0 +1,77 @@
+# test environment elements
+import pytest
+
+MESSAGE = "12:00:00: INFO - test: message {0}\nsecond line of message {0}"
+
+
+def run_main_loop(duration):
+    import glib
+    main_loop = glib.MainLoop()
+    glib.timeout_add(duration, main_loop.quit)
+    main_loop.run()
+
+
+def test_log_entries():
+    from rafcon.gui.utils.log_entries import LogEntries
+    log_entries = LogEntries(max_lines=5)
+    for i in range(10):
+        log_entries.append(i, MESSAGE.format(i))
+    # the entries are bounded by their lines, not by their number
+    assert list(log_entries) == [8, 9]
+    assert log_entries.number_of_lines == 4
+    log_entries.append(10, "\n".join(["line"] * 7))
+    assert list(log_entries) == [10]
+    log_entries.clear()
+    assert len(log_entries) == 0 and log_entries.number_of_lines == 0
+
+
+def test_logging_console_batching_and_trimming(monkeypatch):
+    import glib
+    from rafcon.gui.config import global_gui_config
+    from rafcon.gui.views.logging_console import LoggingConsoleView
+    from rafcon.utils import log
+    old_max_lines = global_gui_config.get_config_value("LOGGING_CONSOLE_MAX_LINES")
+    global_gui_config.set_config_value("LOGGING_CONSOLE_MAX_LINES", 10)
+    try:
+        view = LoggingConsoleView()
+        view.set_enables({'VERBOSE': False, 'DEBUG': True, 'INFO': True, 'WARNING': True, 'ERROR': True,
+                          'CONSOLE_FOLLOW_LOGGING': False})
+        idle_callbacks = []
+        original_idle_add = glib.idle_add
+
+        def idle_add(callback, *args, **kwargs):
+            idle_callbacks.append(callback)
+            return original_idle_add(callback, *args, **kwargs)
+        monkeypatch.setattr(glib, "idle_add", idle_add)
+
+        def get_lines():
+            text_buffer = view.filtered_buffer
+            return text_buffer.get_text(*text_buffer.get_bounds()).split("\n")[:-1]
+
+        for i in range(100):
+            view.print_message(MESSAGE.format(i), log.logging.INFO)
+        view.print_message("12:00:00: VERBOSE - test: dropped", log.logging.VERBOSE)
+        # all messages are printed by a single idle callback
+        assert len(idle_callbacks) == 1
+        assert get_lines() == []
+        run_main_loop(100)
+        lines = get_lines()
+        assert len(lines) == 10
+        assert lines[0] == "12:00:00 INFO - test: message 95"
+        assert lines[-1] == "second line of message 99"
+
+        # the text buffer is trimmed to the same number of lines
+        for i in range(100, 103):
+            view.print_message(MESSAGE.format(i), log.logging.INFO)
+        run_main_loop(100)
+        assert len(idle_callbacks) == 2
+        lines = get_lines()
+        assert len(lines) == 10
+        assert lines[0] == "12:00:00 INFO - test: message 98"
+        assert lines[-1] == "second line of message 102"
+    finally:
+        global_gui_config.set_config_value("LOGGING_CONSOLE_MAX_LINES", old_max_lines)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,38 @@
+import random
+
+# test environment elements
+import pytest
+
+
+def test_port_index():
+    from rafcon.gui.mygaphas.utils.port_index import PortIndex
+    random.seed(0)
+    port_index = PortIndex()
+    ports_of_items = {}
+    for item in range(100):
+        # ports of different sizes, as those of states in different hierarchy levels
+        size = 10. ** random.randint(-3, 2)
+        ports = []
+        for port in range(10):
+            x, y = random.uniform(0, 1000), random.uniform(0, 1000)
+            ports.append(((item, port), (x, y, x + size, y + size)))
+        ports_of_items[item] = ports
+        port_index.add(item, ports)
+
+    port_index.add(0, ports_of_items[0][:5])
+    port_index.remove(1)
+    ports_of_items[0] = ports_of_items[0][:5]
+    del ports_of_items[1]
+    assert 1 not in port_index
+
+    for rect in [(500, 500, 1, 1), (0, 0, 1000, 1000), (100, 200, 50, 20), (-10, -10, 5, 5)]:
+        x0, y0, x1, y1 = rect[0], rect[1], rect[0] + rect[2], rect[1] + rect[3]
+        expected_ports = set((item, port) for item, ports in ports_of_items.iteritems() for port, bounds in ports
+                             if bounds[0] <= x1 and bounds[2] >= x0 and bounds[1] <= y1 and bounds[3] >= y0)
+        found_ports = port_index.find_intersect(rect)
+        assert len(found_ports) == len(expected_ports)
+        assert set(found_ports) == expected_ports
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
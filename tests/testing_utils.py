@@ -425,8 +425,8 @@ def patch_gtkmvc_model_mt():
     import rafcon.core.execution.execution_engine
     import gtkmvc
     from gtkmvc.model_mt import Model, _threading, gobject
-    from rafcon.core.states.state import run_id_generator, threading
-    from rafcon.core.execution.execution_engine import StateMachineExecutionStatus, logger, Queue
+    from rafcon.core.states.state import run_id_generator, threading, partial
+    from rafcon.core.execution.execution_engine import StateMachineExecutionStatus, ExecutionFuture, logger, Queue
 
     original_ModelMT_notify_observer = gtkmvc.model_mt.ModelMT.__notify_observer__
     original_state_start = rafcon.core.states.state.State.start
@@ -434,12 +434,14 @@ def patch_gtkmvc_model_mt():
     print original_ModelMT_notify_observer, original_run_state_machine, original_state_start
     state_threads = []
 
-    def state_start(self, execution_history, backward_execution=False, generate_run_id=True):
+    def state_start(self, execution_history, backward_execution=False, generate_run_id=True, concurrent=True,
+                    finished_callback=None):
         self.execution_history = execution_history
         if generate_run_id:
             self._run_id = run_id_generator()
         self.backward_execution = copy.copy(backward_execution)
-        self.thread = threading.Thread(target=self.run)
+        function = self.run if finished_callback is None else partial(self._run_and_call, finished_callback)
+        self.thread = threading.Thread(target=function)
         # !!!!!!!!!!!!! patched line !!!!!!!!!!!!!
         state_threads.append(self.thread)
         self.thread.start()
@@ -452,12 +454,11 @@ def patch_gtkmvc_model_mt():
         self._ExecutionEngine__running_state_machine.root_state.concurrency_queue = Queue.Queue(maxsize=0)
 
         if self._ExecutionEngine__running_state_machine:
-            self._ExecutionEngine__running_state_machine.start()
-
-            self._ExecutionEngine__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
-            # !!!!!!!!!!!!! patched line !!!!!!!!!!!!!
-            state_threads.append(self._ExecutionEngine__wait_for_finishing_thread)
-            self._ExecutionEngine__wait_for_finishing_thread.start()
+            self._execution_future = ExecutionFuture(self._ExecutionEngine__running_state_machine)
+            self.state_machine_running = True
+            # the thread of the root state is added to the state threads by the patched state start
+            self._ExecutionEngine__running_state_machine.start(finished_callback=partial(self._on_execution_finished,
+                                                                                         self._execution_future))
         else:
             logger.warn("Currently no active state machine! Please create a new state machine.")
             self.set_execution_mode(StateMachineExecutionStatus.STOPPED)